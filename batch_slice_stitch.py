@@ -0,0 +1,456 @@
+'''
+Batch-Modus von Image Slice & Stitch.
+
+Verarbeitet alle Bilder im input_folder mit den Einstellungen aus config.toml
+parallel in mehreren Prozessen und schreibt die Ergebnisse in den output_folder.
+Die GUI (PyQt6) wird dabei nicht geladen.
+
+Beispiel:
+    python batch_slice_stitch.py --workers 8
+    python batch_slice_stitch.py --input ./in --output ./out --recursive
+    python batch_slice_stitch.py --input foto.jpg --output ./out --variant-seeds 1-20
+'''
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+import config_store
+from encoder import EncodeStats, EncoderSettings, WriteBehindQueue
+from interleave import PATTERNS, process_files, validate_pattern
+from output_cache import OutputCache
+from slice_engine import (DEFAULT_MAX_IMAGE_PIXELS, SliceParams, StripLayout, is_supported_image, layout_path,
+                          output_path, render_file, save_missing_layout, set_pixel_limit)
+from streaming import stream_stitch_file
+from tiled_output import TILE_COMPRESSIONS, TileSettings, tiled_stitch_file
+from timing import PROFILE_MODES, StageTimer, annotate, configure_timing_log, stage
+from variants import expand_variants, load_variants, parse_seeds, render_variants, resolve_variants, variant_name
+
+CONFIG_FILE = "config.toml"
+DEFAULT_CHUNK_SIZE = 8
+
+# Standardwerte für Batch und Watch-Folder (wie SliceParams, EncoderSettings und TileSettings)
+DEFAULT_CONFIG = {
+    "input_folder": "",
+    "output_folder": "",
+    "direction": "vertical",
+    "strip_count": 6,
+    "random_strips": False,
+    "min_strip_size": 20,
+    "max_strip_size": 100,
+    "insert_blank": False,
+    "blank_width": 100,
+    "strip_color": (255, 255, 255),
+    "grayscale": False,
+    "stitch_mode": "paste",
+    "stitch_workers": 1,
+    "output_format": "JPEG",
+    "quality": 75,
+    "progressive": False,
+    "optimize": False,
+    "subsampling": "4:2:0",
+    "png_compress_level": 6,
+    "tiff_compression": "",
+    "tile_size": 512,
+    "tile_compression": "deflate",
+    "pyramid": True,
+    "max_image_pixels": DEFAULT_MAX_IMAGE_PIXELS,
+    "output_cache": True,
+    "output_cache_folder": "",
+    "output_cache_max_mb": 1024,
+}
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def load_config(path):
+    """Lädt die Konfiguration wie die GUI: ``DEFAULT_CONFIG``, ergänzt um die gültigen Werte aus ``path``."""
+    return config_store.load_config(path, DEFAULT_CONFIG)
+
+
+def find_images(folder, recursive=False):
+    """Listet alle unterstützten Bilddateien im Ordner (sortiert) auf."""
+    if recursive:
+        files = [os.path.join(root, name)
+                 for root, _, names in os.walk(folder)
+                 for name in names]
+    else:
+        files = [os.path.join(folder, name) for name in os.listdir(folder)]
+    return sorted(f for f in files if os.path.isfile(f) and is_supported_image(f))
+
+
+@dataclass
+class BatchJob:
+    """Gemeinsame Einstellungen aller Dateien eines Batch-Laufs."""
+    output_folder: str
+    params: SliceParams
+    encoder: EncoderSettings
+    layout: Optional[StripLayout] = None
+    save_layout: bool = False
+    stream: bool = False
+    writers: int = 2
+    profile: str = ""
+    profile_folder: Optional[str] = None
+    timing_log: Optional[str] = None
+    output_cache: Optional[OutputCache] = None
+    tiled: Optional[TileSettings] = None
+    max_image_pixels: int = DEFAULT_MAX_IMAGE_PIXELS
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}"
+
+
+_timing_configured = False
+
+
+def _setup_timing_log(path):
+    """Richtet das JSON-Zeitmess-Log einmal pro Worker-Prozess ein."""
+    global _timing_configured
+    if path and not _timing_configured:
+        configure_timing_log(path)
+        _timing_configured = True
+
+
+def process_chunk(files, job):
+    """Worker-Funktion: verarbeitet mehrere Dateien nacheinander in einem Prozess.
+
+    Die fertigen Bilder werden über eine WriteBehindQueue geschrieben, sodass
+    das Kodieren mit dem Zerschneiden der nächsten Datei überlappt. Liefert
+    eine Liste von (Eingabe, Ausgabe, Fehler) und die Kodier-Statistik.
+    Pro Datei wird ein Zeitmess-Datensatz (``timing``) ausgegeben.
+    """
+    _setup_timing_log(job.timing_log)
+    set_pixel_limit(job.max_image_pixels)
+    results = []
+    pending = []
+    stats = EncodeStats()
+    with WriteBehindQueue(job.encoder, job.writers, stats=stats) as queue:
+        for input_path in files:
+            timer = StageTimer("batch_file", job.profile, job.profile_folder, input=input_path)
+            cached = None
+            try:
+                with timer:
+                    if job.stream:
+                        output_filename = stream_stitch_file(input_path, output_path(job.output_folder, ".png"),
+                                                             job.params, layout=job.layout,
+                                                             save_layout=job.save_layout,
+                                                             compress_level=job.encoder.png_compress_level)
+                    elif job.tiled:
+                        output_filename = tiled_stitch_file(input_path, output_path(job.output_folder, ".tif"),
+                                                            job.params, job.tiled, layout=job.layout,
+                                                            save_layout=job.save_layout)
+                    else:
+                        key = None
+                        if job.output_cache:
+                            with stage("output_cache"):
+                                key = job.output_cache.key(input_path, job.output_folder, job.params, job.encoder, job.layout)
+                                cached = job.output_cache.lookup(key) if key else None
+                            annotate(output_cache_hit=bool(cached))
+                        if cached:
+                            output_filename = cached
+                            if job.save_layout:
+                                with stage("layout_save"):
+                                    save_missing_layout(input_path, cached, job.params, job.layout)
+                        else:
+                            new_img, layout = render_file(input_path, job.params, job.layout)
+                            output_filename = output_path(job.output_folder, job.encoder.extension)
+                            # Der Writer-Thread misst "encode" in denselben Timer
+                            pending.append((input_path, timer, key, layout, queue.submit(new_img, output_filename)))
+            except Exception as e:
+                results.append((input_path, None, _error(e)))
+                continue
+            if job.stream or job.tiled or cached:
+                results.append((input_path, output_filename, None))
+                timer.emit()
+
+    for input_path, timer, key, layout, future in pending:
+        try:
+            output_filename = future.result()
+            # Layout erst nach dem Schreiben speichern, damit jede Datei genau einmal gezählt wird
+            if job.save_layout:
+                with timer.stage("layout_save"):
+                    layout.save(layout_path(output_filename))
+            if key:
+                job.output_cache.store(key, output_filename)
+            results.append((input_path, output_filename, None))
+            timer.emit()
+        except Exception as e:
+            results.append((input_path, None, _error(e)))
+    return results, stats.entries
+
+
+def run_batch(files, job, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Verarbeitet ``files`` in einem Prozess-Pool, jeweils ``chunk_size`` Dateien pro Auftrag.
+
+    Fehler einzelner Dateien werden protokolliert, brechen den Lauf aber nicht ab.
+    Stirbt ein Worker-Prozess (z.B. OOM-Kill), werden die betroffenen Aufträge
+    einzeln in einem frischen Prozess wiederholt; nur die Dateien des Auftrags,
+    der dabei erneut scheitert, gelten als fehlgeschlagen.
+    Gibt (Anzahl erfolgreich, Liste der Fehler als (Datei, Meldung), EncodeStats) zurück.
+    """
+    ok = 0
+    failures = []
+    stats = EncodeStats()
+
+    def collect(results, entries):
+        nonlocal ok
+        stats.merge(entries)
+        for input_path, output_filename, error in results:
+            if error:
+                logging.error(f"Fehler bei {input_path}: {error}")
+                failures.append((input_path, error))
+            else:
+                logging.debug(f"{input_path} -> {output_filename}")
+                ok += 1
+
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    retry = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_chunk, chunk, job): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                collect(*future.result())
+            except BrokenProcessPool:
+                # Welcher Auftrag den Prozess beendet hat, ist nicht bekannt: alle offenen wiederholen
+                retry.append(futures[future])
+            except Exception as e:
+                collect([(input_path, None, _error(e)) for input_path in futures[future]], {})
+
+    if retry:
+        logging.warning(f"Ein Worker-Prozess ist abgestürzt; wiederhole {len(retry)} Aufträge einzeln")
+    for chunk in retry:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                collect(*executor.submit(process_chunk, chunk, job).result())
+            except Exception as e:
+                collect([(input_path, None, _error(e)) for input_path in chunk], {})
+    return ok, failures, stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Image Slice & Stitch im Batch-Modus.")
+    parser.add_argument("--config", default=CONFIG_FILE, help="Pfad zur config.toml")
+    parser.add_argument("--input", help="Eingabe-Ordner (Standard: input_folder aus der Konfiguration)")
+    parser.add_argument("--output", help="Ausgabe-Ordner (Standard: output_folder aus der Konfiguration)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Anzahl Worker-Prozesse")
+    parser.add_argument("--writers", type=int, default=2, help="Anzahl Writer-Threads pro Worker-Prozess")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Anzahl Dateien pro Auftrag an einen Worker-Prozess")
+    parser.add_argument("--format", help="Ausgabeformat (JPEG, PNG, WEBP, TIFF), überschreibt output_format")
+    parser.add_argument("--quality", type=int, help="Qualität für JPEG/WebP, überschreibt quality")
+    parser.add_argument("--seed", type=int, help="Seed für reproduzierbare Streifen")
+    parser.add_argument("--stitch-workers", type=int,
+                        help="Threads pro Bild beim Zusammensetzen (0 = alle Kerne), überschreibt stitch_workers")
+    parser.add_argument("--recursive", action="store_true", help="Unterordner ebenfalls verarbeiten")
+    parser.add_argument("--stream", action="store_true",
+                        help="Speicherschonender Streaming-Modus für sehr grosse Bilder (Ausgabe als PNG)")
+    parser.add_argument("--tiled", action="store_true",
+                        help="Gekacheltes TIFF ohne vollständige Leinwand schreiben (für sehr grosse Ausgaben)")
+    parser.add_argument("--tile-size", type=int, help="Kachelgrösse für --tiled, überschreibt tile_size")
+    parser.add_argument("--tile-compression", choices=sorted(TILE_COMPRESSIONS),
+                        help="Kompression der Kacheln für --tiled, überschreibt tile_compression")
+    parser.add_argument("--no-pyramid", action="store_true", help="Bei --tiled nur die volle Auflösung schreiben")
+    parser.add_argument("--layout", help="Gespeichertes Layout (JSON/TOML) auf alle Bilder anwenden")
+    parser.add_argument("--save-layout", action="store_true", help="Layout als JSON neben jeder Ausgabe speichern")
+    parser.add_argument("--timing-log", help="Zeitmess-Datensätze pro Datei als JSON-Zeilen in diese Datei schreiben")
+    parser.add_argument("--profile", choices=[mode for mode in PROFILE_MODES if mode],
+                        help="Pro Datei ein Profil erfassen (cprofile: .prof-Datei, tracemalloc: Speicherspitze)")
+    parser.add_argument("--no-output-cache", action="store_true",
+                        help="Vorhandene Ausgaben nicht wiederverwenden (nur mit --seed oder --layout wirksam)")
+    parser.add_argument("--profile-dir", help="Ordner für die .prof-Dateien (Standard: temporärer Ordner)")
+    parser.add_argument("--interleave", choices=PATTERNS,
+                        help="Alle Bilder zu einem einzigen Bild mischen; Quelle pro Streifen nach diesem Muster")
+    parser.add_argument("--weights", help="Gewichte pro Bild (in sortierter Reihenfolge) für --interleave weighted, "
+                                          "kommagetrennt, z.B. 3,1")
+    parser.add_argument("--variants", help="Parametersätze (JSON/TOML) für Varianten jedes Bildes; "
+                                           "--input darf dann auch eine einzelne Bilddatei sein")
+    parser.add_argument("--variant-seeds", help="Seeds für Varianten jedes Bildes, z.B. 1-20 oder 1,5,9 "
+                                                "(mit --variants: jeder Parametersatz pro Seed)")
+    parser.add_argument("--variant-workers", type=int, default=0,
+                        help="Threads für die Varianten eines Bildes (0 = alle Kerne)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config(args.config)
+    input_folder = args.input or config["input_folder"]
+    output_folder = args.output or config["output_folder"]
+
+    variants_mode = bool(args.variants or args.variant_seeds)
+    if not os.path.isdir(input_folder) and not (variants_mode and os.path.isfile(input_folder)):
+        logging.error(f"Der Eingabeordner existiert nicht: {input_folder}")
+        return 2
+    if not os.path.isdir(output_folder):
+        logging.error(f"Der Ausgabeordner existiert nicht: {output_folder}")
+        return 2
+
+    params = SliceParams.from_config(config, seed=args.seed)
+    encoder = EncoderSettings.from_config(config)
+    max_image_pixels = config["max_image_pixels"]
+    set_pixel_limit(max_image_pixels)  # für --interleave und Varianten, die im Hauptprozess laufen
+    if args.format:
+        encoder.format = args.format.upper()
+    if args.quality:
+        encoder.quality = args.quality
+    if args.stitch_workers is not None:
+        params.workers = args.stitch_workers
+    tiled = None
+    if args.tiled:
+        tiled = TileSettings.from_config(config)
+        if args.tile_size:
+            tiled.tile_size = args.tile_size
+        if args.tile_compression:
+            tiled.compression = args.tile_compression
+        if args.quality:
+            tiled.quality = args.quality
+        if args.no_pyramid:
+            tiled.pyramid = False
+        tiled.workers = params.workers  # Threads pro Bild wie beim Zusammensetzen (--stitch-workers)
+    if args.tiled and args.stream:
+        logging.error("--tiled und --stream können nicht kombiniert werden.")
+        return 2
+    if variants_mode and (args.stream or args.tiled or args.interleave):
+        logging.error("Varianten können nicht mit --stream, --tiled oder --interleave kombiniert werden.")
+        return 2
+    try:
+        params.validate()
+        encoder.validate()
+        if tiled:
+            tiled.validate()
+    except ValueError as e:
+        logging.error(str(e))
+        return 2
+
+    layout = None
+    if args.layout:
+        try:
+            layout = StripLayout.load(args.layout)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Layout konnte nicht geladen werden: {e}")
+            return 2
+
+    files = [input_folder] if os.path.isfile(input_folder) else find_images(input_folder, args.recursive)
+    if not files:
+        logging.info("Keine Bilder gefunden.")
+        return 0
+
+    if args.interleave:
+        return interleave_main(files, output_folder, params, encoder, layout, args)
+    if variants_mode:
+        return variants_main(files, input_folder, output_folder, params, encoder, layout, args)
+
+    start = time.perf_counter()
+    job = BatchJob(output_folder, params, encoder, layout, args.save_layout, args.stream, args.writers,
+                   args.profile or "", args.profile_dir, args.timing_log,
+                   None if args.no_output_cache or args.stream or args.tiled else OutputCache.from_config(config),
+                   tiled, max_image_pixels)
+    ok, failures, stats = run_batch(files, job, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    print(f"{len(files)} Dateien, {ok} erfolgreich, {len(failures)} fehlgeschlagen "
+          f"in {elapsed:.2f} s ({rate:.2f} Dateien/s, {args.workers} Worker)")
+    if stats.entries:
+        print(stats.report())
+    return 1 if failures else 0
+
+
+def interleave_main(files, output_folder, params, encoder, layout, args):
+    """Mischt alle ``files`` zu einem Bild (``--interleave``)."""
+    try:
+        weights = [float(w) for w in args.weights.split(",")] if args.weights else None
+    except ValueError:
+        logging.error(f"Ungültige Gewichte: {args.weights}")
+        return 2
+    if layout is None:
+        try:
+            validate_pattern(len(files), args.interleave, weights)
+        except ValueError as e:
+            logging.error(str(e))
+            return 2
+
+    _setup_timing_log(args.timing_log)
+    start = time.perf_counter()
+    timer = StageTimer("interleave", args.profile or "", args.profile_dir, inputs=len(files))
+    try:
+        with timer:
+            output_filename = process_files(files, output_folder, params, args.interleave, weights, layout,
+                                            args.save_layout, encoder)
+    except Exception as e:
+        logging.error(f"Mischen fehlgeschlagen: {_error(e)}")
+        return 1
+    timer.emit()
+    print(f"{len(files)} Bilder gemischt in {time.perf_counter() - start:.2f} s: {output_filename}")
+    return 0
+
+
+def variants_main(files, input_folder, output_folder, params, encoder, layout, args):
+    """Erstellt für jedes Bild alle Varianten aus ``--variants``/``--variant-seeds``.
+
+    Jedes Bild wird nur einmal dekodiert (siehe ``variants``); die Bilder
+    werden nacheinander bearbeitet, ihre Varianten parallel. Bilder, deren
+    Ausgabenamen sich überschneiden würden, gelten als fehlgeschlagen.
+    """
+    try:
+        sets = load_variants(args.variants) if args.variants else None
+        seeds = parse_seeds(args.variant_seeds) if args.variant_seeds else None
+    except (OSError, ValueError) as e:
+        logging.error(f"Varianten konnten nicht geladen werden: {e}")
+        return 2
+    variants = expand_variants(sets, seeds)
+    try:
+        resolve_variants(params, variants)
+    except ValueError as e:
+        logging.error(str(e))
+        return 2
+
+    root = input_folder if os.path.isdir(input_folder) else None
+    names = {input_path: variant_name(input_path, root) for input_path in files}
+    owners = {}
+    for input_path, name in names.items():
+        owners.setdefault(name, []).append(input_path)
+
+    _setup_timing_log(args.timing_log)
+    start = time.perf_counter()
+    ok = 0
+    failures = 0
+    for input_path in files:
+        if len(owners[names[input_path]]) > 1:
+            others = ", ".join(p for p in owners[names[input_path]] if p != input_path)
+            logging.error(f"Fehler bei {input_path}: Ausgabenamen {names[input_path]}_v… "
+                          f"überschneiden sich mit {others}")
+            failures += len(variants)
+            continue
+        timer = StageTimer("variants", args.profile or "", args.profile_dir, input=input_path)
+        try:
+            with timer:
+                results = render_variants(input_path, output_folder, params, variants, encoder, layout,
+                                          args.save_layout, args.variant_workers, names[input_path])
+        except Exception as e:
+            logging.error(f"Fehler bei {input_path}: {_error(e)}")
+            failures += len(variants)
+            continue
+        timer.emit()
+        for number, (output_filename, error) in enumerate(results, 1):
+            if error:
+                logging.error(f"Fehler bei {input_path}, Variante {number}: {error}")
+                failures += 1
+            else:
+                logging.debug(f"{input_path} -> {output_filename}")
+                ok += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(files)} Dateien x {len(variants)} Varianten, {ok} erfolgreich, {failures} fehlgeschlagen "
+          f"in {elapsed:.2f} s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
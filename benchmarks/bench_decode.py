@@ -0,0 +1,114 @@
+'''
+Benchmark: Dekodierzeit und Speicherspitze beim Laden von JPEGs.
+
+Vergleicht jeweils in einem eigenen Prozess (saubere Speicherspitze):
+- Graustufen: volle RGB-Dekodierung + convert("L") gegen ``draft("L")``
+- Vorschau: volle Dekodierung + Verkleinern gegen ``load_proxy`` mit
+  DCT-Skalierung (``draft``)
+
+    python benchmarks/bench_decode.py --width 8000 --height 6000
+'''
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PREVIEW_SIZE = (800, 600)
+
+
+def gray_full(path):
+    with Image.open(path) as img:
+        return img.convert("RGB").convert("L")
+
+
+def gray_draft(path):
+    from slice_engine import SliceParams, load_image
+    return load_image(path, SliceParams(grayscale=True))
+
+
+def preview_full(path):
+    with Image.open(path) as img:
+        img.load()
+        img.thumbnail(PREVIEW_SIZE)
+        return img
+
+
+def preview_draft(path):
+    from slice_engine import load_proxy
+    return load_proxy(path, PREVIEW_SIZE)[0]
+
+
+CASES = {
+    "Graustufen: RGB + convert": gray_full,
+    "Graustufen: draft('L')": gray_draft,
+    "Vorschau: voll + thumbnail": preview_full,
+    "Vorschau: draft + thumbnail": preview_draft,
+}
+
+
+def measure(case, path, repeat):
+    """Wird im Kindprozess ausgeführt: gibt beste Zeit (s) und Speicherspitze (KiB) aus."""
+    func = CASES[case]
+    best = min(_timed(func, path) for _ in range(repeat))
+    print(f"{best} {_peak_kib()}")
+
+
+def _peak_kib():
+    # ru_maxrss übernimmt nach exec den Wert des Elternprozesses, VmHWM nicht
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _timed(func, path):
+    start = time.perf_counter()
+    func(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Quell-JPEG (Standard: synthetisches Bild)")
+    parser.add_argument("--width", type=int, default=8000)
+    parser.add_argument("--height", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child[0], args.child[1], args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if not path:
+            from bench_encoders import synthetic
+            path = os.path.join(tmp, "source.jpg")
+            synthetic(args.width, args.height).save(path, quality=90)
+        with Image.open(path) as img:
+            print(f"Quelle {img.width}x{img.height} {img.format}, best of {args.repeat}")
+
+        print(f"{'Variante':<30} {'Zeit':>9} {'Spitze':>9}")
+        for case in CASES:
+            out = subprocess.run([sys.executable, __file__, "--child", case, path, "--repeat", str(args.repeat)],
+                                 check=True, capture_output=True, text=True).stdout.split()
+            seconds, peak_kib = float(out[0]), int(out[1])
+            print(f"{case:<30} {seconds * 1000:>7.1f}ms {peak_kib / 1024:>7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+'''
+Benchmark: Kodierzeit und Dateigrösse der Ausgabeformate.
+
+Erzeugt ein Streifenbild aus einer Quelldatei (oder einem synthetischen Bild)
+und speichert es mit verschiedenen Encoder-Einstellungen. Ausgegeben werden
+Zeit, Dateigrösse und Durchsatz pro Einstellung, um den günstigsten Encoder
+zu finden, der die Qualitätsanforderung erfüllt.
+
+    python benchmarks/bench_encoders.py --input examples/screenshot01.png
+'''
+import argparse
+import os
+import sys
+import tempfile
+from dataclasses import replace
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from encoder import EncoderSettings, encode
+from slice_engine import SliceParams, load_image, stitch_image
+
+BASE = EncoderSettings()
+CANDIDATES = [
+    ("JPEG q75 (Standard)", BASE),
+    ("JPEG q90", replace(BASE, quality=90)),
+    ("JPEG q90 4:4:4", replace(BASE, quality=90, subsampling="4:4:4")),
+    ("JPEG q85 optimize", replace(BASE, quality=85, optimize=True)),
+    ("JPEG q85 progressive", replace(BASE, quality=85, progressive=True)),
+    ("PNG level 1", replace(BASE, format="PNG", png_compress_level=1)),
+    ("PNG level 6", replace(BASE, format="PNG")),
+    ("WEBP q80", replace(BASE, format="WEBP", quality=80)),
+    ("TIFF", replace(BASE, format="TIFF")),
+    ("TIFF LZW", replace(BASE, format="TIFF", tiff_compression="tiff_lzw")),
+]
+
+
+def synthetic(width, height):
+    """Glattes Testbild mit etwas Rauschen (realistischer als reines Rauschen)."""
+    rs = np.random.default_rng(1)
+    small = Image.fromarray(rs.integers(0, 256, (height // 32 + 1, width // 32 + 1, 3), dtype=np.uint8))
+    img = small.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    noise = rs.integers(-6, 7, (height, width, 3), dtype=np.int16)
+    return Image.fromarray((np.asarray(img, dtype=np.int16) + noise).clip(0, 255).astype(np.uint8))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Quellbild (Standard: synthetisches Bild)")
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    params = SliceParams(strip_count=12, insert_blank=True, blank_width=40, seed=1)
+    src = load_image(args.input, params) if args.input else synthetic(args.width, args.height)
+    img = stitch_image(src, params)
+    megapixels = img.width * img.height / 1e6
+
+    print(f"Bild {img.width}x{img.height} ({megapixels:.1f} MP), best of {args.repeat}")
+    print(f"{'Einstellung':<22} {'Zeit':>9} {'Grösse':>11} {'MP/s':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, settings in CANDIDATES:
+            path = os.path.join(tmp, "out" + settings.extension)
+            seconds, size = min(encode(img, path, settings) for _ in range(args.repeat))
+            print(f"{name:<22} {seconds * 1000:>7.1f}ms {size / 1024:>8.1f}KiB {megapixels / seconds:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
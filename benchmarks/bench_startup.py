@@ -0,0 +1,106 @@
+'''
+Benchmark: Startzeit der GUI.
+
+Misst in frischen Prozessen (Standard: Qt-Plattform "offscreen"):
+- Zeit bis zum ersten angezeigten Fenster (Prozessstart bis nach
+  ``show()`` und dem ersten Durchlauf der Event-Loop),
+- Zeit bis die verzögerte Einrichtung (``finish_startup``) fertig ist,
+- welche schweren Module beim ersten Anzeigen bereits geladen sind,
+- die teuersten Importe laut ``python -X importtime``.
+
+Mit ``--budget-ms`` endet der Lauf mit Exit-Code 1, wenn der Median bis
+zum ersten Fenster das Budget überschreitet.
+
+    python benchmarks/bench_startup.py --repeat 5 --budget-ms 400
+'''
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_MODULE = "tci_main_image_slice_stitch_26"
+HEAVY_MODULES = ("PIL.Image", "numpy", "toml", "slice_engine", "raster_cache", "gui_worker")
+
+CHILD = f"""
+import sys, time, json
+start = float(sys.argv[1])
+sys.path.insert(0, {ROOT!r})
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+import {MAIN_MODULE} as main
+window = main.ImageStripper()
+window.show()
+app.processEvents()
+shown = time.time()
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+window.finish_startup()
+ready = time.time()
+print(json.dumps({{"shown_ms": (shown - start) * 1000, "ready_ms": (ready - start) * 1000, "loaded": loaded}}))
+"""
+
+
+def measure(workdir, env):
+    start = time.time()
+    out = subprocess.run([sys.executable, "-c", CHILD, str(start)], cwd=workdir, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def import_report(workdir, env, top):
+    """Liefert die ``top`` teuersten Importe (kumuliert, ms) und die Gesamtzeit des Hauptmoduls."""
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); import {MAIN_MODULE}"
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir, env=env,
+                         check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.strip()))
+    total = next((cum for cum, _, name in rows if name == MAIN_MODULE), 0.0)
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="Maximal erlaubter Median bis zum ersten Fenster")
+    parser.add_argument("--top", type=int, default=15, help="Anzahl Zeilen im Import-Bericht")
+    parser.add_argument("--platform", default="offscreen", help="QT_QPA_PLATFORM für die Messung")
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM=args.platform)
+    # In einem eigenen Ordner starten, damit die config.toml des Projekts unverändert bleibt
+    with tempfile.TemporaryDirectory() as workdir:
+        if os.path.exists(os.path.join(ROOT, "config.toml")):
+            shutil.copy(os.path.join(ROOT, "config.toml"), workdir)
+
+        measure(workdir, env)  # Aufwärmen (Dateisystem-Cache, .pyc)
+        runs = [measure(workdir, env) for _ in range(args.repeat)]
+        total, rows = import_report(workdir, env, args.top)
+
+    shown = statistics.median(run["shown_ms"] for run in runs)
+    ready = statistics.median(run["ready_ms"] for run in runs)
+    print(f"Import {MAIN_MODULE}: {total:.1f} ms")
+    print(f"{'kumuliert':>10} {'selbst':>8}  Modul")
+    for cumulative, self_ms, name in rows:
+        print(f"{cumulative:>8.1f}ms {self_ms:>6.1f}ms  {name}")
+    print()
+    print(f"Erstes Fenster: {shown:.1f} ms (Median aus {args.repeat})")
+    print(f"Einrichtung fertig: {ready:.1f} ms")
+    print(f"Beim ersten Fenster geladen: {', '.join(runs[-1]['loaded']) or '-'}")
+
+    if args.budget_ms is not None and shown > args.budget_ms:
+        print(f"Budget überschritten: {shown:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+'''
+Benchmark: NumPy-Gather gegen crop/paste beim Zusammensetzen der Streifen.
+
+Erzeugt ein synthetisches Bild, setzt es mit beiden Verfahren in derselben
+Streifenreihenfolge zusammen, prüft die Ergebnisse auf Byte-Gleichheit und
+gibt die Laufzeiten aus.
+
+    python benchmarks/bench_stitch_gather.py --width 20000 --height 3000 --strips 1000
+'''
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slice_engine import SliceParams, StripLayout, VERTICAL, HORIZONTAL, _stitch_paste, _stitch_gather
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=8000)
+    parser.add_argument("--height", type=int, default=2000)
+    parser.add_argument("--strips", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rs = np.random.default_rng(args.seed)
+    img = Image.fromarray(rs.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8), "RGB")
+
+    cases = [
+        ("fix", dict(strip_count=args.strips)),
+        ("zufällig 5-6 px", dict(random_strips=True, min_strip_size=5, max_strip_size=6)),
+        ("zufällig 5-20 px", dict(random_strips=True, min_strip_size=5, max_strip_size=20)),
+        ("fix + leer", dict(strip_count=args.strips, insert_blank=True, blank_width=3, strip_color=(46, 194, 126))),
+    ]
+    print(f"Bild {args.width}x{args.height} RGB, best of {args.repeat}")
+    print(f"{'Richtung':<11} {'Fall':<17} {'Streifen':>8} {'paste':>9} {'numpy':>9} {'Faktor':>7}  gleich")
+    for direction in (VERTICAL, HORIZONTAL):
+        for name, kwargs in cases:
+            params = SliceParams(direction=direction, **kwargs)
+            vertical = direction == VERTICAL
+            segments = StripLayout.generate(img.size, params, random.Random(args.seed)).segments()
+            color = tuple(params.strip_color)
+
+            t_paste, a = best_of(lambda: _stitch_paste(img, segments, vertical, color), args.repeat)
+            t_numpy, b = best_of(lambda: _stitch_gather(img, segments, vertical, color), args.repeat)
+            same = a.mode == b.mode and a.size == b.size and a.tobytes() == b.tobytes()
+            print(f"{direction:<11} {name:<17} {len(segments):>8} {t_paste * 1000:>7.1f}ms {t_numpy * 1000:>7.1f}ms "
+                  f"{t_paste / t_numpy:>6.1f}x  {'ja' if same else 'NEIN'}")
+
+
+if __name__ == "__main__":
+    main()
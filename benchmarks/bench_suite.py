@@ -0,0 +1,272 @@
+'''
+Benchmark- und Regressions-Suite für das Zerschneiden und Zusammensetzen.
+
+Erzeugt synthetische Eingabebilder (seeded, ohne Dateien) in mehreren Grössen
+und Modi und misst ``stitch_image`` für alle Kombinationen aus Richtung,
+festen/zufälligen Streifen, leeren Streifen und ``strip_count``. Erfasst
+werden Laufzeit (best of ``--repeat``), zusätzlicher Spitzenspeicher und
+Durchsatz in Ausgabe-Megapixeln pro Sekunde.
+
+Jede Bildgrösse/jeder Modus läuft in einem eigenen Prozess, damit die
+Speichermessung nicht von vorherigen Fällen beeinflusst wird. Zusätzlich wird
+jedes Ergebnis mit einer unabhängigen NumPy-Referenz verglichen
+(pixelgenau) und als SHA-256 gespeichert.
+
+    python benchmarks/bench_suite.py --save results.json
+    python benchmarks/bench_suite.py --baseline results.json --threshold 0.15
+    python benchmarks/bench_suite.py --preset full --save full.json
+
+Mit ``--baseline`` endet der Lauf mit Exit-Code 1, wenn ein Fall um mehr als
+``--threshold`` langsamer ist, die Prüfsumme abweicht oder die Referenz nicht
+übereinstimmt.
+'''
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import PIL
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slice_engine import HORIZONTAL, VERTICAL, SliceParams, StripLayout, fill_color, stitch_image
+
+# Bildgrössen in Megapixeln je Preset
+PRESETS = {
+    "quick": [1, 12],
+    "full": [1, 12, 50, 200],
+}
+MODES = ("RGB", "L")  # Standard; zusätzlich mit --modes: RGBA, I;16
+_SYNTHETIC_SHAPES = {"RGB": 3, "RGBA": 4, "L": None, "I;16": None}
+DIRECTIONS = (VERTICAL, HORIZONTAL)
+STRIP_COUNTS = (2, 50, 1000)
+SEED = 1
+BLANK_COLOR = (46, 194, 126)
+
+
+def image_size(megapixels):
+    """Breite und Höhe (4:3) für ``megapixels``."""
+    width = round(math.sqrt(megapixels * 1e6 * 4 / 3))
+    return width, round(megapixels * 1e6 / width)
+
+
+def synthetic(megapixels, mode):
+    """Reproduzierbares Rauschbild; Rauschen verhindert, dass Abkürzungen für glatte Flächen das Ergebnis schönen."""
+    width, height = image_size(megapixels)
+    rs = np.random.default_rng(SEED)
+    bands = _SYNTHETIC_SHAPES[mode]
+    shape = (height, width, bands) if bands else (height, width)
+    if mode == "I;16":
+        return Image.frombytes(mode, (width, height), rs.integers(0, 65536, shape, dtype=np.uint16).tobytes())
+    return Image.frombytes(mode, (width, height), rs.integers(0, 256, shape, dtype=np.uint8).tobytes())
+
+
+def cases(size, stitch_mode, workers=1):
+    """Liefert (id, SliceParams) für alle Kombinationen bei Bildgrösse ``size``."""
+    for direction in DIRECTIONS:
+        length = size[0] if direction == VERTICAL else size[1]
+        for random_strips in (False, True):
+            for insert_blank in (False, True):
+                for count in STRIP_COUNTS:
+                    # Zufällige Streifen: Grössenbereich so wählen, dass im Mittel ``count`` Streifen entstehen
+                    average = max(1, length // count)
+                    min_size = max(1, average // 2)
+                    params = SliceParams(
+                        direction=direction,
+                        strip_count=count,
+                        random_strips=random_strips,
+                        min_strip_size=min_size,
+                        max_strip_size=max(min_size + 1, average * 3 // 2),
+                        insert_blank=insert_blank,
+                        blank_width=max(1, average // 4),
+                        strip_color=BLANK_COLOR,
+                        seed=SEED,
+                        stitch_mode=stitch_mode,
+                        workers=workers,
+                    )
+                    name = "-".join([direction, "zufall" if random_strips else "fix",
+                                     "leer" if insert_blank else "ohne", str(count), stitch_mode])
+                    if workers != 1:
+                        name += f"-{workers}t"
+                    yield name, params
+
+
+def reference_stitch(img, segments, params, out_mode):
+    """Unabhängige Referenz: Streifen per NumPy-Slicing aneinanderhängen."""
+    src = np.asarray(img.convert(out_mode))
+    fill = np.asarray(Image.new(out_mode, (1, 1), fill_color(params.strip_color, out_mode)))[0, 0]
+    axis = 1 if params.direction == VERTICAL else 0
+    parts = []
+    for offset, dim in segments:
+        if offset is None:
+            shape = list(src.shape)
+            shape[axis] = dim
+            parts.append(np.broadcast_to(fill, shape))
+        elif axis == 1:
+            parts.append(src[:, offset:offset + dim])
+        else:
+            parts.append(src[offset:offset + dim])
+    return np.concatenate(parts, axis=axis)
+
+
+def _reset_peak():
+    """Setzt die Speicherspitze (VmHWM) des Prozesses zurück; nur unter Linux möglich."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _memory_kib(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_group(megapixels, mode, repeat, stitch_mode, verify, workers=1):
+    """Wird im Kindprozess ausgeführt: misst alle Fälle einer Bildgrösse und gibt JSON-Zeilen aus."""
+    img = synthetic(megapixels, mode)
+    prefix = f"{megapixels}MP-{mode}"
+    for name, params in cases(img.size, stitch_mode, workers):
+        best = None
+        peak_kib = 0
+        for _ in range(repeat):
+            _reset_peak()
+            before = _memory_kib("VmRSS")
+            start = time.perf_counter()
+            out = stitch_image(img, params)
+            seconds = time.perf_counter() - start
+            peak_kib = max(peak_kib, _memory_kib("VmHWM") - before)
+            best = seconds if best is None else min(best, seconds)
+
+        result = {
+            "id": f"{prefix}-{name}",
+            "megapixels": megapixels,
+            "mode": mode,
+            "input_size": list(img.size),
+            "output_size": list(out.size),
+            "seconds": best,
+            "peak_mb": peak_kib / 1024,
+            "mp_per_s": out.width * out.height / 1e6 / best,
+            "sha256": hashlib.sha256(out.tobytes()).hexdigest(),
+        }
+        if verify:
+            segments = StripLayout.generate(img.size, params).segments()
+            expected = reference_stitch(img, segments, params, out.mode)
+            result["exact"] = np.asarray(out).shape == expected.shape and np.array_equal(np.asarray(out), expected)
+        print(json.dumps(result), flush=True)
+        del out
+
+
+def compare(results, baseline, threshold, min_seconds=0.005):
+    """Vergleicht mit einem früheren Lauf und liefert die Liste der Abweichungen als Text.
+
+    Fälle, die um weniger als ``min_seconds`` langsamer sind, gelten als
+    Messrauschen und werden nicht als Regression gewertet.
+    """
+    previous = {case["id"]: case for case in baseline["cases"]}
+    problems = []
+    for case in results:
+        old = previous.get(case["id"])
+        if old is None:
+            continue
+        if case["sha256"] != old["sha256"]:
+            problems.append(f"{case['id']}: Ausgabe weicht ab (Prüfsumme)")
+        ratio = case["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        if ratio > 1 + threshold and case["seconds"] - old["seconds"] >= min_seconds:
+            problems.append(f"{case['id']}: {ratio:.2f}x langsamer "
+                            f"({old['seconds'] * 1000:.1f} -> {case['seconds'] * 1000:.1f} ms)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--sizes", help="Bildgrössen in MP, kommagetrennt (überschreibt --preset)")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"Bildmodi, kommagetrennt ({', '.join(_SYNTHETIC_SHAPES)})")
+    parser.add_argument("--stitch-mode", default="paste", choices=("paste", "numpy"))
+    parser.add_argument("--workers", type=int, default=1, help="Threads pro Bild (SliceParams.workers, 0 = alle Kerne)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-verify", action="store_true", help="Pixelvergleich mit der Referenz überspringen")
+    parser.add_argument("--save", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="Früheres JSON-Ergebnis zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Erlaubte Verlangsamung gegenüber --baseline (0.15 = 15 %%)")
+    parser.add_argument("--min-ms", type=float, default=5.0,
+                        help="Kleinere absolute Verlangsamungen als Messrauschen ignorieren")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_group(float(args.child[0]) if "." in args.child[0] else int(args.child[0]), args.child[1],
+                  args.repeat, args.stitch_mode, not args.no_verify, args.workers)
+        return 0
+
+    sizes = args.sizes.split(",") if args.sizes else [str(mp) for mp in PRESETS[args.preset]]
+    results = []
+    failed = False
+    print(f"{'Fall':<46} {'Zeit':>10} {'Spitze':>9} {'MP/s':>8}  Referenz")
+    for size in sizes:
+        for mode in args.modes.split(","):
+            command = [sys.executable, os.path.abspath(__file__), "--child", size, mode,
+                       "--repeat", str(args.repeat), "--stitch-mode", args.stitch_mode, "--workers", str(args.workers)]
+            if args.no_verify:
+                command.append("--no-verify")
+            with subprocess.Popen(command, stdout=subprocess.PIPE, text=True) as child:
+                for line in child.stdout:
+                    case = json.loads(line)
+                    results.append(case)
+                    exact = case.get("exact")
+                    failed |= exact is False
+                    status = "-" if exact is None else ("ok" if exact else "FEHLER")
+                    print(f"{case['id']:<46} {case['seconds'] * 1000:>8.1f}ms {case['peak_mb']:>7.1f}MB "
+                          f"{case['mp_per_s']:>8.1f}  {status}")
+            if child.returncode:
+                print(f"Fehler: Messung {size} MP {mode} abgebrochen (Exit-Code {child.returncode})")
+                failed = True
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "cases": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.threshold, args.min_ms / 1000)
+        for problem in problems:
+            print(f"Regression: {problem}")
+        if not problems:
+            print(f"Keine Regression gegenüber {args.baseline} (Schwelle {args.threshold:.0%})")
+        failed |= bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+'''
+Benchmark: viele Varianten eines Bildes.
+
+Vergleicht für ``--count`` Varianten (Seeds 1..count, abwechselnd mit und
+ohne Graustufen und leere Streifen):
+- einzeln: ``process_file`` pro Variante (jedes Mal dekodieren und umwandeln)
+- gemeinsam: ``render_variants`` (einmal dekodieren, Raster und leere
+  Streifen geteilt, Varianten parallel)
+
+    python benchmarks/bench_variants.py --width 4000 --height 3000 --count 20
+'''
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from encoder import EncoderSettings
+from slice_engine import SliceParams, process_file
+from timing import StageTimer
+from variants import render_variants, variant_params
+
+
+def make_variants(count):
+    return [{"seed": seed, "grayscale": seed % 2 == 0, "insert_blank": seed % 3 == 0, "blank_width": 40}
+            for seed in range(1, count + 1)]
+
+
+def run_single(path, out, params, variants, encoder):
+    for overrides in variants:
+        process_file(path, out, variant_params(params, overrides), encoder=encoder)
+
+
+def run_shared(path, out, params, variants, encoder, workers):
+    results = render_variants(path, out, params, variants, encoder, workers=workers)
+    errors = [error for _, error in results if error]
+    if errors:
+        raise RuntimeError(errors[0])
+
+
+def timed(func, *args):
+    timer = StageTimer("bench")
+    start = time.perf_counter()
+    with timer:
+        func(*args)
+    return time.perf_counter() - start, timer.stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Quellbild (Standard: synthetisches JPEG)")
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--count", type=int, default=20, help="Anzahl Varianten")
+    parser.add_argument("--workers", type=int, default=0, help="Threads für render_variants (0 = alle Kerne)")
+    parser.add_argument("--format", default="JPEG")
+    args = parser.parse_args()
+
+    params = replace(SliceParams(), strip_count=12)
+    encoder = EncoderSettings(format=args.format.upper())
+    variants = make_variants(args.count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if not path:
+            from bench_encoders import synthetic
+            path = os.path.join(tmp, "source.jpg")
+            synthetic(args.width, args.height).save(path, quality=90)
+        print(f"{args.count} Varianten von {path}, Format {encoder.format}")
+        print(f"{'Ablauf':<12} {'Zeit':>9} {'decode':>9} {'convert':>9} {'blank':>9} {'encode':>9}")
+        for name, func, extra in (("einzeln", run_single, ()), ("gemeinsam", run_shared, (args.workers,))):
+            out = tempfile.mkdtemp(dir=tmp)
+            seconds, stages = timed(func, path, out, params, variants, encoder, *extra)
+            convert = stages.get("convert", 0.0) + stages.get("grayscale", 0.0)
+            print(f"{name:<12} {seconds * 1000:>7.1f}ms {stages.get('decode', 0.0) * 1000:>7.1f}ms "
+                  f"{convert * 1000:>7.1f}ms {stages.get('blank', 0.0) * 1000:>7.1f}ms "
+                  f"{stages.get('encode', 0.0) * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
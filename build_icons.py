@@ -0,0 +1,56 @@
+'''
+Erzeugt icons_rc.py aus den PNG-Icons im Programmordner.
+
+Die Icons werden auf ICON_SIZE verkleinert und als Bytes in ein Python-Modul
+geschrieben. Beim Start muss so keine Datei aus dem Arbeitsverzeichnis
+gelesen und kein 512-px-PNG dekodiert werden; PyInstaller bündelt das Modul
+automatisch. Nach dem Ändern eines Icons erneut ausführen:
+
+    python build_icons.py
+'''
+import io
+import os
+
+from PIL import Image
+
+ICONS = ("folder", "add-image", "picture", "circle-xmark")
+ICON_SIZE = (64, 64)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TARGET = os.path.join(BASE_DIR, "icons_rc.py")
+
+HEADER = """'''
+Icons als vorkompilierte Ressource (erzeugt von build_icons.py, nicht von Hand ändern).
+'''
+from functools import lru_cache
+
+from PyQt6.QtGui import QIcon, QPixmap
+
+"""
+
+FOOTER = """
+
+@lru_cache(maxsize=None)
+def icon(name):
+    \"\"\"Liefert das Icon ``name`` (z.B. "folder") als QIcon.\"\"\"
+    pixmap = QPixmap()
+    pixmap.loadFromData(ICON_DATA[name], "PNG")
+    return QIcon(pixmap)
+"""
+
+
+def main():
+    lines = ["ICON_DATA = {"]
+    for name in ICONS:
+        with Image.open(os.path.join(BASE_DIR, name + ".png")) as img:
+            img.thumbnail(ICON_SIZE, Image.LANCZOS)
+            buffer = io.BytesIO()
+            img.save(buffer, "PNG", optimize=True)
+        lines.append(f"    {name!r}: {buffer.getvalue()!r},")
+    lines.append("}")
+    with open(TARGET, "w") as f:
+        f.write(HEADER + "\n".join(lines) + "\n" + FOOTER)
+    print(f"{TARGET} geschrieben ({len(ICONS)} Icons)")
+
+
+if __name__ == "__main__":
+    main()
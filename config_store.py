@@ -0,0 +1,195 @@
+'''
+Laden und Speichern der config.toml.
+
+``load_config`` legt die Werte aus der Datei über die Standardwerte: fehlende
+Schlüssel behalten den Standard, Werte mit falschem Typ oder ausserhalb des
+gültigen Bereichs werden mit einer Warnung verworfen. Unbekannte Schlüssel
+bleiben erhalten.
+
+``ConfigStore`` fasst schnelle Änderungen (z.B. gedrückt gehaltene Pfeiltaste
+einer SpinBox) zusammen: ``save`` merkt sich nur den neuesten Stand, ein
+Hintergrund-Thread schreibt ihn, sobald ``debounce`` Sekunden lang keine
+weitere Änderung kam. Geschrieben wird atomar in eine temporäre Datei im
+selben Ordner, die anschliessend per ``os.replace`` umbenannt wird; bei einem
+Absturz bleibt so immer eine vollständige Datei zurück.
+'''
+import logging
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_DEBOUNCE = 0.5  # Sekunden
+
+# Gültige Werte für Schlüssel mit fester Auswahl
+CHOICES = {
+    "direction": ("vertical", "horizontal"),
+    "subsampling": ("4:4:4", "4:2:2", "4:2:0"),
+    "profile": ("", "cprofile", "tracemalloc"),
+}
+# Gültiger Bereich (min, max) für Zahlen; None = unbegrenzt
+RANGES = {
+    "strip_count": (1, None),
+    "min_strip_size": (1, None),
+    "max_strip_size": (1, None),
+    "blank_width": (0, None),
+    "quality": (1, 100),
+    "png_compress_level": (0, 9),
+    "stitch_workers": (0, None),
+    "gui_stitch_workers": (0, None),
+    "cache_max_mb": (0, None),
+    "max_image_pixels": (0, None),
+    "output_cache_max_mb": (0, None),
+}
+
+
+def _check(key, value, default):
+    """Liefert ``value`` im Typ von ``default``; wirft ValueError bei ungültigen Werten."""
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError("Wahrheitswert erwartet")
+    elif isinstance(default, int):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("Ganzzahl erwartet")
+        low, high = RANGES.get(key, (None, None))
+        if (low is not None and value < low) or (high is not None and value > high):
+            raise ValueError(f"Wert zwischen {low} und {high} erwartet" if high is not None else f"mindestens {low} erwartet")
+    elif isinstance(default, str):
+        if not isinstance(value, str):
+            raise ValueError("Text erwartet")
+        if key in CHOICES and value not in CHOICES[key]:
+            raise ValueError(f"erlaubt sind {', '.join(map(repr, CHOICES[key]))}")
+    elif isinstance(default, (tuple, list)):
+        if (not isinstance(value, (tuple, list)) or len(value) != len(default)
+                or not all(isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 255 for v in value)):
+            raise ValueError(f"Liste aus {len(default)} Werten zwischen 0 und 255 erwartet")
+        value = tuple(value)
+    return value
+
+
+def merge_config(loaded, defaults):
+    """Legt ``loaded`` über ``defaults`` und verwirft ungültige Werte."""
+    config = dict(defaults)
+    for key, value in loaded.items():
+        if key not in defaults:
+            config[key] = value
+            continue
+        try:
+            config[key] = _check(key, value, defaults[key])
+        except ValueError as e:
+            logging.warning(f"Ungültiger Wert für {key} in der Konfiguration ({value!r}): {e}; "
+                            f"verwende {defaults[key]!r}")
+    if {"min_strip_size", "max_strip_size"} <= defaults.keys() and config["min_strip_size"] >= config["max_strip_size"]:
+        logging.warning("min_strip_size muss kleiner als max_strip_size sein; verwende die Standardwerte")
+        config["min_strip_size"] = defaults["min_strip_size"]
+        config["max_strip_size"] = defaults["max_strip_size"]
+    return config
+
+
+def read_config(path):
+    """Liest die TOML-Datei; nutzt ``tomllib`` (Python 3.11+), sonst ``toml``."""
+    try:
+        import tomllib
+    except ImportError:
+        import toml
+        with open(path, "r") as f:
+            return toml.load(f)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_config(path, defaults):
+    """Liefert die Standardwerte, ergänzt um die gültigen Werte aus ``path`` (falls vorhanden)."""
+    if not os.path.exists(path):
+        return dict(defaults)
+    try:
+        return merge_config(read_config(path), defaults)
+    except Exception as e:
+        logging.error(f"Fehler beim Laden der Konfigurationsdatei: {e}")
+        return dict(defaults)
+
+
+def write_config(path, config):
+    """Schreibt ``config`` atomar (temporäre Datei und Umbenennen) nach ``path``."""
+    import toml
+
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".config-", suffix=".toml", dir=folder)
+    try:
+        with os.fdopen(fd, "w") as f:
+            toml.dump(config, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ConfigStore:
+    """Schreibt die Konfiguration verzögert und zusammengefasst in einem Hintergrund-Thread."""
+
+    def __init__(self, path, debounce=DEFAULT_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._pending = None  # zuletzt übergebener, noch nicht geschriebener Stand
+        self._deadline = 0.0
+        self._writing = False
+        self._written = None  # zuletzt geschriebener Stand
+        self._closed = False
+        self._thread = None
+
+    def save(self, config):
+        """Merkt eine Kopie von ``config`` zum Schreiben vor; kehrt sofort zurück."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ConfigStore ist bereits geschlossen")
+            self._pending = dict(config)
+            self._deadline = time.monotonic() + self.debounce
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Schreibt einen vorgemerkten Stand sofort und wartet, bis er auf der Platte ist."""
+        with self._cond:
+            self._deadline = 0.0
+            self._cond.notify_all()
+            while self._pending is not None or self._writing:
+                self._cond.wait()
+
+    def close(self):
+        """Schreibt ausstehende Änderungen und beendet den Hintergrund-Thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # Warten, bis seit der letzten Änderung ``debounce`` Sekunden vergangen sind
+                while (remaining := self._deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                config, self._pending = self._pending, None
+                self._writing = True
+            try:
+                if config != self._written:
+                    write_config(self.path, config)
+                    self._written = config
+                    self.writes += 1
+            except Exception as e:
+                logging.error(f"Fehler beim Speichern der Konfigurationsdatei: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
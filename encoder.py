@@ -0,0 +1,197 @@
+'''
+Ausgabe-Encoder von Image Slice & Stitch.
+
+Format und Qualität der Ausgabe werden über config.toml eingestellt
+(``output_format``, ``quality``, ``progressive``, ``optimize``, ``subsampling``,
+``png_compress_level``, ``tiff_compression``). Die Voreinstellungen entsprechen
+dem bisherigen Verhalten (JPEG mit Pillow-Standardwerten).
+
+``WriteBehindQueue`` kodiert und schreibt Bilder in einer begrenzten Anzahl
+Writer-Threads, sodass das Kodieren eines Bildes mit dem Zerschneiden des
+nächsten überlappt. Pillow gibt beim Kodieren den GIL frei. Für jedes Format
+werden Zeit und Dateigrösse erfasst (``EncodeStats``).
+'''
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+
+from timing import annotate, stage
+
+# Format -> Dateiendung
+OUTPUT_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "TIFF": ".tif"}
+# Format -> Bildmodi, die ohne Umwandlung gespeichert werden
+FORMAT_MODES = {
+    "JPEG": ("L", "RGB", "CMYK"),
+    "PNG": ("L", "LA", "RGB", "RGBA", "I;16"),
+    "WEBP": ("RGB", "RGBA"),
+    "TIFF": ("L", "LA", "RGB", "RGBA", "CMYK", "I;16"),
+}
+# Nächster Modus ohne Alpha bzw. mit 8 Bit, falls das Format den Modus nicht kennt
+_FALLBACK_MODES = {"LA": "L", "RGBA": "RGB", "CMYK": "RGB", "I;16": "L"}
+SUBSAMPLING_MODES = ("4:4:4", "4:2:2", "4:2:0")
+
+
+@dataclass
+class EncoderSettings:
+    """Einstellungen für das Speichern des Ergebnisbildes."""
+    format: str = "JPEG"
+    quality: int = 75
+    progressive: bool = False
+    optimize: bool = False
+    subsampling: str = "4:2:0"
+    png_compress_level: int = 6
+    tiff_compression: str = ""
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt die Einstellungen aus einem Konfigurations-Dictionary (config.toml)."""
+        defaults = cls()
+        return cls(
+            format=str(config.get("output_format", defaults.format)).upper(),
+            quality=int(config.get("quality", defaults.quality)),
+            progressive=bool(config.get("progressive", defaults.progressive)),
+            optimize=bool(config.get("optimize", defaults.optimize)),
+            subsampling=config.get("subsampling", defaults.subsampling),
+            png_compress_level=int(config.get("png_compress_level", defaults.png_compress_level)),
+            tiff_compression=config.get("tiff_compression", defaults.tiff_compression),
+        )
+
+    def validate(self):
+        """Prüft die Einstellungen und wirft ValueError mit einer lesbaren Meldung."""
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unbekanntes Ausgabeformat: {self.format}")
+        if not 1 <= self.quality <= 100:
+            raise ValueError("Die Qualität muss zwischen 1 und 100 liegen!")
+        if self.subsampling not in SUBSAMPLING_MODES:
+            raise ValueError(f"Unbekanntes Subsampling: {self.subsampling}")
+        if not 0 <= self.png_compress_level <= 9:
+            raise ValueError("Der PNG-Kompressionsgrad muss zwischen 0 und 9 liegen!")
+
+    @property
+    def extension(self):
+        return OUTPUT_FORMATS[self.format]
+
+    def save_options(self):
+        """Liefert die Optionen für ``Image.save`` zum gewählten Format."""
+        if self.format == "JPEG":
+            return {"quality": self.quality, "progressive": self.progressive,
+                    "optimize": self.optimize, "subsampling": self.subsampling}
+        if self.format == "PNG":
+            return {"compress_level": self.png_compress_level, "optimize": self.optimize}
+        if self.format == "WEBP":
+            return {"quality": self.quality}
+        if self.tiff_compression:
+            return {"compression": self.tiff_compression}
+        return {}
+
+
+def convert_mode(img, mode):
+    """Wandelt ``img`` nach ``mode`` um; 16 Bit wird dabei auf 8 Bit skaliert statt abgeschnitten."""
+    if img.mode == mode:
+        return img
+    if img.mode == "I;16" and mode != "I;16":
+        img = img.convert("I").point(lambda v: v * (1 / 257)).convert("L")
+    return img if img.mode == mode else img.convert(mode)
+
+
+def encodable(img, fmt):
+    """Liefert ``img`` in einem Modus, den ``fmt`` speichern kann; unverändert, wenn möglich."""
+    modes = FORMAT_MODES.get(fmt)
+    if modes is None or img.mode in modes:
+        return img
+    fallback = _FALLBACK_MODES.get(img.mode, "RGB")
+    return convert_mode(img, fallback if fallback in modes else "RGB")
+
+
+def encode(img, path, settings):
+    """Speichert ``img`` gemäss ``settings`` und liefert (Sekunden, Bytes).
+
+    Der Bildmodus wird nur umgewandelt, wenn das Format ihn nicht unterstützt.
+    """
+    img = encodable(img, settings.format)
+    with stage("encode"):
+        start = time.perf_counter()
+        img.save(path, settings.format, **settings.save_options())
+        seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    annotate(output=path, output_format=settings.format, bytes_written=size)
+    return seconds, size
+
+
+class EncodeStats:
+    """Sammelt Kodierzeit und Dateigrösse pro Format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}  # Format -> [Anzahl, Sekunden, Bytes, Megapixel]
+
+    def add(self, fmt, seconds, size, megapixels):
+        with self._lock:
+            entry = self.entries.setdefault(fmt, [0, 0.0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += size
+            entry[3] += megapixels
+
+    def merge(self, entries):
+        for fmt, (count, seconds, size, megapixels) in entries.items():
+            with self._lock:
+                entry = self.entries.setdefault(fmt, [0, 0.0, 0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+                entry[2] += size
+                entry[3] += megapixels
+
+    def report(self):
+        """Liefert eine Textzeile pro Format mit mittlerer Zeit, Grösse und Durchsatz."""
+        lines = []
+        for fmt, (count, seconds, size, megapixels) in sorted(self.entries.items()):
+            rate = megapixels / seconds if seconds else 0.0
+            lines.append(f"{fmt:<5} {count:>6} Dateien  {seconds / count * 1000:>8.1f} ms/Datei  "
+                         f"{size / count / 1024:>9.1f} KiB/Datei  {rate:>7.1f} MP/s")
+        return "\n".join(lines)
+
+
+class WriteBehindQueue:
+    """Kodiert und schreibt Bilder im Hintergrund mit begrenzter Anzahl Threads.
+
+    ``submit`` blockiert, sobald ``max_pending`` Bilder auf das Schreiben
+    warten, damit nicht beliebig viele fertige Bilder im Speicher liegen.
+    """
+
+    def __init__(self, settings, writers=2, max_pending=None, stats=None):
+        self.settings = settings
+        self.stats = stats if stats is not None else EncodeStats()
+        self._executor = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="writer")
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * writers)
+
+    def submit(self, img, path):
+        """Stellt ``img`` zum Schreiben nach ``path`` ein und liefert ein Future mit dem Pfad."""
+        self._slots.acquire()
+        try:
+            # Im Kontext des Aufrufers schreiben, damit die Zeitmessung beim richtigen Timer landet
+            return self._executor.submit(copy_context().run, self._write, img, path)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _write(self, img, path):
+        try:
+            seconds, size = encode(img, path, self.settings)
+            self.stats.add(self.settings.format, seconds, size, img.width * img.height / 1e6)
+            return path
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Wartet, bis alle eingestellten Bilder geschrieben sind."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,16 +1,64 @@
 from PyQt6.QtWidgets import (
     QFileDialog, QLabel, QPushButton, QGroupBox, QMessageBox,
-    QVBoxLayout, QHBoxLayout, QWidget, QSpinBox, QCheckBox, QRadioButton, QSplitter
+    QVBoxLayout, QHBoxLayout, QWidget, QSpinBox, QCheckBox, QRadioButton, QSplitter, QProgressBar
 )
-from PyQt6.QtGui import QPixmap, QIcon
+from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtCore import Qt
 import os
+from icons_rc import icon
 
-# Konstanten für Dateiformate und Standardwerte
-SUPPORTED_IMAGE_FORMATS = "*.png *.jpg *.jpeg *.bmp *.gif"
+# Konstanten für Standardwerte
 DEFAULT_PREVIEW_WIDTH = 400
 DEFAULT_PREVIEW_HEIGHT = 300
 
+# Pillow-Modus -> (QImage-Format, Bytes pro Pixel)
+_QIMAGE_FORMATS = {
+    "L": (QImage.Format.Format_Grayscale8, 1),
+    "I;16": (QImage.Format.Format_Grayscale16, 2),
+    "RGB": (QImage.Format.Format_RGB888, 3),
+    "RGBA": (QImage.Format.Format_RGBA8888, 4),
+}
+
+
+def pil_to_qimage(img):
+    """Wandelt ein Pillow-Bild ohne Umweg über eine Datei in ein QImage um (L, I;16, RGB und RGBA direkt)."""
+    if img.mode not in _QIMAGE_FORMATS:
+        img = img.convert("RGBA" if img.mode == "LA" else "RGB")
+    fmt, bytes_per_pixel = _QIMAGE_FORMATS[img.mode]
+    data = img.tobytes()
+    return QImage(data, img.width, img.height, img.width * bytes_per_pixel, fmt).copy()  # copy: data gehört Python
+
+class PixmapPyramid:
+    """Bild mit vorberechneten, jeweils halbierten Stufen.
+
+    Beim Skalieren auf die Labelgrösse wird von der kleinsten Stufe
+    ausgegangen, die noch gross genug ist, statt jedes Mal vom Original.
+    """
+    MIN_LEVEL_SIZE = 128
+
+    def __init__(self, image):
+        if isinstance(image, QPixmap):
+            image = image.toImage()
+        self.levels = [QPixmap.fromImage(image)]
+        while min(image.width(), image.height()) >= 2 * self.MIN_LEVEL_SIZE:
+            image = image.scaled(image.width() // 2, image.height() // 2,
+                                 Qt.AspectRatioMode.IgnoreAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+            self.levels.append(QPixmap.fromImage(image))
+
+    @property
+    def original(self):
+        return self.levels[0]
+
+    def scaled(self, width, height):
+        target = self.original.size().scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+        level = self.original
+        for candidate in self.levels[1:]:
+            if candidate.width() < target.width() or candidate.height() < target.height():
+                break
+            level = candidate
+        return level.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+
 class ClickableLabel(QLabel):
     def __init__(self, text="Kein Bild ausgewählt", parent=None, main_window=None):
         super().__init__(text, parent)
@@ -19,6 +67,7 @@ class ClickableLabel(QLabel):
         self.setStyleSheet(f"border: 2px dashed gray; min-height: {DEFAULT_PREVIEW_HEIGHT}px; min-width: {DEFAULT_PREVIEW_WIDTH}px;")
         self.setAcceptDrops(True)  # Drag & Drop aktivieren
         self.original_pixmap = None
+        self.pyramid = None
         self.current_file_path = None
 
     def mousePressEvent(self, event):
@@ -27,15 +76,11 @@ class ClickableLabel(QLabel):
         else:
             default_dir = ""
 
+        from slice_engine import SUPPORTED_IMAGE_FORMATS  # erst hier, damit Pillow beim Start nicht geladen wird
         file_path, _ = QFileDialog.getOpenFileName(self, "Bild auswählen", default_dir, f"Bilder ({SUPPORTED_IMAGE_FORMATS})")
         if file_path:
             self.current_file_path = file_path  # Speichere den Pfad
-            self.original_pixmap = QPixmap(file_path) #bild laden
-            self.update_pixmap()  #bild aktualisieren
-            self.setText("")
-
-            if self.main_window:
-                self.main_window.selected_file = file_path
+            self.load_file(file_path)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -45,15 +90,27 @@ class ClickableLabel(QLabel):
         for url in event.mimeData().urls():
             file_path = url.toLocalFile()
             self.current_file_path = file_path
-            self.original_pixmap = QPixmap(file_path) #bild laden
-            self.update_pixmap() #bild aktualisieren
-            self.setText("")
-            if self.main_window:
-                self.main_window.selected_file = file_path
+            self.load_file(file_path)
+
+    def load_file(self, file_path):
+        """Zeigt die Datei an; mit Hauptfenster wird sie dort verkleinert dekodiert und ausgewählt."""
+        self.setText("")
+        if self.main_window:
+            self.main_window.set_selected_file(file_path)
+        else:
+            self.set_image(QPixmap(file_path)) #bild laden und aktualisieren
+
+    def set_image(self, image):
+        """Setzt ein QImage oder QPixmap und berechnet die Skalierungsstufen."""
+        if image.isNull():
+            return
+        self.pyramid = PixmapPyramid(image)
+        self.original_pixmap = self.pyramid.original
+        self.update_pixmap()
 
     def update_pixmap(self):
-        if self.original_pixmap: #überprüfung ob ein Bild geladen wurde
-            self.setPixmap(self.original_pixmap.scaled(self.width(), self.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        if self.pyramid: #überprüfung ob ein Bild geladen wurde
+            self.setPixmap(self.pyramid.scaled(self.width(), self.height()))
 
     def resizeEvent(self, event):
         self.update_pixmap()
@@ -66,19 +123,23 @@ class ScalableLabel(QLabel):
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setStyleSheet(f"border: 2px dashed gray; min-height: {DEFAULT_PREVIEW_HEIGHT}px; min-width: {DEFAULT_PREVIEW_WIDTH}px;")
         self.original_pixmap = None
+        self.pyramid = None
         self.setText("Kein Bild generiert")
 
     def setPixmap(self, pixmap):
-        self.original_pixmap = pixmap #das Originalbild wird nur in der Variable original_pixmap gespeichert
+        self.set_image(pixmap) #das Originalbild wird nur in der Pyramide gespeichert
+
+    def set_image(self, image):
+        """Setzt ein QImage oder QPixmap und berechnet die Skalierungsstufen."""
+        if image.isNull():
+            return
+        self.pyramid = PixmapPyramid(image)
+        self.original_pixmap = self.pyramid.original
         self.update_pixmap()  # Bild aktualisieren
 
     def update_pixmap(self):
-        if self.original_pixmap:
-            scaled_pixmap = self.original_pixmap.scaled(
-                self.width(), self.height(),
-                Qt.AspectRatioMode.KeepAspectRatio
-            )
-            super().setPixmap(scaled_pixmap)
+        if self.pyramid:
+            super().setPixmap(self.pyramid.scaled(self.width(), self.height()))
 
     def resizeEvent(self, event):
         self.update_pixmap()
@@ -90,11 +151,11 @@ def init_ui(self):
     folder_group.setStyleSheet("QGroupBox { font-weight: bold; }")
     folder_layout = QVBoxLayout()
     dir_name_in = os.path.basename(self.config["input_folder"])
-    self.btn_input_folder = QPushButton(QIcon(os.path.join(os.getcwd(), "folder.png")), f"Aktueller Input-Ordner ({dir_name_in})")
+    self.btn_input_folder = QPushButton(icon("folder"), f"Aktueller Input-Ordner ({dir_name_in})")
     self.btn_input_folder.setToolTip("Wählen Sie den Ordner, der die Eingabebilder enthält.")
     self.btn_input_folder.clicked.connect(self.select_input_folder)
     dir_name_out = os.path.basename(self.config["output_folder"])
-    self.btn_output_folder = QPushButton(QIcon(os.path.join(os.getcwd(), "folder.png")), f"Aktueller Output-Ordner ({dir_name_out})")
+    self.btn_output_folder = QPushButton(icon("folder"), f"Aktueller Output-Ordner ({dir_name_out})")
     self.btn_output_folder.setToolTip("Wählen Sie den Ordner, in dem die Ausgabebilder gespeichert werden.")
     self.btn_output_folder.clicked.connect(self.select_output_folder)
     folder_layout.addWidget(self.btn_input_folder)
@@ -105,7 +166,7 @@ def init_ui(self):
     file_group = QGroupBox("Bildauswahl")
     file_group.setStyleSheet("QGroupBox { font-weight: bold; }")
     file_layout = QVBoxLayout()
-    self.btn_select_file = QPushButton(QIcon(os.path.join(os.getcwd(), "add-image.png")), "Bild auswählen")
+    self.btn_select_file = QPushButton(icon("add-image"), "Bild auswählen")
     self.btn_select_file.setToolTip("Wählen Sie ein Bild aus dem Eingabe-Ordner aus.")
     self.btn_select_file.clicked.connect(self.select_file)
     file_layout.addWidget(self.btn_select_file)
@@ -200,16 +261,20 @@ def init_ui(self):
     actions_group = QGroupBox("Aktionen")
     actions_group.setStyleSheet("QGroupBox { font-weight: bold; }")
     actions_layout = QVBoxLayout()
-    self.btn_generate = QPushButton(QIcon(os.path.join(os.getcwd(), "picture.png")), "Bild generieren")
-    self.btn_generate.setToolTip("Klicken Sie hier, um das Streifenbild zu generieren.")
+    self.btn_generate = QPushButton(icon("picture"), "Bild generieren")
+    self.btn_generate.setToolTip("Klicken Sie hier, um das Streifenbild in voller Auflösung zu speichern.")
     self.btn_generate.setStyleSheet(f'background-color: #B7B7B7; color: seagreen;')
     self.btn_generate.clicked.connect(self.generate_image)
-    self.btn_quit = QPushButton(QIcon(os.path.join(os.getcwd(), "circle-xmark.png")), "Beenden")
+    self.btn_quit = QPushButton(icon("circle-xmark"), "Beenden")
     self.btn_quit.setToolTip("Klicken Sie hier, um das Programm zu beenden.")
     self.btn_quit.clicked.connect(self.close)
     self.btn_about = QPushButton("Über")
     self.btn_about.setToolTip("Klicken Sie hier, um Informationen über das Programm anzuzeigen.")
     self.btn_about.clicked.connect(self.show_about)
+    self.btn_reshuffle = QPushButton("Neu mischen")
+    self.btn_reshuffle.setToolTip("Klicken Sie hier, um eine neue Streifen-Reihenfolge für die Vorschau zu wählen.")
+    self.btn_reshuffle.clicked.connect(self.reshuffle_preview)
+    actions_layout.addWidget(self.btn_reshuffle)
     actions_layout.addWidget(self.btn_generate)
     actions_layout.addWidget(self.btn_quit)
     actions_layout.addWidget(self.btn_about)
@@ -250,6 +315,13 @@ def init_ui(self):
     container.setLayout(container_layout)
     self.setCentralWidget(container)
 
+    # Fortschritt der Generierung in der Statusbar
+    self.progress_bar = QProgressBar()
+    self.progress_bar.setRange(0, 100)
+    self.progress_bar.setMaximumWidth(200)
+    self.progress_bar.hide()
+    self.statusBar().addPermanentWidget(self.progress_bar)
+
     # Automatisches Speichern bei Änderungen
     self.strip_count.valueChanged.connect(self.save_config)
     self.random_strips.stateChanged.connect(self.save_config)
@@ -264,6 +336,16 @@ def init_ui(self):
     self.btn_output_folder.clicked.connect(self.select_output_folder)
     self.grayscale_checkbox.stateChanged.connect(self.save_config)
 
+    # Live-Vorschau bei Änderungen (entprellt über preview_timer)
+    self.strip_count.valueChanged.connect(self.schedule_preview)
+    self.random_strips.stateChanged.connect(self.schedule_preview)
+    self.min_strip_size.valueChanged.connect(self.schedule_preview)
+    self.max_strip_size.valueChanged.connect(self.schedule_preview)
+    self.horizontal_radio.toggled.connect(self.schedule_preview)
+    self.insert_blank.stateChanged.connect(self.schedule_preview)
+    self.blank_width.valueChanged.connect(self.schedule_preview)
+    self.grayscale_checkbox.stateChanged.connect(self.schedule_preview)
+
 
 def show_about(self):
     """Zeigt ein Popup mit Informationen über das Programm an."""
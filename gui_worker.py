@@ -0,0 +1,125 @@
+'''
+Hintergrund-Generierung für die GUI.
+
+Die Generierung (Laden, Zusammensetzen, Speichern) läuft als QRunnable in einem
+QThreadPool, damit die Event-Loop nicht blockiert. Fortschritt und Ergebnis
+werden über Signale an den Haupt-Thread gemeldet; das Ergebnis kommt als
+bereits verkleinertes QImage, dort wird nur noch die Vorschau aktualisiert. Ein Auftrag kann abgebrochen werden und beendet sich dann am
+nächsten Zwischenschritt.
+'''
+import logging
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from encoder import EncoderSettings, convert_mode, encode
+from gui_layout import pil_to_qimage
+from slice_engine import (StripLayout, fit_layout, layout_path, load_proxy, output_path, save_missing_layout,
+                          stitch_image)
+from timing import StageTimer, annotate, stage
+
+# Maximale Grösse der Vorschau, die an den Haupt-Thread übergeben wird
+PREVIEW_MAX_SIZE = (2048, 2048)
+
+
+def _preview_mode(img):
+    """Vorschau in 8 Bit: 16 Bit braucht nur die Datei, und ältere Pillow-Versionen skalieren I;16 nicht."""
+    return convert_mode(img, "L") if img.mode == "I;16" else img
+
+
+class GenerateCancelled(Exception):
+    """Wird intern ausgelöst, wenn ein Auftrag abgebrochen wurde."""
+
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, int)   # Auftrags-ID, Prozent
+    finished = pyqtSignal(int, str, object)   # Auftrags-ID, Ausgabedatei, verkleinertes QImage
+    failed = pyqtSignal(int, str)     # Auftrags-ID, Meldung
+
+
+class GenerateWorker(QRunnable):
+    """Erstellt ein Streifenbild im Hintergrund."""
+
+    def __init__(self, job_id, input_path, output_folder, params, raster_cache, layout=None, save_layout=False,
+                 encoder=None, preview_size=PREVIEW_MAX_SIZE, profile="", output_cache=None):
+        super().__init__()
+        self.job_id = job_id
+        self.input_path = input_path
+        self.output_folder = output_folder
+        self.params = params
+        self.raster_cache = raster_cache
+        self.layout = layout
+        self.save_layout = save_layout
+        self.encoder = encoder or EncoderSettings()
+        self.preview_size = preview_size
+        self.profile = profile
+        self.output_cache = output_cache
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _checkpoint(self, percent):
+        if self._cancelled.is_set():
+            raise GenerateCancelled()
+        self.signals.progress.emit(self.job_id, percent)
+
+    def run(self):
+        try:
+            timer = StageTimer("generate", profile=self.profile, job_id=self.job_id, input=self.input_path)
+            with timer:
+                output_filename, preview = self._generate()
+            self.signals.finished.emit(self.job_id, output_filename, preview)
+            timer.emit()
+        except GenerateCancelled:
+            logging.info(f"Generierung {self.job_id} abgebrochen")
+        except ValueError as e:
+            self.signals.failed.emit(self.job_id, str(e))
+        except (FileNotFoundError, OSError):
+            self.signals.failed.emit(self.job_id, "Fehler: Ungültiges Bildformat oder Datei nicht gefunden.")
+        except Exception as e:
+            # Nichts darf aus QRunnable.run entkommen, sonst bricht PyQt6 per qFatal ab
+            logging.exception(f"Generierung {self.job_id} fehlgeschlagen")
+            self.signals.failed.emit(self.job_id, f"Fehler: {type(e).__name__}: {e}")
+
+    def _generate(self):
+        self._checkpoint(0)
+        key = None
+        if self.output_cache:
+            with stage("output_cache"):
+                key = self.output_cache.key(self.input_path, self.output_folder, self.params, self.encoder, self.layout)
+                cached = self.output_cache.lookup(key) if key else None
+            annotate(output_cache_hit=bool(cached))
+            if cached:
+                # Gleiche Eingabe und Einstellungen: vorhandene Datei anzeigen statt neu zu rechnen
+                if self.save_layout:
+                    with stage("layout_save"):
+                        save_missing_layout(self.input_path, cached, self.params, self.layout)
+                self._checkpoint(90)
+                with stage("preview"):
+                    preview = pil_to_qimage(_preview_mode(load_proxy(cached, self.preview_size)[0]))
+                self._checkpoint(100)
+                return cached, preview
+
+        img = self.raster_cache.load(self.input_path, self.params)
+        self._checkpoint(30)
+        layout = fit_layout(self.layout or StripLayout.generate(img.size, self.params), img.size)
+        new_img = stitch_image(img, self.params, layout=layout)
+        self._checkpoint(70)
+        output_filename = output_path(self.output_folder, self.encoder.extension)
+        encode(new_img, output_filename, self.encoder)
+        if key:
+            self.output_cache.store(key, output_filename)
+        if self.save_layout:
+            with stage("layout_save"):
+                layout.save(layout_path(output_filename))
+        self._checkpoint(90)
+
+        # Vorschau im Speicher verkleinern, statt die JPEG-Datei neu zu dekodieren
+        with stage("preview"):
+            new_img = _preview_mode(new_img)
+            new_img.thumbnail(self.preview_size)
+            preview = pil_to_qimage(new_img)
+        self._checkpoint(100)
+        return output_filename, preview
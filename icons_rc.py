@@ -0,0 +1,21 @@
+'''
+Icons als vorkompilierte Ressource (erzeugt von build_icons.py, nicht von Hand ändern).
+'''
+from functools import lru_cache
+
+from PyQt6.QtGui import QIcon, QPixmap
+
+ICON_DATA = {
+    'folder': b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00@\x00\x00\x00@\x08\x06\x00\x00\x00\xaaiq\xde\x00\x00\x02\xfdIDATx\xda\xed\x9b!\x8f\xd4@\x14\x80\xbf\xe9v\x17\x96\x03\xc2)\x04\x18\xce\x10\x82%\x9c\xc3\x81#A\x81#`@\xf3\x0f0h0\x04BB\x00\x81\xe1/`0$@\xf0\x08\x04\x06\x81 \x10\xee\xb8p\xb0\xdb\x0e\x827\xb9I\x99\xf6\xdan\xdb\xdb\xdd\xbe\x97\xbc\xb4\xdbI;\xf3\xbey3\xefM\xa7k\x08\x8b\x01"9\xd6\x95Tt\xa1\xc4\x00\x83\x06\x9f7\x10\x90sm\xb0\x93\xc8\xeb\xb11p\x1a8\x0e\x8cj<\xd7\x02\xef\x81O\x1e\x08;\xcf\x1e\xe1z}\x15\xb8#\r\xb73\xea\x0f\xe0.pb\xde=\xc2\x19\x7f\x06\xf8\xe8\x19\x90\x02\xd3\x19\xd4\x07q\x0fX\x9bg\x10\xa7\x80o\xd2\xe0?@\xe2A\xa8\xa3\xee\xdeII\x10\xa6e-\x94!\xf0N\x1a\xe97x:\x83\xfbO3\x10\xfd\xe7n\xc8\xd0X\xeb\xb8\x93\xe3\x90\xd7\x19\xe0*\xf0L\x1a\x9c\x8d\x00\xdb\xc0\xaf\x1aC\xea\xb0\x9c\'^H\xb5\xf2;\x96\xb2M\xe01\xf0\x00\xf8\xeaM\x9eMK"\xd0\xfd\xc9\xdeu\x06\x06x\x05\x9c\x93\x0b.\x12\x18\xe06\xf0\x14\xd8\xf2o(\x11U\x86\xc0%\xe0\x16p\xb2\x04\x88\t\xf0\xb3\xc5\x9e\x9f\x00_\x80\xd7\xd2\xd1o\xbd\xb6Z\x80\xef\x01W}\xd2@\xc5c\xe0&\xf0\xa1\xe4\xd0\xe8J\x1f\x02\xfb\xfd4 \r\x8c\xfb\xcb\xe2\xca\xa3\x9a\x93\xce\xa0"\x88\xb65\x11\xd8\xae\xce\x97\x02a@`\xf2r\x00\xf0\xdc\xb4\x89\xacr\x0c\xdc\x08\x80h[}\xc3-\xf0[\x8e\xf7\xfd\xac\xad\r\x00U@t\xa1i&\xbfI\x81u\x93\x99\xdc\\$\xb8\x02\xbc\x10\x00\xd3\x06\xd3\xeeH\xea@\\\xf0\xbc\x00\xb13.\xbc\x8a\xea<\x02\\\x07\xd6\xbdz\x9c\x9d\xcf\xbb\xf0\x80\xb6\x17\\ed\x04\xbc\xf1lt\xde\xf09\xa6{\xb1\x99\xb0hZ\xaek(\xf9\xcc\xa3\x8c\x17\x00\x1c\xcd\x03\x10I\xef\xef\x05\xa06V\xbb\xb1\xe43\xd9\x15p\x9cg\xe0\xa67\x8b.\xba8\x1b\xb6\xf2\xf2\xe3\x10\xb1\x0b2y\xc4\x9e\xcb\xf8\x1a\xedrl\xa3\xac\xce\xfd\x91\xcc7\xa9\xb7\xf6\x88\xb2\x06[z,\xf12\xbd\xcf\xdbE\xa2\xd0j0\xae\x18\xaa\xba\xf0\x96N=R\x87@A\x14\xd8n0\r\xcd.\xba\xb2\xe9i\xddki\xa0<{\xee2\xdcc\xc0\xd9P\xd6\x19\xca\x04\xaf\xc9K\x8dU\xe0\x10p\x10X\x01\x0e\x88\x8e%\x95\xdd\':\x92\x84\xc3\xe5\x0e\x83\x0e\x92\x9c\xaar1\xf4\xa6\xab\xc8\x036:\x1e"\xa6\xa5r\xb7\x9eY\xa92\x04by`\x93\x8b!\xdbry\x11\x98$/\xaa\xc5\x05\x95\xd9\n\xaf\xc2\x16:6\xf6Z\x14\x80\x02P\x00\n@\x01(\x00\x05\xa0\x00\x14\x80\x02P\x00\n@\x01(\x00\x05\xa0\x00\x14\x80\x02P\x00\n@\x01(\x00\x05\xd0\x1f)\xfa>\xa0\xf4\xf7\xf6s.\x85v\xe4\x01p;\xa8\x93%\xe8\xe4\x89gSi\x00nk\xbc\xc9\xcd\xd1\xbd\xf4\xf2);\xffa\xf8\xcf=B\x9b\x9f[\xfc\xfb\xeb\xcc2\xc9\x88\xc0\x16\xb9~"\x93s}Y\xa1\x98\x10\x80\xa4\xcf\x1e\xd0\xfb!`\xd8\xf94^\xa5\xaf\x1e\x10\xf7\x19\xc0_3[\xaf\x9a\x91\xe9#\xa9\x00\x00\x00\x00IEND\xaeB`\x82',
+    'add-image': b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00@\x00\x00\x00@\x08\x06\x00\x00\x00\xaaiq\xde\x00\x00\x07\\IDATx\xda\xdd\x9b\x7f\x88\x15U\x14\xc7?\xf3\xe6\xbd\xd5U\xa855)\x82\xc2\x14\xfa\x05A[T`QT\x84\x99\xa4i\x12-\xb5R\xfd\x1bQ\xf8G\xfe\x93\x92\x11EPF\xd1\x7f\x85\xf4\x03\x12\xd4\x8c\n\x8a\xca""(\x0b\xa3\x92P\xcc(\xcb\x10\xdc\xc0Z7\xdd7\xf3\xa6?\xde\xb9\xec\xd9\xb3w\xe6\xcd\xfb5o\xb7\x0b\x97\xb9o\xe6\xce\x9d\xfb\xfd\xdes\xcf9\xf7\xdc\xfb\x02\xfc)\x04b)/\x05V\x037\x03\x97\x00\x0b\x81>z\x9b\x12`\x0c8\n|\x0b\xbc\x0f\xbc\x0b\x9c\xf0\xf4\xbf\xa9\x14\x00%)_\x0cl\x93F\x93\x19\x90\x0f\x03\x1b\x81\xb9\x8a\x84\x96\xc1?*\x0c\xbb\xc6#a\xb46\xcd@\xd7T\xdf\xdc\xbd\x9f\x80\xeb\x04G\xb9\x15\xf0\xaf\xa8\xc6\xaa\nt,\xbf\xab\xf2\xd1^\xe7\xaa\xe9_M~\xbb~\x0f5C\x82\x13\x97W\xa5\x81q\x03<\x9e\xe6\xe2\x1f\xa9\xfe\xea\xf2\x9aF\xd3!P\n\xe3\x11\xe09a\xaf"\xcfkJ2~\x00>\x06\xf6\x03\xa3\xf2\x81^\xa5\x92(\xe3\xab\x80[\x81\xb3\x95r\x0c\xa4\xdf\x00\xa7\x80A\xe0\x80\xb9?\x85\x84\xa5R\xd92\x99\x00\xbf\x02\xebZQ*\x05\xa5\x85\xc0\x93JJm\xff?7S\xdc\x9b^Ws\'Q\x8d\xed\x05\xceQD\x95\x0b\xca\xb3\x80\xd9r\xd5e[O\x0f\xcam\xc0I\xa3\xac\x1d\x9eUYSa\xb1h\xfc\x9ad\xd7\xc0\x11%Z\x95\x82F3l\xa1N\xa0\xfc\x92\xb5f\x00\x9dD\x7f\xa6\xa6\xce\x94\xf4\x98\x11\x99\xc8(\x90\xa2\xc1\x87\xc0-\xc0\x16\xe0\r\xc9[\xe4^\x98A\x94\xeb\xe7[\x06\x87S\xea\x8b\xd3H\xf8D\x8d\xbccn\x7f\x9ey\xd3\x05\xf0\xcb\x81}\x19\xda~\x9f\xd4\xf1\x91\x10J\x9f\x07\xcd4pD\xdc\x9bf\x16\x8fz\xec\xe8\xb3\xcd:\x12\x1d\x00\xbf\xc1\x98\xb5\xaa\xc9zD7dHB\x08\x1c4\xbeK\x02<\x93\x86i\xdc8>\t\xb0\xbe \x02\x1c\x80!\x05<2^\x9e\xb5L\xee\xf9\x90\x87\x04W~\xcf\x10\x99\x00\xaf\xf90\x95\xcc\x1c\x0f\xe4:V\xc0\xc8;\xbb\xbc\x08xI\xca\xce/IT\xd9\x89v\xa2\xca5yg\x91zO\xa7\x93\xca/pi\x96\xe7^as<m\xf4\x13\xe0\x01`@9]\x0e|\x04| \xb9\xaaH(I\xdd\x01\xe0~EL\xcb\x1eU\xaf\x92[\xae\xde\xae@\xbb\xd19\x0e,\x13\x85\xb7\\\x167\xc7\x8d\xb7\x97\x00+\x95\xc7:\xa3\x08p\x00\xe6\x00\x17(\x8b\x13K\xf9y\xe0+\xb1\xef}R\xde*\xcfb\xa9\x1b\xc8\xbbsR\xa6\xc1\xb4\x97\x00\x94\xa7g\xd3\x01\xa3\x9b*r/\xef\xfb3\x86\x80\x93\xc0\xdfF\xb4\x11\xd1\xae\x8a\x85\x1a\x97\xf2J#=\xc8\xbb\xa3\xedt\xa0\xdc!q.\xa9\xcek \xb5\x94\xf9\xe9\x14\xd78\xf0#p\xbe\xd4+\xcbu\x18\xf8Eb\x13\x00\x0f\x02\xf7\xc9\xb3P\x14d +\xd4j;!0<\xeb\xeaDV\x7f\x8d\x08\nrj\xdf\xb4z\xae\xedu\xc6\x07\xd1y\xccD\xa6\xac\xbfb\xfb\xe9\xbe\xb3]\xd5su\xb7\xfb\x9c\xa7V% T\xae\xf3\x00p=p\xa5\x8cd\x05\x18\x11w\xfa\x0b\x19\xe1\xd83J\x91H\xce.\xe0\x1by?R}\x8a\x81~U\x0e\xd5{eyg\x97\xb4\x11\xb5\x1bamF\x02\\G\xe6\x03O+W:-R\xf3\x91D\x94\x9d4\x04\x1e\x1dt\x91\x90\xe6\x16.zm\xaf#S\xcek\x1d\x91w\xac\x1ekZ\x02\x9a%\xc0\xfd\xbeQ\xe6h\x96\xefnE\xfa\x05\xa5+J\x1e\x12\xaeP>|\x9a+\x9cH\x9d\xc1\x14%\xdeU\x02\x9cYZ\xadF\xc2\x06%#O\x94V\xfb\xefoK\x9bA\xca\xc8\r\xc8\xd2\xf7pJ\xd8{\x8b\xd4\xc9Z\x08u\x85\x00\r>R`\x13S\xb6!\xeb\xd8\xac\xc9\x13\xe0\x1di/M\x12\x90\xb9?(\x91\x9cUR\xee\xcfa\xbe\xbbB\x80\x0f\xbc\x8d\xbf%\xc01\xe0C\x19\xe5\xef<mZ\x12|\x92\xd0\xc8\xb2\x84\r<\xbe\x8e\x130;\x03\xbc\xben\x04\xce2\xed.\x93\x98\xa25q\x8dH\xd0\xbe\x85[\r\x96r\xba\xba\x1d%\xa0\xd4\x00\xbc\x0b\xa0\xac2\xa2\xa9Gi\xaeD\x9c\xb2H\xa8t0\xfa\xd41\x02\x86T\x901\x0b\xfc\x1dR\xaf\xcf3BN\x7f\xcc\xc9AB\xb9C$h\x02"\xe0\xb4\xe4\xa8Y\x02n\x92\x1c\xe7\x00_\xc9\xb1\xd6(\x8a\x04G\xfaz\x8fR\x1eN\xf3m\xac\xe6\xaeI\xf8h\xd43\xd7\x9b\x01\xdf+\x12\x9c\xbe\xd8,\xa1\xfd#RNm\xb7\xd1\xeek;\xe0[!\xa1\x93:\xa1\xdf\x98O\xf2\x12\x10w\x10|\xafH\x08\xf3n\xb8dI@\xa7\xc0\xf7\x8a\x84 \x8f\xf9,\n|7I\x08\x99\xd8/l:4V$\xf8\xa2$!h\x87\x00\xbd\xb3\xda\r\xf0\xedX\x87 \x05\xe80\xf5=\xc4\'\x94G\x1a\xb4B\x80\xb3\xf9c]\x06\xdf,\t\xbb\xc5\xd9\xd2.\xb1Sl\x9b\x0c\x86\xbd\xd2^^\xf7\xd9\xeb\x08=\xac<\xbcn\xa7F$\x9c6}\xd2\xf3\xbc_\x16a\xda\xebK\xa8\x9f\x1ai\xa8\xfd\xb3\x96\x95\xbf1\xb1\x03\xd3\xed\xe4v\x84\xc6$\xf2\xbbG@V\x95(W%\xec\x06\x93\xb7\xb6\xfaEBCu\xad\x01\xf3\xf2N\x834\x02\xfa\n\x02\x9fEBE\xdd\xaf\xc8\xe6\x88\x05\x95\xa4`\x8a\x9b\x15?\xdf\xb4(:Y\x12v\xa9\xf8\xc0N\xea\x9b\xa1ANp\xb9\x15`\x99\xe9\x95\xdc\x16\xd7\x18\xf5\x13*\x97\xca\xfd\xfd\xed\x98\xb9\x99D\x80\x93\xbe\xc0\x00\x0f\xba%\x99e\xf3\xc1\x8e3\xdc\x06\tZ\x8b\xd7L\xbf\x82\x06\xfd\x0cLN\xfdF\x19\xf8WL\x90\xfe\xf0\xfci@B\xd6v\x97\xebg5\xe5y\xa4\xcci\x96\xfeK\xca\xc0\x9f\xc0\x85F\xbc\xae\x06^\xa6\xb7\xa7Ac\x89I\xf6\xa7\x8cp"!r\xdf@\x9d!\xa6\xb0\x8c\x7f\xd7(F6e\x03\t\x15\xdd\xa5\xb4p@\xfd0\xc2\x12\xe0\x1f\xe5\x90\x14\x95\xdc)\x91\xcd\x12\xd9\x99\x9b!\xca\x01p&\xfe#2\xe3\x19\x8a6\xa6\xbem\xf7\x10L\x1cP\x8a\x8d7\xf8T\x81\xde\xa0]\xb7\x0fS\xcc!\xebO\x9d\xb8\xfc\xce\xe4S\xa2n7g\xb9Z\x0f\x84\x05\xe8\x05g\x95v\xc8\x08\x9eVa\xba\xb4\x9c\x16\xc9j\x94\xab@\x12\xcaG*\xd4Ob\xc6\nh\x00\xdc\t\xfc\x0c|o4s\xa9C9\xf1\x88\x7f\r\xb8\x1c\xb8\x81\x89#3Y\xa3Xj2\xc8\xe3\x08r\xfa\x8f\x92X\x81Cf\nhv\xdf\x04\xae)\xc0op\xc4/\x10\xd7\xb7\x9b\xe2?\x02\xac\xd0\xff\x17\xb8\x96\xfa\xd1\xf2\x92QF\xda\xde\x1e\x14\xa2F\xdb\x04Z\xa5\xfe\xdf\x83mL>\xf2\xa25|\x85\xfa.\xf4@\x8a\xaf\x82(\xc8\x17\xe5\xaa%b+\xf0\xa5Z\x1c\xf9\xbe\xff5\xf0\x87U>\xf7\xe0\xdf\xd3\x8b\xba4\n\x9bR\x96\xadA\x13\x16c\x84\xa9\x9b\xb4+ZY\x0b9\xf1^\xab\xcc\x9f\xdd\x9f\x8fI?\x0b\xd0L\x1e\x97v\x8e)\'\xcc\xe7\x8d\xeaX\x9f\xce\x15\xb9.\x00\xfe\xf2\x10p\xb7<\x9f\x9d\xf2\xbe\xd3c\x93\x18\x88\xe4\xc1\x0e\x99\x0e{\x98|TU\x87\xca\x8br\x87c\xb2\xff8\x15g\xd8\xfaF\xef\xd5\xf2\xc4\xd3\xd7P?\xe2r\xaaKS\xe0\xf1\xbc\x91\x9b\x94)2/E\x02\xf2\x1c\xf2J\xad\x10+\x05\xb8S\xf2\x12\xb1\x02\x97\x01\xe7\xd2\xe6\xe1D\x8f\x12\x8c\xe9Q*g\x88\x10J\x8b\x1e\x92\xdc\xcd\x95\xdf\xb4"@K\x03\xcaq\xe9T\xa7\x035\xc7;\xd1N\xcb\x84\xe6ulj\x05\xc7\x08\xf3\xa6HIi\xc0\xd4\xff\r\xfe\xaf\x93\x93\xc8\xddL\x0e\xa5\x9f\x00\xce\xa3\xd8\xff<\xf5\x8c\x80@\x94\xb2\xb3T\x87\xa9\xff\xff\x80\xbc\xe0\xff\x03Y$\xc6\x0c4Z\xf4\xa4\x00\x00\x00\x00IEND\xaeB`\x82',
+    'picture': b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00@\x00\x00\x00@\x08\x06\x00\x00\x00\xaaiq\xde\x00\x00\x06PIDATx\xda\xe5\x9bK\x88\x1cE\x18\xc7\x7f\xf3\xd8\xcdS\xd1\x98\x8d\x01\xc5C4\xba\xba$\x82 \xf8\x00\xc1\xd7)`v\xcdC\xa2"\x8a7\x11\xdc\xac\xaf\x83G/\xbePo"\xb8\x9a\x8d"\x18\x85\xe8U\x13P\x83\x10EAH\x14t\x03j\xd0\x08\xc6U\xa3&\xac3\xd3\xdd\x1e\xf6\xfb\xdcok\xab\xbb\xa7{fzf\xd6\x82fzj\xbak\xea\xff\xaf\xefU_U\x95\xf0\x97\n\x10\xc8\xfdF`\x0c\xb8\x05\xb8\x02X\x0b,\xa37\xcb?\xc0\xaf\xc0\xd7\xc0\x01`?0\xed\xc1\x14[J@Y\xee\x87\x81=\xc0) \xea\xd3\xebO\xc1p\xb9`*\x0b\xc6T\xf0\x13\xc0\x19\xd3PC\xd8\x0b\xfb\x00t(}m\x98\xba3\xc0\xc3I$\x94DD\x00&\xcd\x8bu\x03:\x90\xefui\xbc\x17/\xed_`\xc8\xa8\x1b<\x93f\xa0K\xae\xce[\xf05\x07x\xd0\x87\xe2\x1f8D\xd4\xe4\xfeU\x8b\xb9d\x8c\xc3n\xe0yal@\x1e\n\x8dZ\x1c\x01>\x10\x03\xf3\xb74\xd6K\xa5\x04\xac\x06F\xc4`o\xf2`Pl\x13\xc0\x0b\x96\x84\x8d\xc0\xac\x88Qh\xf4>\x02\xbe\x03v\x18)\xe9\x87R\x01\xb6K\xdf-\x96P\xeeg\x81K\xac\x1a\xbcnt>2\xa2\xf3\x19\xb0\xde0\\-\xf8\x1a\x14\x97\xbb\\>\xf5~0\xe5=\x05\xb6\x1e\xf8\xd4\xc1\xa4\x18\xf7*\xf8\r\xc0ia\'4\xd6\xfe\x07`H\x9e\x19(x\x04\xcbFl\xd3F:\xaeh\x9f\xd7\x01\xc7\x1dl\xa1`\xdeP\x15\xf1^)?V\x8c\xce\x8c\x03\'\xa5\xa1z\xc1\xe2k\x83\xb0\x1b\x81\xcd\xc0\x1a\x11\xddi\xe0\x10\xf0\x89<W\x96>\xbbE\xf5\xfd\x17\xb1o\xef\x18l\x81`\xde\x01p\xd0\xb0\xa3br4\xc3(\xb4\x1b<\x12\xb8\xbc%\x80\xe3\xac\xfc\xe7\xc0\xedF=K)\xd2\xf4\x95\xe3\x1dB\x89\x169\xe1\xf1\x99\xcf\xc8\xcb\xd5.\x80\xdf%\x11\x9c\x8dE\xdc\xcb\xba\xe5\x97\x0cH\x1f\t\x8a\xe1YOlsB\xe3\xe7\xc81\x10\xf7\x16L\x80\x82\xbf#!\x08k8^*\xf0\x18\xb4J\x02\x01\xf79\x18#\xc1\xbe@\xac\xd4]\xec,\x90\x80\xb2q\xc5\xa7=\x01L\x10\x13\xe4X\x10\x11\xf0`\x0c\t\x8aa\xa7\x831\x02\xa2\xa2u<.\x80\x89\x80\xa7\xc40\xa9\xa1\x8aL\xd8zTfv\x1f\xc9\x08Z\xc3W\x95\xfb\'\xc5k\x05I\x13\x1e_\xe9\xa6\x04\xe8\x00\\,\xa1\xaauS!\xf0\x97\xa8\x85\x1d\xa8M\t\xbe}\xdc\xd3\xef\x9e\x96\x00\xfd\xff[\xc5e\x85F"J\xc0\xfd\xe2\r4d\xafHH\xbe\x05\xf8Y\xea\xed;[L\xf8\x9b\xa9\x03\xdd.\x9b\xcd}h\xc4~\x9f\x11q\xb5\r\x83\x92\xf4\x98t\x08P;2h\xeaz\x9e\x00\x9dP\xadq\x08@&]e#\xae.AG<1\xc0Y\xc0\xaa<"\xd8M\x03\x88\x04<n\xdd\xba\x18QVq\x1frHT\x97^\xeb\'\x02\xb4\x1c3@t\xd4\xaf\x01.5b_\x11;\xa1\x86\xefnC\x88\x12\xf5\x93\xb8\xd2R\xb3\xd3\xf5^Q\x81\x0f\x9dLM$\xb3\xbe7dFW3\x81O\x08<-\x04\x85B\x8c\xb6s\xa8\x89I\x927H\xe8VQ\x9f}X\x8c\xde\x883)\xbb\x1a\xf8\x02\x98\x12\x9b\xb0V\xe6\xf9\xd7;\x89\x0e%m*\xab\x17\xe8T\x1c\xa0\xa3\xa9\xae+)\x1b\xab\xa3\xb55&\x1d\x17\xa5D\x82\xb5\x94p\xb8\xb08\xa0l\x92\x11\x91\xe3\xbaB\xe3\xdb\xab\x8e\xea\xe9\x88\xbf\x07\xbc,z\xae\x9d,\x9b,N`>\xdd\x14\xd71\t\x82\xcaYSu\xedP\x81\x92\x99c\xab\xe8\x9d\x07\\\x00\x9c+\xdf\x7f\x17\x035# 0b\x1e\x19]~\x00X\x01\xdc#\xcf4<\xb6A\xeb\xd5(~+\x01\xd0o\t\xb9\x81\x8e\xa9\x80\x1d\xc9\x8b\x80G\xc4\xa0\xcdx\xc4vFb\xf9G\xe5YW\x05\xac?\x7fH\x12\x19i\xf9\xff=b\x17\x92\x0cz\xa2\n\xb4B\x80v\xfc\x1c\x99k\xff\x91\x92\x9a\xb6\xd7)\xe09y\xd7%A\x81\x9c/\x99\x9c\xf7%\xb99#RtX\xfe\xef\xaa&\xbdYG\x08\xd0\xfa\xebD\x04\xed\x1c\xbe\xe1Lh\xec\xd5p\xe6\xe3\xd3b\xd1\xdd\xffr\r\xd92Q\xa7U1Si\x8a$@\x93\x8d\xb7\x99\x94U\xcd\x93\xa8\x08\x1cIpWl\xd4z\xcf\x8a\x07p\x93\xaf>\x83\x99T_\x08\x01\x03\xc6e\xd5=\r\xba\x8d\xd7\x9d\x11\x8f{\xbe\xc1\xdc\nt\\\x06\xba\x94\x92\xf7\xcbM@\x16/\xa0\xd9\xe1\xad\x92a\xadx"\xb1\n\xf0\r\xf0&\xf01\xf0\xa3\xd4_\x08\xdc\x00\xdc\t\\\xe6<\xaf\x01\xcd\xdb\x92\xa5\xdd\xef\xc9Dwt\x15\xaa\x19\t\xd0Q\x195\xe1\xa8\x15g\xbd\x9e\x107\x16WV\xc83\xa1\xd3F`lD\x92$\xd0n\th\x86\x80$\xf0\x81\xc9&os\xfe\xb4b\xb2\xb5\x15G\x9d\xb6%\xb4\xd5n\x12Z"`\xb9\xa3\xf3q\x1d\x1e5\x1d.\xa5\x04M\xcd\x10\xdaN\x12r\x13P\xce\x01>\x8b=)\x8a\x84\\\x04\xdc\xd5\xa4\xa8\x8e\xb6\xd0\xc1\xa2H\xc8E\xc0\xcd\xc0M&\xa8i7\xf8"I\xc8D\x80Z\xe7)IIG\x1d\x04_\x14\t\x99\x08\xf0M8:\t\xbe\x08\x12r\x11\x10\x14\x08\xbe\xd3$\xb4$\x01E\x81\xef$\t\xb9\t(\x1a|\xa7HhI\x05\x8a\x06\xdf\t\x122\x13`w\x89u\x03|\xbbI\xc8\xec\x06\x03\xe6\xb6\x96v\x13|;I\xc8\x15\x08\x8d\xcbK\x83t\xbf\xb4JB.\x02\xc6L\x9a\x9b>\'!\xd7\xba\xc0`\x9e\xf4r\x07\x8b\xe6\xff\xdf\x95\xa4\x89\xae(\xd9\xdd$\x9aT\x19c\xe1v\xdf\xa6\xd3\xda\x14\x95\x81\xe9%\x12\xca\xf4W\xc9CB5\x8d\x80\x9ag\xe4W.!\x12f%#\xb5\xda#\xdd\xb5\xb2,8\xb8?\x8c,\x11I\xd8\xc7\xdcjr\x00\\\xe9\x19\xe8\x19\xe8\xad\xad\xb2\xadx\x87\xa4\xdc\xc5.\xe0Kb\xb6\xca>\xce\xe2\x1c}\xc4\xfc>\xdc\x81>"\xc1\x97\xb1\xf6\x85\xfa\x8a\xf11\x88\xdf.\x7f\x9c\xeem\x97o\x95\x04\x0b>t\x88X\xb0]^\x1b\xd8Ko\x1e\x98\xc8ri\x06{;\xf3Ku>\tXt`"\xed\xc8\xcc\xf7\x12E\xf5\xd3\x91\x99\x1d,^\x9f\xf4\x1e\x99\xc9zh\xea\x00s\xfb\xee{\xf5\xd0\xd4\xd9b\xed\xaf\x95\xcfJ\x8c\xf7\xd8\r\xbch\x7f_\x8a\xc7\xe6\xdc\x91\xd7\xd5\xe8I\x07\xf3\x7f\xeci\xc5+\xfc\x0f\x0fN\xc2\xd2?:;a\xa2\xdf\xa6\xce\x0f\x0f\x03\xaf\xb14\x0eO\x0f\xc7\x81O\xda\xbbgOn\x8d2\x7f|~\x88\xde>>\x7f\x92\xb9M\x95\x07i\xe2\xf8\xfc\xbf\xce\x83\x9f\xce\x00\x96\x87\x91\x00\x00\x00\x00IEND\xaeB`\x82',
+    'circle-xmark': b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00@\x00\x00\x00@\x08\x06\x00\x00\x00\xaaiq\xde\x00\x00\x06wIDATx\xda\xed\x9bM\x8c\x14U\x10\xc7\x7f\xdd3`\x10\x12>\x96\x8fDP\x8c\x01Y\xd0\x931pPL\x8c\x89\x1f7\x0e\x18\x12\x84\x03\x07T\xc0\x9b\xec\x15\x12\xe1 \x8a\x11\x13\xe3\x01\x0f\x98\xc0\x9e@\x83\x07\x15<\x98\xa0WQ\x83\x1201\x02\x02\x07>\x16!\xa0\x0b\xb3\xf3\xe1\x81*\xb7,^\xf7\xcc\xf4\xf4\xcc\xce\xee\xf8\x92\xce\xcev\xbf~\xaf\xfeU\xf5\xea\xd5\xab\xae\x8a\xc8\xafE@\x01(\xbb\xfbK\x81\'\x81\'\x80\xc7\x80\x87\x80\xd9\xc04`\xb2\xf4)\x01\xb7\x80\xab\xc0\x1f\xc0)\xe0{\xb9N\xb9\xf1\x8a@\x05\xa8\xd1%M\x81k+\x00+\x81w\x81\x1f\x80a!6\xcb5,c\xec\x06\x9e\t\xcc\x13\x8d5xK\xd0<`\x008\x11\x00R\x11\xcd\xa8\x00U\xb9|\x1f\xbdo\xfb\xfa>?\xcb\x1c\xf3\x12h\xe8X\x8b\r\xf7\xe7\x00o\x01\x97\x1d\x98\x11\x07X\x81\x8d\x98\xab\x9cp\xcf\xbf7\xe2\x98v\x19\xd8)s\xab\x16\xc6c!\xf5M\xc0EC\xd8\x88\x91\\\xd5\x80\xcb\xba\x04\x94!U\xa3Iv\xbc\x8bBCfmhv\r\x15\x85\xa0~\xe0#\xe0Y\xb9_6kR%W4\xef\xd5\x80\xb3\xc0i\xe07\xe0\xbc\x18\xbcay>E\x0c\xe3\x02`\x11\xb0\x04x\xc4\xd1W\x16)\xc7\x86\x19:\xc77\xc0\x1bb0\x0b\xf2,wC\xa7*\xb6\x1e\xb8a$Tu\x12W\xe9\xfc\r|\x05l\x01\x1e\x07\xeekb\xbe\xc9\xf2\xcef\xe0K\x19K\xc7-\xbb9U#n\x08m~\x89\xe6\x02^\x07\xdb\xe5\x08\t\xfd>\x07l\x13I\x86lG\xb1\xce\x15Z\xcb\x8bd\xcc\xb3\r\xcc\xbf+@w\xcb\xe0\x0b\xc0`\x82\x04*\xc60\r\x00\xd3\x03\x80\x9b\x95H\xe4\xde\xd56\x1d\xd8\n\\2\xcb \xa4\x81\x83fIF\xad\xaa}\x0c|*\x03\x97\xdc\xd6\xa6\xbf?\x01\xe6;[\x11\xe7\xbc\xebX\x9b\xf2\x00\xb0/\x81\x16\xa5\xf13aB\xa6\xe5\x10\x99\t\x07\x03\xe0\x95\xd3C\xc0\x1a\x07\xbc\x9d\xceI\xe4\x18\xb1Fh\xf0\xcb\xa0d4!\x13]E\xb7\xe6Knk\xaa\x89\xc3\xd3\xdf!\xe0i\x8cXb\x9c\xaf\x91\x00\x13\xdeq\x98\x1a\xde\xe7_\tXz\x9d\xe0[`f\xb3\x03\xb7\xa1\xe9\xdc3\x81c\x8eF\xbbC\xacm\xd4O\x88\x8d\xd5\xbd\xe9\x8cL\xd9\x80\x9f:\x96nh\x82\xc0\xa6\nm\x96V5\xd27\x05S\xaa\xc7\x18\x19\xcb\xe9\x07R#\xf3\x0b0\xa3\x8b\xc0{&\xcc\x10\x1a-\xcdVpQ\xda!J\x07y\xcd\xa9RE\xae?\xcd\xde\xdeM\xe0=\xfd\x8b\x85\xd6\x8aa\x82by5\x89~\xdd/g\xc9~^\tppu\x17\xac\xf9Fm\xc2\xea\x80\x06W\x04[_\xc8?P\x8e\xecp\x1c\xd3\x01\xf6\x8f\x03\xf0\x9e\t\xfb\x1d\x06\xc5\xb4\xd3k\x81rc6p\xcd\x1cf\xd4\x80\x0c\x01s\x8dS\xd4\xedM\xe9\x9c+\xb4W\x1c\xa6k\x82\xf5_-P\x8emM\x90\xfe\xd6\x8c\xd2\x8f\xeb\xf8\xf7\xed|_i\x1dH\xd0\x82\xff`R\xa7\xe2\xb4\x91\xbar\xed\xa2\xc4\xee\xb2\xf8\xf2I[l\xa3\xe0[9\xba\xebv7M0x\\\xa7\xbc\xf3\xf6\xb4\xdb:\x94S\xdb2H_\x07]\x01|,\xd7\x8a&\xc6)\xa6\xbc\x1fe\xd0\x82m\x81]\xad\x06<e;\xbfg<\xa7\xaa\tH.lRz\xba\xc7.\x07\xee8\xb7t\x95\xf4\x99\x94\xf2\xbe>[\xe5\xdc\xef;2f3\xa1/\xed\xb7\xd0\x04f-\xc6\xdd\xb6\xe3O.xY\x03\x8edP]\xe5\xfa>\xc3\xc4\x92\x998\x8d\t\x16\xbc\x12Y2\xc4\xef\xcb\xa0\x8dJ\xfbQc\x0bT\x03~\x04\xe2X\x1c\x87~\xa3b\x1ao\xff<\x87`cA\x80\xd5\xe4\xf7!\x03p\x92\x03\xaf\x0c:(}kr\xbf\xd0\xe2\x8e\x10\x01\x87MhN\xf1,\x15\xec\xacw\xc1\x055\x18\xcb2h\x80\x12\xbb\xdcH\xb1\xe2\xc6\xf7\x9a\x10\x92|\xe8\x9d\xe5-\x18\xd3e\xee\\\xa3\xe3\xaf\x03\xd8\x13P\x8f\xdf\raQ\x06\xae7\x02h\x95y\'\xado\xd9\xf4mV\x1b#\x13c<\x13X\xe6\xef\x03|\x1dx\xf0E\xc6\t\xbd-\xa8\x07\xec\x05\xe0\xf9\x06\xc1\x17[X\x06Hp\xd5\x0b\xfa(\xc0\xaf\x81\xf3\xf3\x9e\x1c\\\xdf4\xd5\xb6\xf1\x05\xbf=\x85\xc0O\xca\xc15\xfe \x10\xdf8\x1d\x8b[\xe8\xdb\x85\x1c\\R5t\x87\x81\x97\x05\x98\x1aY\xfd\xab\x9e\x9e\x1a\'}V\x95\x03\xcdac [m\xe7\x03\xf7f\x03\xdc\x0e\x84\xbb6\xe4x\xf8\xb1\x9aPu\x1aPM\xb8\x97\x87\xe4\xbd\x06l\x08\x84\xcdn\xc7\x8c~\xa2\xb6Fc8\xc7\xc3\x89\xd5\x84\x17\xb9\xfb\x19\xbcf\xa4\x1d\x99\xffo\x01/\xe5,y\x1c&k\xd4\'\x8f\x87\xd3]\xdb\x8f\x8e%\xf3\xbf:ASr\x9c\xc3:9G\xe4\x80\xe2%\xaf\xffO\xe3\xee\xe7\xb4\x90\xb3\xd4j\xbb\xdfa\x04(\xc5\xc0_\x81\x07}m\x00\x7f\xd0\xcc\x13\x05\x96\x80\xf5B\x0f\xb5\x81\t\xb3\x02\x82\xbe\x15\x03W\x02\x9d\x17\xb4\x01|!\x00^\xf3\x03\xd4\xf2GfG\xc8\x9b\t\x0f\x06\xee]\xfd\xdf\x11Jp\x85\xcf\x98\xdda\xc2\xbb\xc2\xeb\xc6\xd9a\xa8\x90A\x18\xa9\x87\xa1%\xc6\x19\xb2\xee\xf0&\xee\xfd\x18\xd9l<\xa0\xd4\xa0{\x9b\xc6\x84R\x0b\xf1\x00\r{m\x0e\xb8\xc1\xb7\x81G{> \xa2\x1dw\x0784QBb\x0f\x07Bb5\x1b\x12C\x02\x84\xed\n\x8a\xeem1(\xba\xb7\xc5\xa0\xe8\xf6zA\xd1\x9e\x0f\x8b\xf7\xe2\x87\x917m?uG\xfb\xe8\x8dOcC\x04>\x90\xf6\xf4\xc7Q\xab\x05\xb3\xb8\x9b\x826Q?\x8f_\x12\x8c\xc1\xf49\xe5\xc8F\x92\x13$\x16g\xf0\xc6:\xd5\x1aI\x90\xd8\x98F\xbfM\x1f9F8E\xe6$\xdd\x9f"s\x92p\x8a\xcc1\xea\xa4\xc8`\xb6\xbb\xb4$\xa9\xef\x18?IR\xaa\x05\r%I\xf9\x01\xd7\xd2\x83ir~\xe0\x9eL\x94\xf4\x13\xa4\xa5\xca^c\x82\xa6\xcaZw\xb2\x1b\x93\xa5\xe7\xcb\x9c\xf5\x92\xa5cZ\xac\x1d\x88\x0c#\x0e\xd0X\xba\xfc\x8c\x00\xe1y\xa6\xcb\x0f0Z\x9f\x94\x94.\x7f\x80\x1c\xd2\xe5=\x13\x00\xde\xa6\xb1\x82\x89\xed\xb4\xa7`\xe2\x1c\x1d.\x98\xf0\x12\xd1\x10\xdau\xea\x97\xcc\x0c\xd3\xd9\x92\x99\xeb\x1a\xe2jF\xe3\x9a\xe5\x90\x16$\xf5\x03\x1f\x02\xcf\xc9\xfdn(\x9a\xda"\xe3\xb7\xa5h*\xe4\'\x00\xbc\xce\xd8\x96\xcd]\x10\x1a\xe8\xb4O\xe2\x0b\'w0Z\xc7\xd3\x89\xc2\xc9K\x8ca\xe1d\x926\xcc\x93\xe0I;KgO\xd0%\xa5\xb3\xa1C\x94%H\x8b\xa7\x8f;\x03\x96\xa5x\xfa\xb8\x8c\xb5\x926\x14OGm`\x84/\x9f\xef\xe7\xde\xf2\xf99\x84\xcb\xe7\xaf0Z>\x7f\x9c\x0e\x94\xcf\xff\x03\xcb\x9ee\x16\xa9\x85XI\x00\x00\x00\x00IEND\xaeB`\x82',
+}
+
+
+@lru_cache(maxsize=None)
+def icon(name):
+    """Liefert das Icon ``name`` (z.B. "folder") als QIcon."""
+    pixmap = QPixmap()
+    pixmap.loadFromData(ICON_DATA[name], "PNG")
+    return QIcon(pixmap)
@@ -0,0 +1,232 @@
+'''
+Mehrere Bilder mischen: Streifen aus N Quellen in einem Durchlauf verschachteln.
+
+Alle Quellen werden auf eine gemeinsame Grösse gebracht, jede mit genau einem
+``resize`` (inklusive mittigem Zuschnitt auf das gemeinsame
+Seitenverhältnis). Die Grösse quer zur Schneidachse ist die kleinste der
+Quellen, entlang der Schneidachse die kleinste nach dem Skalieren.
+JPEG-Dateien werden per ``draft`` bereits verkleinert dekodiert.
+
+Das Layout ist ein normales ``StripLayout`` mit ``sources``: Aufteilung und
+Reihenfolge der Streifen wie bei einem einzelnen Bild, zusätzlich pro
+Streifen die Quelle. Die Quelle wird gemäss ``pattern`` gewählt:
+
+- ``alternate``: reihum in Ausgabereihenfolge (A, B, C, A, B, C, …),
+- ``random``: gleichverteilt zufällig,
+- ``weighted``: zufällig mit den Gewichten ``weights``.
+
+Die Ausgabe wird einmal angelegt (leere Streifen gleich als Füllfarbe). Die
+Quellen werden nacheinander geladen, ihre Streifen in die Ausgabe kopiert und
+danach wieder freigegeben; es liegt also höchstens eine Quelle gleichzeitig
+im Speicher. Mit ``stitch_mode = "numpy"`` werden alle Streifen einer Quelle
+mit einer einzigen Indexoperation kopiert, sonst per crop/paste.
+
+Haben alle Quellen denselben Modus, bleibt er erhalten; sonst wird der
+kleinste gemeinsame Modus verwendet (siehe ``common_mode``).
+'''
+import os
+import random
+from dataclasses import replace
+
+from PIL import Image
+
+from encoder import EncoderSettings, convert_mode, encode
+from slice_engine import (VERTICAL, StripLayout, fill_color, fit_layout, layout_path, load_numpy, numpy_enabled,
+                          output_path, pixel_array, to_working_mode, working_mode)
+from timing import annotate, stage
+
+PATTERNS = ("alternate", "random", "weighted")
+
+
+def common_size(sizes, direction):
+    """Gemeinsame Grösse (Breite, Höhe) für Quellen der Grössen ``sizes``."""
+    if direction == VERTICAL:
+        height = min(h for _, h in sizes)
+        return min(round(w * height / h) for w, h in sizes), height
+    width = min(w for w, _ in sizes)
+    return width, min(round(h * width / w) for w, h in sizes)
+
+
+def common_mode(modes):
+    """Gemeinsamer Modus für Quellen mit den Verarbeitungsmodi ``modes`` (siehe ``working_mode``)."""
+    modes = set(modes)
+    if len(modes) == 1:
+        return modes.pop()
+    alpha = bool(modes & {"LA", "RGBA"})
+    if modes <= {"L", "LA", "I;16"}:
+        return "LA" if alpha else "L"
+    return "RGBA" if alpha else "RGB"
+
+
+def _center_box(size, target):
+    """Grösster mittiger Ausschnitt von ``size`` mit dem Seitenverhältnis von ``target``."""
+    width, height = size
+    scale = min(width / target[0], height / target[1])
+    box_w, box_h = min(target[0] * scale, width), min(target[1] * scale, height)
+    # Rundungsfehler (z.B. -5.7e-14) darf Pillow nicht als negativen Versatz sehen
+    left, top = max(0.0, (width - box_w) / 2), max(0.0, (height - box_h) / 2)
+    return left, top, min(left + box_w, width), min(top + box_h, height)
+
+
+def load_normalized(path, size, mode, grayscale=False):
+    """Lädt ``path`` im Modus ``mode`` und bringt es mit einem einzigen ``resize`` auf ``size``."""
+    with Image.open(path) as img:
+        with stage("decode"):
+            # JPEG: per DCT-Skalierung möglichst klein, aber nicht kleiner als das Ziel dekodieren
+            img.draft("L" if grayscale else None, size)
+            img.load()
+        img = to_working_mode(img, grayscale)
+        if img.mode != mode:
+            with stage("convert"):
+                img = convert_mode(img, mode)
+        if img.size == size:
+            return img
+        with stage("resize"):
+            return img.resize(size, box=_center_box(img.size, size))
+
+
+def assign_sources(count, source_count, pattern="alternate", weights=None, rng=None):
+    """Wählt für ``count`` Ausgabepositionen je eine Quelle (Index) gemäss ``pattern``."""
+    if rng is None:
+        rng = random.Random()
+    if pattern == "alternate":
+        return [i % source_count for i in range(count)]
+    if pattern == "random":
+        return [rng.randrange(source_count) for _ in range(count)]
+    if pattern == "weighted":
+        return rng.choices(range(source_count), weights=weights, k=count)
+    raise ValueError(f"Unbekanntes Muster: {pattern}")
+
+
+def validate_pattern(source_count, pattern, weights=None):
+    """Prüft Quellenanzahl, Muster und Gewichte und wirft ValueError mit einer lesbaren Meldung."""
+    if source_count < 1:
+        raise ValueError("Es wird mindestens ein Bild benötigt!")
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unbekanntes Muster: {pattern}")
+    if pattern == "weighted":
+        if not weights or len(weights) != source_count:
+            raise ValueError("Für das Muster weighted wird pro Bild ein Gewicht benötigt!")
+        if any(w < 0 for w in weights) or not sum(weights):
+            raise ValueError("Die Gewichte dürfen nicht negativ und nicht alle 0 sein!")
+
+
+def generate_layout(size, source_count, params, pattern="alternate", weights=None, rng=None):
+    """Berechnet ein Layout mit Quellenzuordnung für die gemeinsame Grösse ``size``."""
+    params.validate()
+    validate_pattern(source_count, pattern, weights)
+    if rng is None:
+        rng = random.Random(params.seed)
+    layout = StripLayout.generate(size, params, rng)
+    # Reihenfolge der Quellen entlang der Ausgabe, dann auf die Streifen übertragen
+    by_position = assign_sources(len(layout.order), source_count, pattern, weights, rng)
+    sources = [0] * len(layout.strips)
+    for position, index in enumerate(layout.order):
+        sources[index] = by_position[position]
+    layout.sources = sources
+    return layout
+
+
+def source_segments(layout):
+    """Liefert pro Quelle die Liste (quell_offset, grösse, ausgabe_offset) ihrer Streifen."""
+    per_source = {}
+    offset = 0
+    for i, index in enumerate(layout.order):
+        src, dim = layout.strips[index]
+        source = layout.sources[index] if layout.sources else 0
+        per_source.setdefault(source, []).append((src, dim, offset))
+        offset += dim
+        if layout.blank_width and i < len(layout.order) - 1:
+            offset += layout.blank_width
+    return per_source
+
+
+def interleave_files(paths, params, pattern="alternate", weights=None, layout=None, rng=None):
+    """Mischt die Streifen der Bilder ``paths`` zu einem Bild.
+
+    Mit ``layout`` (inklusive ``sources``) wird ein gespeichertes Layout
+    angewendet, sonst eines gemäss ``pattern`` erzeugt. Gibt (bild, layout)
+    zurück; das Layout ist auf die gemeinsame Grösse angepasst.
+    """
+    params.validate()
+    sizes = []
+    modes = []
+    for path in paths:
+        with Image.open(path) as img:  # liest nur den Dateikopf
+            sizes.append(img.size)
+            modes.append(working_mode(img, params.grayscale))
+    mode = common_mode(modes)
+    if layout is None:
+        size = common_size(sizes, params.direction)
+        layout = generate_layout(size, len(paths), params, pattern, weights, rng)
+    else:
+        if layout.sources and max(layout.sources) >= len(paths):
+            raise ValueError(f"Das Layout benötigt {max(layout.sources) + 1} Bilder, angegeben sind {len(paths)}.")
+        size = common_size(sizes, layout.direction)
+        layout = fit_layout(layout, size)
+    params = replace(params, direction=layout.direction)
+    vertical = layout.direction == VERTICAL
+
+    per_source = source_segments(layout)
+    segments = layout.segments()
+    cut_length = sum(dim for _, dim in segments)
+    out_size = (cut_length, size[1]) if vertical else (size[0], cut_length)
+    fill = fill_color(params.strip_color, mode)
+    annotate(sources=len(paths), width=out_size[0], height=out_size[1],
+             strips=sum(1 for src, _ in segments if src is not None),
+             blanks=sum(1 for src, _ in segments if src is None))
+
+    use_numpy = numpy_enabled(params)
+    with stage("paste"):
+        if use_numpy:
+            np = load_numpy()
+            blank_pixel, rawmode = pixel_array(Image.new(mode, (1, 1), fill))
+            out = np.empty((out_size[1], out_size[0]), dtype=blank_pixel.dtype)
+            if layout.blank_width:
+                out[...] = blank_pixel[0, 0]
+        else:
+            new_img = Image.new(mode, out_size, fill if layout.blank_width else 0)
+
+    # Quellen nacheinander laden, damit immer nur eine im Speicher liegt
+    for source, strips in sorted(per_source.items()):
+        img = load_normalized(paths[source], size, mode, params.grayscale)
+        if use_numpy:
+            with stage("gather"):
+                src = pixel_array(img)[0]
+                index = np.concatenate([np.arange(offset, offset + dim) for offset, dim, _ in strips])
+                target = np.concatenate([np.arange(dest, dest + dim) for _, dim, dest in strips])
+                if vertical:
+                    out[:, target] = src[:, index]
+                else:
+                    out[target] = src[index]
+        else:
+            for offset, dim, dest in strips:
+                if not dim:
+                    continue
+                with stage("crop"):
+                    if vertical:
+                        strip = img.crop((offset, 0, offset + dim, size[1]))
+                    else:
+                        strip = img.crop((0, offset, size[0], offset + dim))
+                with stage("paste"):
+                    new_img.paste(strip, (dest, 0) if vertical else (0, dest))
+        del img
+
+    if use_numpy:
+        new_img = Image.frombytes(mode, out_size, out, "raw", rawmode)
+    return new_img, layout
+
+
+def process_files(paths, output_folder, params, pattern="alternate", weights=None, layout=None, save_layout=False,
+                  encoder=None):
+    """Mischt ``paths`` und speichert das Ergebnis im Ausgabeordner; gibt den Pfad der Datei zurück."""
+    if not os.path.isdir(output_folder):
+        raise FileNotFoundError("Der Ausgabeordner existiert nicht!")
+    encoder = encoder or EncoderSettings()
+    new_img, layout = interleave_files(paths, params, pattern, weights, layout)
+    output_filename = output_path(output_folder, encoder.extension)
+    encode(new_img, output_filename, encoder)
+    if save_layout:
+        with stage("layout_save"):
+            layout.save(layout_path(output_filename))
+    return output_filename
@@ -0,0 +1,202 @@
+'''
+Cache für fertige Ausgabedateien.
+
+Wird dasselbe Bild mit denselben Einstellungen und demselben Seed (bzw.
+Layout) erneut generiert, liefert der Cache die bereits geschriebene Datei
+im output_folder zurück, statt eine neue Kopie mit neuem Namen zu erzeugen.
+
+Der Schlüssel besteht aus dem SHA-256 des Eingabeinhalts, dem absoluten
+Ausgabeordner und den kanonisierten Parametern (``SliceParams`` ohne
+Thread-Anzahl, ``EncoderSettings``, Layout). Der Inhalts-Hash wird pro Pfad,
+Änderungszeit und Grösse im Index gespeichert, auch über Läufe und
+Worker-Prozesse hinweg; eine Wiederholung kostet daher nur ein ``stat`` und
+zwei Abfragen im Index. Ohne Seed und Layout ist
+das Ergebnis zufällig und wird nicht gecacht.
+
+Die Einträge liegen in einer SQLite-Datenbank im Cache-Ordner, die sich
+mehrere Prozesse teilen können. Die Grössengrenze bezieht sich auf die
+Ausgabedateien, auf die die Einträge verweisen; bei Überschreitung werden
+die am längsten nicht benutzten Einträge (LRU) vergessen. Die
+Ausgabedateien selbst werden nie gelöscht.
+'''
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+
+DEFAULT_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "image-slice-stitch-output-cache")
+DEFAULT_MAX_MB = 1024
+INDEX_FILE = "outputs.sqlite"
+OUTPUT_VERSION = 2  # erhöhen, wenn dieselben Einstellungen eine andere Ausgabe ergeben (2: eigener Bildmodus)
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 des Dateiinhalts."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_digest(params, encoder, layout=None, **extra):
+    """Hash aller Einstellungen, die das Ergebnis beeinflussen."""
+    settings = {
+        "params": asdict(params),
+        "encoder": asdict(encoder),
+        "layout": layout.to_dict() if layout else None,
+        **extra,
+    }
+    settings["params"].pop("workers", None)  # beeinflusst nur die Geschwindigkeit
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=list).encode("utf-8")).hexdigest()
+
+
+class OutputCache:
+    """Inhaltsadressierter Cache der geschriebenen Ausgabedateien mit LRU-Grenze."""
+
+    def __init__(self, cache_folder=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_folder = cache_folder or DEFAULT_CACHE_FOLDER
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}  # (Pfad, mtime, Grösse) -> Inhalts-Hash
+        self._lock = threading.Lock()
+        self._db = None
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt den Cache aus ``output_cache_folder`` und ``output_cache_max_mb``; None, wenn abgeschaltet."""
+        if not config.get("output_cache", True):
+            return None
+        max_mb = config.get("output_cache_max_mb", DEFAULT_MAX_MB)
+        return cls(config.get("output_cache_folder") or None, int(max_mb) * 1024 * 1024)
+
+    def __getstate__(self):
+        # Für Worker-Prozesse: Verbindung und Hash-Speicher gehören zum jeweiligen Prozess
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_db"] = None
+        state["_hashes"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._db is None:
+            # Eine Verbindung pro Prozess; Zugriffe werden über self._lock serialisiert
+            self._db = sqlite3.connect(os.path.join(self.cache_folder, INDEX_FILE), timeout=30,
+                                       check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " output TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " path TEXT PRIMARY KEY,"
+                " mtime_ns INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " digest TEXT NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def content_hash(self, path):
+        """SHA-256 von ``path``; nur neu berechnet, wenn sich Änderungszeit oder Grösse geändert haben."""
+        st = os.stat(path)
+        ident = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._hashes.get(ident)
+            if digest is None:
+                row = self._connect().execute("SELECT digest FROM hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                                              ident).fetchone()
+                if row:
+                    digest = self._hashes[ident] = row[0]
+        if digest is None:
+            digest = file_hash(path)
+            with self._lock:
+                self._hashes[ident] = digest
+                db = self._connect()
+                db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)", (*ident, digest))
+                db.commit()
+        return digest
+
+    def key(self, input_path, output_folder, params, encoder, layout=None):
+        """Liefert den Cache-Schlüssel oder None, wenn das Ergebnis nicht reproduzierbar ist.
+
+        Der Ausgabeordner gehört zum Schlüssel, damit ein Treffer immer im
+        gewünschten Ordner liegt.
+        """
+        if params.seed is None and layout is None:
+            return None
+        content = self.content_hash(input_path)
+        folder = os.path.abspath(output_folder)
+        ident = f"{content}|{folder}|{settings_digest(params, encoder, layout)}|{OUTPUT_VERSION}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """Liefert den Pfad der vorhandenen Ausgabe oder None.
+
+        Einträge, deren Ausgabedatei gelöscht oder verändert wurde, werden verworfen.
+        """
+        with self._lock:
+            db = self._connect()
+            row = db.execute("SELECT output, size, mtime_ns FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                output, size, mtime_ns = row
+                try:
+                    st = os.stat(output)
+                    valid = (st.st_size, st.st_mtime_ns) == (size, mtime_ns)
+                except OSError:
+                    valid = False
+                if valid:
+                    db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+                    self.hits += 1
+                    return output
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                db.commit()
+            self.misses += 1
+            return None
+
+    def store(self, key, output_filename):
+        """Merkt sich ``output_filename`` als Ergebnis für ``key`` und hält die Grössengrenze ein."""
+        st = os.stat(output_filename)
+        with self._lock:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                       (key, os.path.abspath(output_filename), st.st_size, st.st_mtime_ns, time.time()))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in db.execute(
+                        "SELECT key, size FROM entries WHERE key != ? ORDER BY last_access", (key,)).fetchall():
+                    db.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            db.commit()
+
+    def stats(self):
+        """Liefert Treffer-/Fehlgriff-Statistik und aktuelle Belegung."""
+        with self._lock:
+            count, total = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,152 @@
+'''
+Cache für dekodierte Quellbilder.
+
+Wird dasselbe Bild mehrmals generiert (z.B. mit anderen Seeds), muss es nicht
+jedes Mal neu dekodiert werden. Das dekodierte (und bei Bedarf nach Graustufen
+konvertierte) Raster wird einmal als Rohdatei im Cache-Ordner abgelegt und
+danach per mmap geöffnet. Der Schlüssel besteht aus Pfad, Änderungszeit und
+Grösse der Quelldatei sowie der Graustufen-Einstellung.
+
+Der Cache hat eine Grössengrenze; ältere Einträge werden nach LRU entfernt
+(die Änderungszeit der Rohdatei dient als letzter Zugriff).
+'''
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+
+from PIL import Image
+
+from slice_engine import load_image
+from streaming import RasterFile, image_bands
+from timing import annotate, stage
+
+DEFAULT_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "image-slice-stitch-cache")
+DEFAULT_MAX_MB = 2048
+RASTER_VERSION = 2  # erhöhen, wenn sich das gespeicherte Raster für dieselbe Quelle ändert (2: eigener Bildmodus)
+
+
+class RasterCache:
+    """Festplatten-Cache für dekodierte Raster mit LRU-Verdrängung."""
+
+    def __init__(self, cache_folder=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_folder = cache_folder or DEFAULT_CACHE_FOLDER
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt den Cache aus den Einstellungen ``cache_folder`` und ``cache_max_mb``."""
+        max_mb = config.get("cache_max_mb", DEFAULT_MAX_MB)
+        return cls(config.get("cache_folder") or None, int(max_mb) * 1024 * 1024)
+
+    def _key(self, path, params):
+        st = os.stat(path)
+        ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{int(params.grayscale)}|{RASTER_VERSION}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_folder, key)
+        return base + ".raw", base + ".json"
+
+    def load(self, path, params):
+        """Liefert das dekodierte Bild aus dem Cache oder dekodiert und speichert es."""
+        raw_path, meta_path = self._paths(self._key(path, params))
+        with stage("cache_open"):
+            img = self._open(raw_path, meta_path)
+        annotate(cache_hit=img is not None)
+        if img is not None:
+            self.hits += 1
+            os.utime(raw_path)  # LRU: letzter Zugriff
+            annotate(width=img.width, height=img.height, mode=img.mode)
+            return img
+
+        self.misses += 1
+        img = load_image(path, params)
+        try:
+            with stage("cache_store"):
+                self._store(img, raw_path, meta_path)
+                self._evict(keep=raw_path)
+        except OSError as e:
+            logging.error(f"Fehler beim Schreiben in den Raster-Cache: {e}")
+        return img
+
+    def _open(self, raw_path, meta_path):
+        try:
+            with open(meta_path, "r") as f:
+                info = json.load(f)
+            with open(raw_path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        size = (info["width"], info["height"])
+        # Für "L" wird das mmap direkt verwendet, die übrigen Modi werden ohne Dekodierung entpackt
+        return Image.frombuffer(info["mode"], size, data, "raw", info["mode"], 0, 1)
+
+    def _store(self, img, raw_path, meta_path):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                raster = RasterFile.spill(img.size, image_bands(img), f)
+            os.replace(tmp_path, raw_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        # Die Metadaten zuletzt schreiben: erst dann gilt der Eintrag als vollständig
+        with open(meta_path, "w") as f:
+            json.dump({"mode": raster.mode, "width": raster.width, "height": raster.height}, f)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_folder):
+            if name.endswith(".raw"):
+                try:
+                    st = os.stat(os.path.join(self.cache_folder, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, os.path.join(self.cache_folder, name)))
+        return entries
+
+    def _evict(self, keep=None):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, raw_path in entries:
+            if total <= self.max_bytes:
+                break
+            if raw_path == keep:
+                continue
+            try:
+                os.remove(raw_path[:-4] + ".json")
+                os.remove(raw_path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Entfernt alle Einträge aus dem Cache."""
+        for _, _, raw_path in self._entries():
+            for p in (raw_path, raw_path[:-4] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Liefert Treffer-/Fehlgriff-Statistik und aktuelle Belegung."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,613 @@
+'''
+Kern von Image Slice & Stitch: Bild zerschneiden, Streifen mischen und neu zusammensetzen.
+
+Das Modul importiert kein PyQt6 und kann daher ohne QApplication bzw. Display
+verwendet werden (Batch-Betrieb, Skripte). Die GUI ruft nur noch diese
+Funktionen auf.
+'''
+import json
+import os
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from encoder import EncoderSettings, convert_mode, encode
+from timing import annotate, stage
+
+np = None  # NumPy ist optional und wird erst für stitch_mode = "numpy" geladen (siehe load_numpy)
+
+VERTICAL = "vertical"
+HORIZONTAL = "horizontal"
+STITCH_MODES = ("paste", "numpy")
+
+# Paralleles Zusammensetzen erst ab dieser Ausgabegrösse, darunter überwiegt der Thread-Overhead
+PARALLEL_MIN_PIXELS = 4_000_000
+PARALLEL_MIN_BAND_ROWS = 64
+
+# Bildmodi, die unverändert durch die Pipeline laufen; andere werden beim Laden einmal umgewandelt
+NATIVE_MODES = ("L", "LA", "RGB", "RGBA", "CMYK", "I;16")
+_GRAY_MODES = {"L": "L", "LA": "LA", "I;16": "I;16", "RGB": "L", "RGBA": "LA", "CMYK": "L"}
+# Modus -> (Rohmodus, NumPy-Typ) für das Gather: ein Pixel als ein Element, RGB als RGBX
+_PIXEL_TYPES = {"L": ("L", "uint8"), "LA": ("LA", "uint16"), "I;16": ("I;16", "uint16"),
+                "RGB": ("RGBX", "uint32"), "RGBA": ("RGBA", "uint32"), "CMYK": ("CMYK", "uint32")}
+
+# Pillow lehnt Bilder über ~179 MP standardmässig als mögliche Dekompressionsbombe ab. Sehr grosse lokale
+# Bilder sind hier der Normalfall (--stream, --tiled), daher gilt standardmässig kein Limit;
+# max_image_pixels in config.toml setzt eines (siehe set_pixel_limit).
+DEFAULT_MAX_IMAGE_PIXELS = 0
+
+# Unterstützte Dateiformate (Muster für Dateidialoge)
+SUPPORTED_IMAGE_FORMATS = "*.png *.jpg *.jpeg *.bmp *.gif"
+SUPPORTED_IMAGE_EXTENSIONS = tuple(p[1:] for p in SUPPORTED_IMAGE_FORMATS.split())
+
+
+def set_pixel_limit(pixels):
+    """Setzt die grösste Pixelzahl, die Pillow öffnet (``Image.MAX_IMAGE_PIXELS``); 0 = kein Limit.
+
+    Gilt für den ganzen Prozess; Worker-Prozesse setzen es selbst (siehe ``BatchJob``).
+    """
+    Image.MAX_IMAGE_PIXELS = int(pixels) or None
+
+
+set_pixel_limit(DEFAULT_MAX_IMAGE_PIXELS)
+
+
+@dataclass
+class SliceParams:
+    """Alle Parameter für einen Schneide-/Zusammensetz-Durchlauf."""
+    direction: str = VERTICAL
+    strip_count: int = 6
+    random_strips: bool = False
+    min_strip_size: int = 20
+    max_strip_size: int = 100
+    insert_blank: bool = False
+    blank_width: int = 100
+    strip_color: Tuple[int, int, int] = (255, 255, 255)
+    grayscale: bool = False
+    seed: Optional[int] = None
+    stitch_mode: str = "paste"  # "paste" (crop/paste) oder "numpy" (Gather)
+    workers: int = 1  # Threads für das Zusammensetzen, 0 = alle Kerne
+
+    @classmethod
+    def from_config(cls, config, seed=None):
+        """Erstellt die Parameter aus einem Konfigurations-Dictionary (config.toml)."""
+        defaults = cls()
+        return cls(
+            direction=config.get("direction", defaults.direction),
+            strip_count=int(config.get("strip_count", defaults.strip_count)),
+            random_strips=bool(config.get("random_strips", defaults.random_strips)),
+            min_strip_size=int(config.get("min_strip_size", defaults.min_strip_size)),
+            max_strip_size=int(config.get("max_strip_size", defaults.max_strip_size)),
+            insert_blank=bool(config.get("insert_blank", defaults.insert_blank)),
+            blank_width=int(config.get("blank_width", defaults.blank_width)),
+            strip_color=tuple(config.get("strip_color", defaults.strip_color)),
+            grayscale=bool(config.get("grayscale", defaults.grayscale)),
+            seed=seed,
+            stitch_mode=config.get("stitch_mode", defaults.stitch_mode),
+            workers=int(config.get("stitch_workers", defaults.workers)),
+        )
+
+    def validate(self):
+        """Prüft die Parameter und wirft ValueError mit einer lesbaren Meldung."""
+        if self.direction not in (VERTICAL, HORIZONTAL):
+            raise ValueError(f"Unbekannte Schneidrichtung: {self.direction}")
+        if self.min_strip_size >= self.max_strip_size:  # Min und Max prüfen
+            raise ValueError("Max muss größer als Min sein!")
+        if self.stitch_mode not in STITCH_MODES:
+            raise ValueError(f"Unbekannter stitch_mode: {self.stitch_mode}")
+        if self.strip_count < 1:
+            raise ValueError("Die Anzahl Streifen muss mindestens 1 sein!")
+        if self.workers < 0:
+            raise ValueError("Die Anzahl Threads darf nicht negativ sein!")
+
+
+def compute_strips(length, params, rng):
+    """Berechnet die Streifen entlang der Schneidachse als Liste von (offset, grösse)."""
+    strips = []
+    offset = 0
+    if params.random_strips:
+        while offset < length:
+            dim = rng.randint(params.min_strip_size, params.max_strip_size)
+
+            if length < (offset + dim):   # letzen Streifen dim anpassen
+                dim = length - offset
+                if dim < params.min_strip_size:  # Wenn der letzte Streifen kleiner als min Size ist ignorieren
+                    break
+
+            strips.append((offset, dim))
+            offset += dim
+    else:
+        strip_dim = length // params.strip_count
+        for i in range(params.strip_count):
+            strips.append((offset, strip_dim))
+            offset += strip_dim
+    return strips
+
+
+def working_mode(img, grayscale=False):
+    """Modus, in dem ``img`` verarbeitet wird: der eigene, sofern er in ``NATIVE_MODES`` liegt.
+
+    Palettenbilder werden zu RGB bzw. RGBA (mit Transparenz), 1-Bit-Bilder zu
+    L; mit ``grayscale`` wird ein Alphakanal bzw. 16 Bit beibehalten.
+    """
+    mode = img.mode
+    if mode not in NATIVE_MODES:
+        if mode == "1":
+            mode = "L"
+        elif mode.startswith("I;16") or mode in ("I", "F"):
+            mode = "I;16"
+        else:
+            # Wie Image.has_transparency_data (erst ab Pillow 10.1): Alphakanal oder Transparenz-Eintrag
+            alpha = img.mode in ("PA", "La", "RGBa") or "transparency" in img.info
+            mode = "RGBA" if alpha else "RGB"
+    return _GRAY_MODES[mode] if grayscale else mode
+
+
+def to_working_mode(img, grayscale=False):
+    """Wandelt ``img`` höchstens einmal in den Verarbeitungsmodus um (siehe ``working_mode``)."""
+    mode = working_mode(img, grayscale)
+    if img.mode == mode:
+        return img
+    with stage("grayscale" if grayscale else "convert"):
+        return convert_mode(img, mode)
+
+
+def fill_color(color, mode):
+    """Rechnet die RGB-Farbe der leeren Streifen einmal in einen Pixelwert für ``mode`` um."""
+    if mode == "I;16":
+        return Image.new("RGB", (1, 1), tuple(color[:3])).convert("L").getpixel((0, 0)) * 257
+    return Image.new("RGB", (1, 1), tuple(color[:3])).convert(mode).getpixel((0, 0))
+
+
+def load_image(path, params):
+    """Öffnet und dekodiert das Bild im eigenen Modus, bei Bedarf nach Graustufen konvertiert.
+
+    JPEG-Dateien werden für Graustufen per ``draft`` gleich als Luminanz
+    dekodiert, ohne Umweg über ein volles RGB-Bild.
+    """
+    with Image.open(path) as img:
+        with stage("decode"):
+            if params.grayscale:
+                img.draft("L", img.size)
+            img.load()
+        annotate(width=img.width, height=img.height, mode=img.mode)
+        return to_working_mode(img, params.grayscale)
+
+
+@dataclass
+class StripLayout:
+    """Aufteilung und Reihenfolge der Streifen, unabhängig vom Zufallsgenerator.
+
+    ``strips`` sind die Streifen (offset, grösse) in Quellreihenfolge,
+    ``order`` die Indizes in ``strips`` in Ausgabereihenfolge. ``length`` ist
+    die Länge der Schneidachse, für die das Layout berechnet wurde; bei einer
+    anderen Auflösung wird es proportional skaliert. ``blank_width`` 0 heisst
+    ohne leere Streifen. ``sources`` gibt beim Mischen mehrerer Bilder (siehe
+    ``interleave``) pro Streifen den Index der Quelle an; leer heisst, alle
+    Streifen stammen aus demselben Bild.
+    """
+    direction: str
+    length: int
+    strips: List[Tuple[int, int]]
+    order: List[int]
+    blank_width: int = 0
+    sources: List[int] = field(default_factory=list)
+
+    @classmethod
+    def generate(cls, size, params, rng=None):
+        """Berechnet ein Layout für ein Bild der Grösse ``size`` (Breite, Höhe)."""
+        params.validate()
+        if rng is None:
+            rng = random.Random(params.seed)
+        length = size[0] if params.direction == VERTICAL else size[1]
+        with stage("layout"):
+            strips = compute_strips(length, params, rng)
+
+            # Zufällig die normalen Streifen mischen
+            order = list(range(len(strips)))
+            rng.shuffle(order)
+
+        blank_width = params.blank_width if params.insert_blank else 0
+        return cls(params.direction, length, strips, order, blank_width)
+
+    def segments(self):
+        """Liefert die Ausgabe als Liste von (quell_offset, grösse); ``None`` steht für einen leeren Streifen."""
+        segments = []
+        for i, index in enumerate(self.order):
+            segments.append(self.strips[index])
+            # Leere Streifen zwischen den normalen Streifen einfügen
+            if self.blank_width and i < len(self.order) - 1:
+                segments.append((None, self.blank_width))
+        return segments
+
+    def scaled(self, length):
+        """Skaliert das Layout proportional auf eine Schneidachse der Länge ``length``.
+
+        Die Streifengrenzen werden gerundet, sodass die Streifen lückenlos
+        aneinander anschliessen; die Reihenfolge bleibt unverändert.
+        """
+        factor = length / self.length if self.length else 0
+        strips = []
+        for offset, dim in self.strips:
+            start = round(offset * factor)
+            strips.append((start, round((offset + dim) * factor) - start))
+        blank_width = max(1, round(self.blank_width * factor)) if self.blank_width else 0
+        return StripLayout(self.direction, length, strips, list(self.order), blank_width, list(self.sources))
+
+    def to_dict(self):
+        data = {
+            "direction": self.direction,
+            "length": self.length,
+            "blank_width": self.blank_width,
+            "strips": [list(strip) for strip in self.strips],
+            "order": list(self.order),
+        }
+        if self.sources:
+            data["sources"] = list(self.sources)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Erstellt ein Layout aus einem Dictionary und prüft es auf Plausibilität."""
+        layout = cls(
+            direction=data["direction"],
+            length=int(data["length"]),
+            strips=[(int(offset), int(dim)) for offset, dim in data["strips"]],
+            order=[int(i) for i in data["order"]],
+            blank_width=int(data.get("blank_width", 0)),
+            sources=[int(i) for i in data.get("sources", [])],
+        )
+        if layout.direction not in (VERTICAL, HORIZONTAL):
+            raise ValueError(f"Unbekannte Schneidrichtung: {layout.direction}")
+        if sorted(layout.order) != list(range(len(layout.strips))):
+            raise ValueError("Ungültiges Layout: order ist keine Permutation der Streifen.")
+        if any(offset < 0 or dim < 0 or offset + dim > layout.length for offset, dim in layout.strips):
+            raise ValueError("Ungültiges Layout: Streifen ausserhalb des Bildes.")
+        if layout.sources and (len(layout.sources) != len(layout.strips) or min(layout.sources) < 0):
+            raise ValueError("Ungültiges Layout: sources passt nicht zu den Streifen.")
+        return layout
+
+    def save(self, path):
+        """Speichert das Layout als JSON oder TOML (je nach Dateiendung)."""
+        with open(path, "w") as f:
+            if path.lower().endswith(".toml"):
+                import toml
+                toml.dump(self.to_dict(), f)
+            else:
+                json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Lädt ein mit ``save`` gespeichertes Layout."""
+        with open(path, "r") as f:
+            if path.lower().endswith(".toml"):
+                import toml
+                return cls.from_dict(toml.load(f))
+            return cls.from_dict(json.load(f))
+
+
+def layout_path(output_filename):
+    """Pfad der Layout-Datei neben einer Ausgabedatei."""
+    return os.path.splitext(output_filename)[0] + ".layout.json"
+
+
+def stitch_image(img, params, rng=None, layout=None, blanks=None):
+    """Zerschneidet ``img`` gemäss ``params``, mischt die Streifen und gibt das neue Bild zurück.
+
+    Mit ``layout`` wird ein gespeichertes Layout ohne Zufallsgenerator
+    angewendet, bei anderer Auflösung proportional skaliert. ``blanks`` siehe
+    ``stitch_segments``.
+    """
+    params.validate()
+    if layout is None:
+        layout = StripLayout.generate(img.size, params, rng)
+    return stitch_segments(img, fit_layout(layout, img.size).segments(), replace(params, direction=layout.direction),
+                           blanks)
+
+
+def fit_layout(layout, size):
+    """Passt ``layout`` an ein Bild der Grösse ``size`` an (skaliert nur, wenn nötig)."""
+    length = size[0] if layout.direction == VERTICAL else size[1]
+    return layout if layout.length == length else layout.scaled(length)
+
+
+def stitch_segments(img, segments, params, blanks=None):
+    """Setzt ``img`` gemäss einer fertigen Segmentliste (siehe ``StripLayout.segments``) zusammen.
+
+    Die Ausgabe hat den Modus der Quelle (siehe ``working_mode``). ``blanks``
+    ist ein Dictionary, in dem die fertigen leeren Streifen über mehrere
+    Aufrufe hinweg wiederverwendet werden (siehe ``variants``).
+    """
+    vertical = params.direction == VERTICAL
+    img = to_working_mode(img)
+    fill = fill_color(params.strip_color, img.mode)
+    annotate(strips=sum(1 for src, _ in segments if src is not None),
+             blanks=sum(1 for src, _ in segments if src is None))
+    use_numpy = numpy_enabled(params)
+    bands = _parallel_bands(img.size, segments, vertical, params.workers)
+    if len(bands) > 1:
+        with stage("parallel_stitch"):
+            return _stitch_parallel(img, segments, vertical, fill, bands, use_numpy)
+    if use_numpy:
+        return _stitch_gather(img, segments, vertical, fill)
+    return _stitch_paste(img, segments, vertical, fill, blanks)
+
+
+def load_proxy(path, max_size):
+    """Lädt eine verkleinerte Kopie des Bildes (höchstens ``max_size``) für die Vorschau.
+
+    Gibt (proxy, originalgrösse) zurück.
+    """
+    with Image.open(path) as img:
+        full_size = img.size
+        # JPEG: per DCT-Skalierung direkt in 1/2, 1/4 oder 1/8 Grösse dekodieren
+        img.draft(None, max_size)
+        if img.mode == "I;16":
+            # Ältere Pillow-Versionen skalieren I;16 nicht; über "I" bleiben die 16 Bit erhalten
+            proxy = img.convert("I")
+            proxy.thumbnail(max_size)
+            return proxy.convert("I;16"), full_size
+        img.thumbnail(max_size)
+        img.load()  # thumbnail lädt nicht, wenn das Bild schon klein genug ist
+        return img, full_size
+
+
+def render_proxy(proxy, layout, params):
+    """Setzt die Vorschau aus ``proxy`` mit dem Layout des Originals zusammen.
+
+    Das Layout wird nur skaliert, so dass ``stitch_image`` mit demselben
+    Layout exakt dieselbe Reihenfolge liefert.
+    """
+    return stitch_image(to_working_mode(proxy, params.grayscale), params, layout=layout)
+
+
+def load_numpy():
+    """Importiert NumPy beim ersten Gebrauch; None, wenn es nicht installiert ist."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def numpy_enabled(params):
+    """Prüft, ob ``params`` das NumPy-Gather verlangt; ValueError, wenn NumPy dann fehlt."""
+    if params.stitch_mode != "numpy":
+        return False
+    if load_numpy() is None:
+        raise ValueError("Für stitch_mode = \"numpy\" muss NumPy installiert sein.")
+    return True
+
+
+def _stitch_paste(img, segments, vertical, fill, blanks=None):
+    """Setzt das Bild Streifen für Streifen mit crop/paste zusammen."""
+    width, height = img.size
+    cut_length = sum(dim for _, dim in segments)
+    with stage("paste"):
+        if vertical:
+            new_img = Image.new(img.mode, (cut_length, height))
+        else:
+            new_img = Image.new(img.mode, (width, cut_length))
+
+    if blanks is None:
+        blanks = {}
+    offset = 0
+    for src, dim in segments:
+        if dim == 0:
+            continue
+        if src is None:
+            blank_size = (dim, height) if vertical else (width, dim)
+            key = (img.mode, blank_size, fill)
+            strip = blanks.get(key)
+            if strip is None:
+                with stage("blank"):
+                    strip = blanks[key] = Image.new(img.mode, blank_size, fill)
+        else:
+            with stage("crop"):
+                if vertical:
+                    strip = img.crop((src, 0, src + dim, height))
+                else:
+                    strip = img.crop((0, src, width, src + dim))
+
+        with stage("paste"):
+            if vertical:
+                new_img.paste(strip, (offset, 0))
+            else:
+                new_img.paste(strip, (0, offset))
+        offset += dim
+    return new_img
+
+
+def _segment_index(segments):
+    """Baut die Index-Map (Quellspalte bzw. -zeile je Ausgabeposition) und die Positionen der leeren Streifen."""
+    index = np.empty(sum(dim for _, dim in segments), dtype=np.intp)
+    blank = []
+    offset = 0
+    for src, dim in segments:
+        if src is None:
+            index[offset:offset + dim] = 0
+            blank.append(np.arange(offset, offset + dim))
+        else:
+            index[offset:offset + dim] = np.arange(src, src + dim)
+        offset += dim
+    blank = np.concatenate(blank) if blank else np.empty(0, dtype=np.intp)
+    return index, blank
+
+
+def pixel_array(img):
+    """Liefert die Pixel von ``img`` als 2D-Array (ein Element pro Pixel) und den Rohmodus zum Zurückwandeln."""
+    rawmode, dtype = _PIXEL_TYPES[img.mode]
+    return np.frombuffer(img.tobytes("raw", rawmode), dtype=dtype).reshape(img.height, img.width), rawmode
+
+
+def fill_pixel(mode, fill):
+    """Pixelwert von ``fill`` als Element von ``pixel_array``."""
+    return pixel_array(Image.new(mode, (1, 1), fill))[0][0, 0]
+
+
+def _stitch_gather(img, segments, vertical, fill):
+    """Setzt das Bild in einem einzigen NumPy-Gather-Durchlauf zusammen.
+
+    Jedes Pixel wird als ein Element behandelt (RGB als 32-Bit-RGBX), sodass
+    jede Ausgabespalte bzw. -zeile mit einem einzigen ``np.take`` aus der
+    Quelle kopiert wird. Liefert dasselbe Ergebnis wie ``_stitch_paste``.
+    """
+    load_numpy()
+    with stage("gather"):
+        src, rawmode = pixel_array(img)
+        index, blank = _segment_index(segments)
+
+        out = np.take(src, index, axis=1 if vertical else 0)
+        if blank.size:
+            if vertical:
+                out[:, blank] = fill_pixel(img.mode, fill)
+            else:
+                out[blank] = fill_pixel(img.mode, fill)
+        return Image.frombytes(img.mode, (out.shape[1], out.shape[0]), out, "raw", rawmode)
+
+
+def _parallel_bands(size, segments, vertical, workers):
+    """Teilt die Ausgabe in Zeilenbänder (start, stop) für ``workers`` Threads auf.
+
+    Liefert nur ein Band, wenn sich die Parallelisierung nicht lohnt.
+    """
+    workers = workers or os.cpu_count() or 1
+    cut_length = sum(dim for _, dim in segments)
+    width, height = (cut_length, size[1]) if vertical else (size[0], cut_length)
+    if workers < 2 or width * height < PARALLEL_MIN_PIXELS:
+        return [(0, height)]
+    count = max(1, min(workers, height // PARALLEL_MIN_BAND_ROWS))
+    edges = [height * i // count for i in range(count + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def clip_segments(segments, start, stop):
+    """Liefert (quell_offset, grösse, ausgabe_offset) der Segmente, geschnitten auf ``start`` bis ``stop``."""
+    offset = 0
+    for src, dim in segments:
+        lo, hi = max(offset, start), min(offset + dim, stop)
+        if lo < hi:
+            yield (None if src is None else src + lo - offset), hi - lo, lo
+        offset += dim
+        if offset >= stop:
+            break
+
+
+def _stitch_parallel(img, segments, vertical, fill, bands, use_numpy):
+    """Setzt die Ausgabe in unabhängigen Zeilenbändern auf einem Thread-Pool zusammen.
+
+    Vertikal enthält jedes Band dieselben Zeilen aller Streifen, horizontal
+    einen zusammenhängenden Teil der Streifenfolge. Alle Threads schreiben
+    direkt in dieselbe Leinwand (Pillow bzw. NumPy geben beim Kopieren den
+    GIL frei); es wird nichts nachträglich zusammengefügt. Das Ergebnis ist
+    identisch mit ``_stitch_paste`` bzw. ``_stitch_gather``.
+    """
+    width, height = img.size
+    cut_length = sum(dim for _, dim in segments)
+    out_size = (cut_length, height) if vertical else (width, cut_length)
+
+    if use_numpy:
+        src, rawmode = pixel_array(img)
+        index, blank = _segment_index(segments)
+        out = np.empty((out_size[1], out_size[0]), dtype=src.dtype)
+        value = fill_pixel(img.mode, fill)
+        blank_mask = np.zeros(len(index), dtype=bool)
+        blank_mask[blank] = True
+
+        def gather_band(start, stop):
+            if vertical:
+                np.take(src[start:stop], index, axis=1, out=out[start:stop])
+                out[start:stop, blank_mask] = value
+            else:
+                np.take(src, index[start:stop], axis=0, out=out[start:stop])
+                out[start:stop][blank_mask[start:stop]] = value
+
+        _run_bands(gather_band, bands)
+        return Image.frombytes(img.mode, out_size, out, "raw", rawmode)
+
+    # Leere Streifen sind bereits in der Leinwand enthalten
+    has_blank = any(src is None for src, _ in segments)
+    new_img = Image.new(img.mode, out_size, fill if has_blank else 0)
+
+    def paste_band(start, stop):
+        if vertical:
+            offset = 0
+            for src, dim in segments:
+                if src is not None and dim:
+                    new_img.paste(img.crop((src, start, src + dim, stop)), (offset, start))
+                offset += dim
+        else:
+            for src, dim, offset in clip_segments(segments, start, stop):
+                if src is not None:
+                    new_img.paste(img.crop((0, src, width, src + dim)), (0, offset))
+
+    _run_bands(paste_band, bands)
+    return new_img
+
+
+def _run_bands(func, bands):
+    with ThreadPoolExecutor(max_workers=len(bands), thread_name_prefix="stitch") as executor:
+        for future in [executor.submit(func, start, stop) for start, stop in bands]:
+            future.result()
+
+
+def is_supported_image(path):
+    """Prüft anhand der Dateiendung, ob die Datei ein unterstütztes Bildformat hat."""
+    return path.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
+
+
+def output_path(output_folder, extension=".jpg"):
+    """Erzeugt einen neuen, eindeutigen Dateinamen im Ausgabeordner."""
+    return os.path.join(output_folder, f"{uuid.uuid4()}_striped{extension}")
+
+
+def render_file(input_path, params, layout=None):
+    """Lädt ``input_path`` und erstellt das Streifenbild.
+
+    Gibt (bild, layout) zurück; das Layout ist auf die Grösse der Quelle angepasst.
+    """
+    img = load_image(input_path, params)
+    layout = fit_layout(layout, img.size) if layout else StripLayout.generate(img.size, params)
+    return stitch_image(img, params, layout=layout), layout
+
+
+def save_missing_layout(input_path, output_filename, params, layout=None):
+    """Speichert das Layout neben einer wiederverwendeten Ausgabe (Ausgabe-Cache), falls es dort fehlt.
+
+    Mit Seed bzw. gespeichertem Layout ist es reproduzierbar und wird wie in
+    ``render_file`` berechnet; dafür genügt der Dateikopf der Quelle.
+    """
+    path = layout_path(output_filename)
+    if os.path.exists(path):
+        return
+    with Image.open(input_path) as img:
+        size = img.size
+    layout = fit_layout(layout, size) if layout else StripLayout.generate(size, params)
+    layout.save(path)
+
+
+def process_file(input_path, output_folder, params, layout=None, save_layout=False, encoder=None):
+    """Lädt ``input_path``, erstellt das Streifenbild und speichert es im Ausgabeordner.
+
+    ``encoder`` (``EncoderSettings``) legt Format und Qualität fest, Standard
+    ist JPEG. Mit ``save_layout`` wird das verwendete Layout als JSON neben der
+    Ausgabe abgelegt (siehe ``layout_path``). Gibt den Pfad der geschriebenen
+    Datei zurück.
+    """
+    if not os.path.isdir(output_folder):
+        raise FileNotFoundError("Der Ausgabeordner existiert nicht!")
+    encoder = encoder or EncoderSettings()
+    new_img, layout = render_file(input_path, params, layout)
+    output_filename = output_path(output_folder, encoder.extension)
+    encode(new_img, output_filename, encoder)
+    if save_layout:
+        with stage("layout_save"):
+            layout.save(layout_path(output_filename))
+    return output_filename
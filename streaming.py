@@ -0,0 +1,231 @@
+'''
+Speicherschonender Streaming-Modus für sehr grosse Bilder.
+
+Ablauf:
+1. Das Quellbild wird bandweise (``band_rows`` Zeilen) als Rohdaten in eine
+   temporäre Datei geschrieben. Unkomprimierte Formate (BMP, PPM) werden dabei
+   direkt bandweise gelesen, alle anderen einmal dekodiert und das dekodierte
+   Bild danach sofort wieder freigegeben.
+2. Das Ergebnis wird Band für Band aus dieser Datei zusammengesetzt
+   und direkt in einen inkrementellen PNG-Encoder geschrieben. Es existiert
+   nie ein vollständiges Ausgabebild im Speicher.
+
+Horizontal: Jedes Ausgabeband stammt aus genau einem zusammenhängenden
+Zeilenbereich der Quelle. Die Bänder werden in der gemischten Reihenfolge aus
+der Rohdatei gelesen, leere Streifen werden als konstante Bänder eingefügt.
+
+Vertikal (Fallback): Hier braucht jede Ausgabezeile Pixel aus allen Streifen,
+aber nur aus derselben Quellzeile. Statt gemischter Bänder wird die Quelle
+deshalb sequentiell in Zeilenbändern gelesen und jedes Band mit derselben
+Segmentliste quer zusammengesetzt; die temporäre Rohdatei entfällt dabei.
+
+Einschränkung: Pillow kann JPEG/PNG nicht in Zeilenbändern dekodieren. Bei
+diesen Formaten liegt das dekodierte Quellbild während Schritt 1 daher einmal
+vollständig im Speicher (statt wie bisher Quelle, alle Streifen und
+Ausgabebild gleichzeitig).
+Ausgegeben wird immer PNG, da Pillow keinen inkrementellen JPEG-Encoder bietet.
+Der Bildmodus der Quelle bleibt erhalten (L, LA, RGB, RGBA, 16-Bit-Graustufen);
+nur CMYK wird für PNG nach RGB umgewandelt.
+'''
+import os
+import struct
+import tempfile
+import zlib
+from dataclasses import replace
+
+from PIL import Image
+
+from encoder import FORMAT_MODES, convert_mode
+from slice_engine import (VERTICAL, StripLayout, fill_color, fit_layout, layout_path, load_image, stitch_segments,
+                          to_working_mode, working_mode)
+from timing import annotate, stage
+
+DEFAULT_BAND_ROWS = 256
+
+_BYTES_PER_PIXEL = {"L": 1, "LA": 2, "I;16": 2, "RGB": 3, "RGBA": 4, "CMYK": 4}
+
+
+class RasterFile:
+    """Roh dekodiertes Bild in einer Datei, zeilenweise lesbar."""
+
+    def __init__(self, fileobj, mode, size):
+        self.mode = mode
+        self.width, self.height = size
+        self.stride = self.width * _BYTES_PER_PIXEL[mode]
+        self._file = fileobj
+
+    @classmethod
+    def spill(cls, size, bands, fileobj):
+        """Schreibt die Bänder aus ``bands`` (Bilder voller Breite) als Rohdaten nach ``fileobj``."""
+        mode = None
+        for band in bands:
+            if mode is None:
+                mode = band.mode if band.mode in _BYTES_PER_PIXEL else "RGB"
+            band = convert_mode(band, mode)
+            fileobj.write(band.tobytes())
+        fileobj.flush()
+        return cls(fileobj, mode or "RGB", size)
+
+    def rows(self, top, bottom):
+        """Liefert die Zeilen ``top`` bis ``bottom`` (exklusiv) als Bild."""
+        self._file.seek(top * self.stride)
+        data = self._file.read((bottom - top) * self.stride)
+        return Image.frombytes(self.mode, (self.width, bottom - top), data)
+
+
+class PngStreamWriter:
+    """Schreibt ein PNG (L, LA, RGB, RGBA oder 16-Bit-Graustufen) zeilenweise, ohne das ganze Bild zu halten."""
+
+    # Modus -> (PNG-Farbtyp, Bittiefe, Rohmodus in PNG-Bytefolge)
+    _COLOR_TYPES = {"L": (0, 8, "L"), "LA": (4, 8, "LA"), "RGB": (2, 8, "RGB"), "RGBA": (6, 8, "RGBA"),
+                    "I;16": (0, 16, "I;16B")}
+
+    def __init__(self, fileobj, size, mode="RGB", compress_level=6):
+        self.width, self.height = size
+        self.mode = mode
+        self.stride = self.width * _BYTES_PER_PIXEL[mode]
+        self._file = fileobj
+        self._compressor = zlib.compressobj(compress_level)
+        self._rows_written = 0
+
+        color_type, bit_depth, self._rawmode = self._COLOR_TYPES[mode]
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, bit_depth, color_type, 0, 0, 0))
+
+    def _chunk(self, tag, data):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(tag)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    def write_band(self, band):
+        """Hängt ein Bild mit voller Breite als nächste Zeilen an."""
+        with stage("encode"):
+            self._write_band(band)
+
+    def _write_band(self, band):
+        band = convert_mode(band, self.mode)
+        data = memoryview(band.tobytes("raw", self._rawmode))
+        rows = bytearray()
+        for y in range(band.height):
+            rows += b"\x00"  # PNG-Filter "None"
+            rows += data[y * self.stride:(y + 1) * self.stride]
+        compressed = self._compressor.compress(bytes(rows))
+        if compressed:
+            self._chunk(b"IDAT", compressed)
+        self._rows_written += band.height
+
+    def close(self):
+        if self._rows_written != self.height:
+            raise ValueError(f"PNG unvollständig: {self._rows_written} von {self.height} Zeilen geschrieben")
+        self._chunk(b"IDAT", self._compressor.flush())
+        self._chunk(b"IEND", b"")
+
+
+def _raw_tile(img):
+    """Liefert (offset, rawmode, stride, orientation) für unkomprimierte Einzelkachel-Dateien, sonst None."""
+    if img.mode not in _BYTES_PER_PIXEL or len(img.tile) != 1:
+        return None
+    codec, extents, offset, args = img.tile[0]
+    if codec != "raw" or tuple(extents) != (0, 0) + img.size:
+        return None
+    if isinstance(args, str):
+        args = (args,)
+    rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+    if stride == 0:
+        if rawmode != img.mode:
+            return None
+        stride = img.width * _BYTES_PER_PIXEL[img.mode]
+    return offset, rawmode, stride, orientation
+
+
+def iter_source_bands(path, params, band_rows=DEFAULT_BAND_ROWS):
+    """Liefert (grösse, Generator über Zeilenbänder) der Quelle.
+
+    Unkomprimierte Formate (BMP, PPM, ...) werden direkt bandweise aus der
+    Datei gelesen. Alle anderen Formate werden einmal vollständig dekodiert und
+    danach in Bänder zerlegt.
+    """
+    with Image.open(path) as img:
+        size, mode = img.size, img.mode
+        raw = _raw_tile(img)
+
+    def raw_bands():
+        offset, rawmode, stride, orientation = raw
+        width, height = size
+        with open(path, "rb") as f:
+            for top in range(0, height, band_rows):
+                bottom = min(top + band_rows, height)
+                # Bei orientation -1 (BMP) liegen die Zeilen von unten nach oben in der Datei
+                first = top if orientation > 0 else height - bottom
+                with stage("decode"):
+                    f.seek(offset + first * stride)
+                    data = f.read((bottom - top) * stride)
+                    band = Image.frombuffer(mode, (width, bottom - top), data,
+                                            "raw", rawmode, stride, orientation)
+                yield to_working_mode(band, params.grayscale)
+
+    return size, raw_bands() if raw else image_bands(load_image(path, params), band_rows)
+
+
+def image_bands(img, band_rows=DEFAULT_BAND_ROWS):
+    """Zerlegt ein bereits dekodiertes Bild in Zeilenbänder."""
+    for top in range(0, img.height, band_rows):
+        yield img.crop((0, top, img.width, min(top + band_rows, img.height)))
+
+
+def stream_stitch_file(input_path, output_filename, params, band_rows=DEFAULT_BAND_ROWS, rng=None,
+                       layout=None, save_layout=False, compress_level=6):
+    """Erstellt das Streifenbild von ``input_path`` im Streaming-Modus als PNG.
+
+    Der Speicherbedarf beim Zusammensetzen und Kodieren liegt bei wenigen
+    Bändern zu ``band_rows`` Zeilen.
+    """
+    params.validate()
+
+    with Image.open(input_path) as img:
+        mode = working_mode(img, params.grayscale)
+    if mode not in FORMAT_MODES["PNG"]:
+        mode = "RGB"
+    size, bands = iter_source_bands(input_path, params, band_rows)
+    width, height = size
+    annotate(width=width, height=height, streaming=True)
+    if layout is None:
+        layout = StripLayout.generate(size, params, rng)
+    layout = fit_layout(layout, size)
+    params = replace(params, direction=layout.direction)
+    vertical = layout.direction == VERTICAL
+    segments = layout.segments()
+    cut_length = sum(dim for _, dim in segments)
+
+    with open(output_filename, "wb") as f:
+        if vertical:
+            # Quellbänder sequentiell lesen und jedes Band quer zusammensetzen
+            writer = PngStreamWriter(f, (cut_length, height), mode, compress_level=compress_level)
+            for band in bands:
+                writer.write_band(stitch_segments(band, segments, params))
+        else:
+            # Zeilenbänder in gemischter Reihenfolge aus der Rohdatei lesen
+            writer = PngStreamWriter(f, (width, cut_length), mode, compress_level=compress_level)
+            with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(output_filename))) as spill:
+                raster = RasterFile.spill(size, bands, spill)
+                blank = None
+                for src, dim in segments:
+                    if src is None:
+                        if blank is None:
+                            blank = Image.new(mode, (width, min(dim, band_rows)), fill_color(params.strip_color, mode))
+                        for top in range(0, dim, band_rows):
+                            rows = min(band_rows, dim - top)
+                            writer.write_band(blank if rows == blank.height else blank.crop((0, 0, width, rows)))
+                    else:
+                        for top in range(src, src + dim, band_rows):
+                            with stage("crop"):
+                                band = raster.rows(top, min(top + band_rows, src + dim))
+                            writer.write_band(band)
+        writer.close()
+    annotate(strips=len(layout.strips), output=output_filename, output_format="PNG",
+             bytes_written=os.path.getsize(output_filename))
+    if save_layout:
+        with stage("layout_save"):
+            layout.save(layout_path(output_filename))
+    return output_filename
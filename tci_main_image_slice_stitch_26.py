@@ -9,21 +9,55 @@ https://www.flaticon.com/icon-fonts-most-downloaded?weight=regular&type=uicon
 import sys
 import os
 import random
-import uuid
-import toml
-from PIL import Image, ImageDraw
 import logging
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QFileDialog, QLabel, 
      QColorDialog
 )
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
 
-from gui_layout import init_ui, show_about  # Importiere die Methoden aus gui_layout.py
+from gui_layout import init_ui, show_about, pil_to_qimage  # Importiere die Methoden aus gui_layout.py
+from config_store import ConfigStore, load_config
+
+# Pillow, NumPy und die Engine-Module werden erst bei der ersten Verwendung
+# importiert (siehe finish_startup und die einzelnen Methoden), damit das
+# Fenster schneller erscheint.
 
 CONFIG_FILE = "config.toml"
+PREVIEW_DEBOUNCE_MS = 80
+DEFERRED_SETUP_MS = 50  # Verzögerung, damit das Fenster zuerst gezeichnet wird
+
+DEFAULT_CONFIG = {
+    "input_folder": "",
+    "output_folder": "",
+    "strip_count": 6,
+    "random_strips": False,
+    "min_strip_size": 20,
+    "max_strip_size": 100,
+    "direction": "vertical",
+    "insert_blank": False,
+    "blank_width": 100,
+    "strip_color": (255, 255, 255),
+    "grayscale": False,
+    "cache_folder": "",
+    "cache_max_mb": 2048,
+    "save_layout": False,
+    "output_format": "JPEG",
+    "quality": 75,
+    "progressive": False,
+    "optimize": False,
+    "subsampling": "4:2:0",
+    "png_compress_level": 6,
+    "tiff_compression": "",
+    "max_image_pixels": 0,  # 0 = kein Limit (siehe slice_engine.set_pixel_limit)
+    "gui_stitch_workers": 0,  # nur GUI; stitch_workers (Batch, Watch-Folder) bleibt beim Standard 1
+    "output_cache": True,
+    "output_cache_folder": "",
+    "output_cache_max_mb": 1024,
+    "profile": "",
+    "timing_log": "",
+}
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -34,25 +68,47 @@ class ImageStripper(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         self.selected_file = None  # 🛠️ Verhindert den Fehler!
 
-        # Standard-Konfiguration laden
-        self.config = {
-            "input_folder": "",
-            "output_folder": "",
-            "strip_count": 6,
-            "random_strips": False,
-            "min_strip_size": 20,
-            "max_strip_size": 100,
-            "direction": "vertical",
-            "insert_blank": False,
-            "blank_width": 100,
-            "strip_color": (255, 255, 255),
-            "grayscale": False
-        }
-
+        # Standardwerte, ergänzt um die gültigen Werte aus config.toml
+        self.config_store = ConfigStore(CONFIG_FILE)
         self.load_config()
+        self.raster_cache = None
+        self.output_cache = None
+
+        # Generierung im Hintergrund; ein Thread, damit sich Aufträge nicht überholen
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.current_job = None
+        self.job_id = 0
+
+        # Live-Vorschau: verkleinerte Kopie der Quelle und Seed der angezeigten Reihenfolge
+        self.preview_source = None
+        self.preview_full_size = None
+        self.preview_seed = random.randrange(2**32)
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.render_preview)
 
         self.init_ui()  # Rufe die init_ui-Methode auf
 
+        # Was für die erste Anzeige nicht nötig ist, erst nach dem ersten Zeichnen einrichten
+        QTimer.singleShot(DEFERRED_SETUP_MS, self.finish_startup)
+
+    def finish_startup(self):
+        """Richtet Caches und Zeitmessung ein, sobald das Fenster angezeigt wird."""
+        if self.raster_cache is not None:
+            return
+        from output_cache import OutputCache
+        from raster_cache import RasterCache
+        from slice_engine import set_pixel_limit
+        from timing import configure_timing_log
+
+        if self.config.get("timing_log"):
+            configure_timing_log(self.config["timing_log"])
+        set_pixel_limit(self.config["max_image_pixels"])
+        self.raster_cache = RasterCache.from_config(self.config)
+        self.output_cache = OutputCache.from_config(self.config)
+
         # UI-Elemente erstellen
     def init_ui(self):
         init_ui(self)  # Rufe die init_ui-Methode aus gui_layout.py auf
@@ -61,7 +117,7 @@ class ImageStripper(QMainWindow):
         show_about(self)  # Rufe die show_about-Methode aus gui_layout.py auf
 
     def save_config(self):
-        """Speichert die aktuelle Konfiguration in einer TOML-Datei, sobald sich eine Einstellung ändert."""
+        """Übernimmt die Einstellungen aus der Oberfläche; geschrieben wird verzögert im Hintergrund."""
         self.config["strip_count"] = self.strip_count.value()
         self.config["random_strips"] = self.random_strips.isChecked()
         self.config["min_strip_size"] = self.min_strip_size.value()
@@ -70,15 +126,15 @@ class ImageStripper(QMainWindow):
         self.config["insert_blank"] = self.insert_blank.isChecked()
         self.config["blank_width"] = self.blank_width.value()
         self.config["grayscale"] = self.grayscale_checkbox.isChecked()
-    
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                toml.dump(self.config, f)
-        except Exception as e:
-            logging.error(f"Fehler beim Speichern der Konfigurationsdatei: {e}")
+        self.config_store.save(self.config)
 
     def generate_image(self):
-        """Erstellt das Streifenbild und zeigt die Vorschau."""
+        """Startet die Generierung des Streifenbilds im Hintergrund; die Vorschau folgt nach Abschluss."""
+        from encoder import EncoderSettings
+        from gui_worker import GenerateWorker
+        from slice_engine import StripLayout
+
+        self.finish_startup()
         if not os.path.exists(self.config["output_folder"]):
             self.show_message("Der Ausgabeordner existiert nicht!")
             return
@@ -87,123 +143,105 @@ class ImageStripper(QMainWindow):
             self.show_message("Bitte zuerst ein Bild auswählen!")
             return
 
-        # File oeffnen
+        # Gleiches Layout wie die Vorschau: exakt dieselbe Streifen-Reihenfolge
+        params = self.slice_params()
+        encoder = EncoderSettings.from_config(self.config)
         try:
-            img = Image.open(self.selected_file)
-        except (FileNotFoundError, OSError):
-            self.show_message("Fehler: Ungültiges Bildformat oder Datei nicht gefunden.")
+            params.validate()
+            encoder.validate()
+        except ValueError as e:
+            self.show_message(str(e))
+            return
+        layout = StripLayout.generate(self.preview_full_size, params) if self.preview_full_size else None
+
+        # Laufenden Auftrag abbrechen, er wird durch den neuen ersetzt
+        if self.current_job:
+            self.current_job.cancel()
+        self.job_id += 1
+        worker = GenerateWorker(self.job_id, self.selected_file, self.config["output_folder"], params,
+                                self.raster_cache, layout, self.config.get("save_layout", False), encoder,
+                                profile=self.config.get("profile", ""), output_cache=self.output_cache)
+        worker.signals.progress.connect(self.on_generate_progress)
+        worker.signals.finished.connect(self.on_generate_finished)
+        worker.signals.failed.connect(self.on_generate_failed)
+        self.current_job = worker
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.thread_pool.start(worker)
+
+    def on_generate_progress(self, job_id, percent):
+        if job_id == self.job_id:  # Meldungen überholter Aufträge ignorieren
+            self.progress_bar.setValue(percent)
+
+    def on_generate_finished(self, job_id, output_filename, preview):
+        if job_id != self.job_id:
+            return
+        self.current_job = None
+        self.progress_bar.hide()
+        self.output_img_label.set_image(preview)
+        logging.debug(f"Gespeichert: {output_filename}")
+        logging.info(f"Raster-Cache: {self.raster_cache.stats()}")
+        if self.output_cache:
+            logging.info(f"Ausgabe-Cache: {self.output_cache.stats()}")
+
+    def on_generate_failed(self, job_id, message):
+        if job_id != self.job_id:
             return
+        self.current_job = None
+        self.progress_bar.hide()
+        self.show_message(message)
 
-        # Bild nach schwarz weiss konvertieren
-        if self.grayscale_checkbox.isChecked():
-            img = img.convert("L")
-
-        # Variabeln initalisieren
-        width, height = img.size
-        num_strips = self.strip_count.value()
-        min_size = self.min_strip_size.value()
-        max_size = self.max_strip_size.value()
-        direction = self.config["direction"]
-        blank_size = self.blank_width.value()
-        color = tuple(self.config["strip_color"])
-
-        strips = []
-        offset = 0
-        new_img_width = 0
-        new_img_height = 0
-
-        if min_size >= max_size: # Min und Max prüfen
-            self.show_message("Max muss größer als Min sein!")
+    def set_selected_file(self, file_path):
+        """Setzt das Quellbild und bereitet die Live-Vorschau vor."""
+        from slice_engine import load_proxy
+
+        self.selected_file = file_path
+        try:
+            # Verkleinert dekodieren (JPEG: DCT-Skalierung), reicht für beide Vorschauen
+            self.preview_source, self.preview_full_size = load_proxy(file_path, self.preview_max_size())
+        except (FileNotFoundError, OSError):
+            self.preview_source = None
+            self.show_message("Fehler: Das Bild konnte nicht geladen werden.")
+            return
+        self.img_label.set_image(pil_to_qimage(self.preview_source))
+        self.render_preview()
+
+    def preview_max_size(self):
+        """Grösste Vorschaugrösse in Gerätepixeln, die eines der beiden Labels braucht."""
+        ratio = self.devicePixelRatioF()
+        width = max(self.img_label.width(), self.output_img_label.width())
+        height = max(self.img_label.height(), self.output_img_label.height())
+        return int(width * ratio), int(height * ratio)
+
+    def schedule_preview(self):
+        """Startet die Vorschau nach kurzer Pause neu, statt bei jedem Schritt zu rendern."""
+        self.preview_timer.start()
+
+    def reshuffle_preview(self):
+        """Wählt eine neue Streifen-Reihenfolge und zeigt sie in der Vorschau."""
+        self.preview_seed = random.randrange(2**32)
+        self.render_preview()
+
+    def render_preview(self):
+        """Setzt die verkleinerte Quelle neu zusammen und zeigt sie ohne Dateizugriff an."""
+        if self.preview_source is None:
             return
+        from slice_engine import StripLayout, render_proxy
+        from timing import StageTimer, stage
 
-        # Bild zerschneiden
-        if direction == "vertical":
-            if self.config["random_strips"] == True:
-                while offset < width:
-                    dim = random.randint(min_size, max_size)
-
-                    if width < (offset + dim):   # letzen Streifen dim anpassen
-                        dim = width - offset
-                        if dim < min_size:       # Wenn der letzte Streifen kleiner als min Size ist igrnorieren
-                            break
-
-                    strips.append(img.crop((offset, 0, (offset + dim), height)))
-                    offset += dim
-            else:
-                strip_dim = width // num_strips
-                for i in range(num_strips):
-                    strips.append(img.crop((offset, 0, (offset + strip_dim), height)))
-                    offset += strip_dim
-
-            new_img_width = offset
-            new_img_height = height
-        else:
-            if self.config["random_strips"] == True:
-                while offset < height:
-                    dim = random.randint(min_size, max_size)
-
-                    if height < (offset + dim): # letzen Streifen dim anpassen
-                        dim = height - offset
-                        if dim < min_size:       # Wenn der letzte Streifen kleiner als min Size ist igrnorieren
-                            break
-
-                    strips.append(img.crop((0, offset, width, (offset + dim))))
-                    offset += dim
-            else:
-                strip_dim = height // num_strips
-                for i in range(num_strips):
-                    strips.append(img.crop((0, offset, width, (offset + strip_dim))))
-                    offset += strip_dim
-
-            new_img_height = offset
-            new_img_width = width
-
-        # Zufällig die normalen Streifen mischen
-        random.shuffle(strips)
-
-        # Zwischen Streifen einfügen
-        if self.insert_blank.isChecked():
-            if direction == "vertical":
-                image = Image.new("RGB", (blank_size, height), color)
-                draw = ImageDraw.Draw(image)
-                draw.rectangle([0, 0, blank_size, height])
-            else:
-                image = Image.new("RGB", (width, blank_size), color)
-                draw = ImageDraw.Draw(image)
-                draw.rectangle([0, 0, width, blank_size])
-
-            # Leere Streifen separat und in der richtigen Reihenfolge einfügen
-            final_strips = []
-            new_img_blank_size = 0
-            for i in range(len(strips)):
-                final_strips.append(strips[i])
-                if i < len(strips)-1:
-                    # Füge leere Streifen nach den normalen Streifen hinzu
-                    final_strips.append(image)
-                    new_img_blank_size += blank_size
-                    
-            strips = final_strips
-
-            if direction == "vertical":
-                new_img_width += new_img_blank_size
-            else:
-                new_img_height += new_img_blank_size
-
-        # Bild zusammen setzen und File erstellen
-        new_img = Image.new("RGB", (new_img_width, new_img_height))
-        offset = 0
-        if direction == "vertical":
-            for strip in strips:
-                new_img.paste(strip, (offset, 0))
-                offset += strip.width
-        else:
-            for strip in strips:
-                new_img.paste(strip, (0, offset))
-                offset += strip.height
-
-        output_filename = os.path.join(self.config["output_folder"], f"{uuid.uuid4()}_striped.jpg")
-        new_img.save(output_filename)
-        self.show_image_preview(output_filename, self.output_img_label)
+        params = self.slice_params()
+        timer = StageTimer("preview", level=logging.DEBUG, width=self.preview_source.width,
+                           height=self.preview_source.height)
+        try:
+            with timer:
+                layout = StripLayout.generate(self.preview_full_size, params)
+                preview = render_proxy(self.preview_source, layout, params)
+                with stage("display"):
+                    self.output_img_label.set_image(pil_to_qimage(preview))
+        except ValueError as e:
+            self.show_message(str(e))
+            return
+        timer.emit()
 
     def select_input_folder(self):
         """Eingabe-Ordner auswählen und speichern."""
@@ -235,19 +273,8 @@ class ImageStripper(QMainWindow):
 
         file_path, _ = QFileDialog.getOpenFileName(self, "Bild auswählen", self.config["input_folder"], "Bilder (*.png *.jpg *.jpeg)")
         if file_path:
-            self.selected_file = file_path
-            self.show_image_preview(file_path, self.img_label)
-
-    # In der ImageStripper-Klasse
-    def show_image_preview(self, file_path, label):
-        """Lädt und zeigt die Bildvorschau."""
-        pixmap = QPixmap(file_path)
-        if pixmap.isNull():
-            self.show_message("Fehler: Das Bild konnte nicht geladen werden.")
-            return
-        label.setPixmap(pixmap) #es wird nur noch das Bild gesetzt, aber nicht skalliert.
-        label.original_pixmap = pixmap  # Speichere das Original-Pixmap
-        label.update_pixmap()  # Skaliere das Bild sofort auf die Größe des Labels
+            self.img_label.setText("")
+            self.set_selected_file(file_path)
 
     def show_message(self, text):
         """Zeigt eine Nachricht in der Statusbar an."""
@@ -264,16 +291,25 @@ class ImageStripper(QMainWindow):
 
             self.btn_color.setText(f"Farbe: RGB:{color.red()}, {color.green()}, {color.blue()}")  
             self.btn_color.setStyleSheet(f"background-color: rgb({color.red()}, {color.green()}, {color.blue()}); color: black;")
+            self.schedule_preview()
 
         self.btn_color.clicked.connect(self.select_color)
 
     def load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, "r") as f:
-                    self.config = toml.load(f)
-            except Exception as e:
-                logging.error(f"Fehler beim Laden der Konfigurationsdatei: {e}")
+        self.config = load_config(CONFIG_FILE, DEFAULT_CONFIG)
+
+    def slice_params(self):
+        """Parameter aus der Konfiguration; die GUI setzt ein Bild mit gui_stitch_workers Threads zusammen."""
+        from slice_engine import SliceParams
+
+        params = SliceParams.from_config(self.config, seed=self.preview_seed)
+        params.workers = self.config["gui_stitch_workers"]
+        return params
+
+    def closeEvent(self, event):
+        """Schreibt ausstehende Änderungen der Konfiguration vor dem Beenden."""
+        self.config_store.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
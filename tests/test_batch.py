@@ -0,0 +1,42 @@
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_slice_stitch
+from batch_slice_stitch import BatchJob, run_batch
+from encoder import EncoderSettings
+from slice_engine import SliceParams
+
+_process_chunk = batch_slice_stitch.process_chunk
+
+
+def crashing_chunk(files, job):
+    # Simuliert einen abstürzenden Worker-Prozess (z.B. OOM-Kill)
+    if any("crash" in os.path.basename(path) for path in files):
+        os._exit(1)
+    return _process_chunk(files, job)
+
+
+def test_crashed_worker_fails_only_its_chunk(tmp_path, monkeypatch):
+    inputs = tmp_path / "in"
+    output = tmp_path / "out"
+    inputs.mkdir()
+    output.mkdir()
+    files = []
+    for name in ("a.png", "b.png", "crash.png", "d.png", "e.png"):
+        path = str(inputs / name)
+        Image.new("RGB", (64, 48), "red").save(path)
+        files.append(path)
+    monkeypatch.setattr(batch_slice_stitch, "process_chunk", crashing_chunk)
+
+    job = BatchJob(str(output), SliceParams(seed=1), EncoderSettings(), writers=1)
+    ok, failures, _ = run_batch(files, job, workers=2, chunk_size=1)
+
+    assert ok == 4
+    assert [path for path, _ in failures] == [files[2]]
+    assert "BrokenProcessPool" in failures[0][1]
+    # Ein Auftrag, der kurz vor dem Absturz fertig wurde, kann bei der Wiederholung ein zweites Mal schreiben
+    assert len(os.listdir(output)) >= 4
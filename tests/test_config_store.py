@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_slice_stitch
+from config_store import ConfigStore, load_config, merge_config, read_config, write_config
+
+DEFAULTS = {
+    "strip_count": 6,
+    "min_strip_size": 20,
+    "max_strip_size": 100,
+    "quality": 75,
+    "direction": "vertical",
+    "grayscale": False,
+    "strip_color": (255, 255, 255),
+}
+
+
+def test_saves_within_debounce_write_once(tmp_path):
+    path = str(tmp_path / "config.toml")
+    store = ConfigStore(path, debounce=0.3)
+    for count in range(1, 11):
+        store.save(dict(DEFAULTS, strip_count=count))
+    time.sleep(1.0)
+    assert store.writes == 1
+    assert read_config(path)["strip_count"] == 10
+    store.close()
+    assert store.writes == 1
+
+
+def test_flush_writes_immediately(tmp_path):
+    path = str(tmp_path / "config.toml")
+    store = ConfigStore(path, debounce=60)
+    store.save(dict(DEFAULTS, quality=90))
+    start = time.monotonic()
+    store.flush()
+    assert time.monotonic() - start < 5
+    assert store.writes == 1
+    assert read_config(path)["quality"] == 90
+    # Unveränderter Stand wird nicht erneut geschrieben
+    store.save(dict(DEFAULTS, quality=90))
+    store.close()
+    assert store.writes == 1
+
+
+def test_missing_keys_use_defaults():
+    config = merge_config({"strip_count": 9, "extra": "bleibt"}, DEFAULTS)
+    assert config["strip_count"] == 9
+    assert config["quality"] == 75
+    assert config["direction"] == "vertical"
+    assert config["extra"] == "bleibt"
+
+
+def test_invalid_values_use_defaults():
+    config = merge_config({"quality": 500, "strip_count": 0, "direction": "diagonal", "grayscale": "ja",
+                           "strip_color": [255, 0]}, DEFAULTS)
+    assert config == DEFAULTS
+
+
+def test_min_not_below_max_uses_defaults():
+    config = merge_config({"min_strip_size": 200, "max_strip_size": 100}, DEFAULTS)
+    assert (config["min_strip_size"], config["max_strip_size"]) == (20, 100)
+
+
+def test_load_config(tmp_path):
+    path = str(tmp_path / "config.toml")
+    assert load_config(path, DEFAULTS) == DEFAULTS
+    write_config(path, {"quality": 90, "strip_color": [0, 0, 0]})
+    config = load_config(path, DEFAULTS)
+    assert config["quality"] == 90
+    assert config["strip_color"] == (0, 0, 0)
+    with open(path, "w") as f:
+        f.write("kein = [toml")
+    assert load_config(path, DEFAULTS) == DEFAULTS
+
+
+def test_batch_config_falls_back_to_defaults(tmp_path):
+    path = str(tmp_path / "config.toml")
+    write_config(path, {"quality": 500, "max_image_pixels": -1, "output_format": "PNG"})
+    config = batch_slice_stitch.load_config(path)
+    assert config["quality"] == batch_slice_stitch.DEFAULT_CONFIG["quality"]
+    assert config["max_image_pixels"] == batch_slice_stitch.DEFAULT_CONFIG["max_image_pixels"]
+    assert config["output_format"] == "PNG"
+    assert batch_slice_stitch.load_config(str(tmp_path / "fehlt.toml")) == batch_slice_stitch.DEFAULT_CONFIG
@@ -0,0 +1,32 @@
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interleave import _center_box, interleave_files
+from slice_engine import HORIZONTAL, VERTICAL, SliceParams
+
+
+def test_center_box_stays_inside_image():
+    # 1200x900 auf 933x700 ergab vorher top = -5.7e-14
+    for size, target in (((1200, 900), (933, 700)), ((1000, 700), (933, 700)), ((700, 1000), (700, 933))):
+        left, top, right, bottom = _center_box(size, target)
+        assert 0 <= left <= right <= size[0]
+        assert 0 <= top <= bottom <= size[1]
+
+
+def test_interleave_sources_with_different_aspect_ratios(tmp_path):
+    paths = []
+    for name, size, color in (("a.png", (1200, 900), "red"), ("b.png", (1000, 700), "blue")):
+        path = str(tmp_path / name)
+        Image.new("RGB", size, color).save(path)
+        paths.append(path)
+    for direction in (VERTICAL, HORIZONTAL):
+        for stitch_mode in ("paste", "numpy"):
+            params = SliceParams(direction=direction, strip_count=6, seed=1, stitch_mode=stitch_mode)
+            img, layout = interleave_files(paths, params)
+            cut_length = sum(dim for _, dim in layout.strips)
+            assert img.size == ((cut_length, 700) if direction == VERTICAL else (1000, cut_length))
+            assert sorted(set(layout.sources)) == [0, 1]
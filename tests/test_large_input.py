@@ -0,0 +1,61 @@
+import io
+import os
+import struct
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slice_engine import SliceParams
+from streaming import stream_stitch_file
+from tiled_output import TileSettings, tiled_stitch_file
+
+# Knapp über Pillows Standardgrenze von 178956970 Pixeln
+WIDTH, HEIGHT = 13400, 13400
+
+
+@pytest.fixture(scope="module")
+def large_bmp(tmp_path_factory):
+    """Echte 8-Bit-BMP-Datei mit 180 MP; die Pixeldaten sind eine dünn belegte Datei (Nullen)."""
+    path = str(tmp_path_factory.mktemp("large") / "large.bmp")
+    buffer = io.BytesIO()
+    Image.new("L", (WIDTH, 1)).save(buffer, "BMP")
+    header = bytearray(buffer.getvalue()[:-WIDTH])  # Datei- und Bildkopf samt Palette
+    data_size = WIDTH * HEIGHT
+    struct.pack_into("<I", header, 2, len(header) + data_size)
+    struct.pack_into("<i", header, 22, HEIGHT)
+    struct.pack_into("<I", header, 34, data_size)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + data_size)
+    return path
+
+
+def test_streaming_opens_input_over_default_pixel_limit(large_bmp, tmp_path):
+    with Image.open(large_bmp) as img:
+        assert img.width * img.height > 178956970
+    output = stream_stitch_file(large_bmp, str(tmp_path / "out.png"), SliceParams(seed=1), compress_level=1)
+    with Image.open(output) as img:
+        assert img.size == (WIDTH // 6 * 6, HEIGHT)
+
+
+def test_tiled_opens_input_over_default_pixel_limit(large_bmp, tmp_path):
+    output = str(tmp_path / "out.tif")
+    tiled_stitch_file(large_bmp, output, SliceParams(seed=1), TileSettings(tile_size=1024, pyramid=False))
+    with Image.open(output) as img:
+        assert img.size == (WIDTH // 6 * 6, HEIGHT)
+
+
+def test_configured_pixel_limit_is_enforced(tmp_path):
+    from slice_engine import DEFAULT_MAX_IMAGE_PIXELS, set_pixel_limit
+
+    path = str(tmp_path / "small.png")
+    Image.new("L", (100, 100)).save(path)
+    set_pixel_limit(1000)
+    try:
+        with pytest.raises(Image.DecompressionBombError):
+            Image.open(path)
+    finally:
+        set_pixel_limit(DEFAULT_MAX_IMAGE_PIXELS)
@@ -0,0 +1,93 @@
+import os
+import sys
+from dataclasses import replace
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import output_cache
+from batch_slice_stitch import BatchJob, process_chunk
+from encoder import EncoderSettings
+from output_cache import OutputCache
+from slice_engine import SliceParams, layout_path
+
+
+def _input(tmp_path, name="in.png"):
+    path = str(tmp_path / name)
+    Image.new("RGB", (120, 80), "red").save(path)
+    return path
+
+
+def _output(folder, name="out.jpg"):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    Image.new("RGB", (10, 10)).save(path)
+    return path
+
+
+def test_hit_and_miss(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    source = _input(tmp_path)
+    folder = str(tmp_path / "out")
+    key = cache.key(source, folder, SliceParams(seed=1), EncoderSettings())
+    assert cache.lookup(key) is None
+    output = _output(folder)
+    cache.store(key, output)
+    assert cache.lookup(key) == os.path.abspath(output)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_no_key_without_seed_or_layout(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    assert cache.key(_input(tmp_path), str(tmp_path), SliceParams(), EncoderSettings()) is None
+
+
+def test_key_changes_with_params_folder_and_version(tmp_path, monkeypatch):
+    cache = OutputCache(str(tmp_path / "cache"))
+    source = _input(tmp_path)
+    params = SliceParams(seed=1)
+    key = cache.key(source, str(tmp_path / "a"), params, EncoderSettings())
+    assert cache.key(source, str(tmp_path / "a"), replace(params, workers=4), EncoderSettings()) == key
+    assert cache.key(source, str(tmp_path / "a"), replace(params, strip_count=7), EncoderSettings()) != key
+    assert cache.key(source, str(tmp_path / "a"), replace(params, seed=2), EncoderSettings()) != key
+    assert cache.key(source, str(tmp_path / "a"), params, EncoderSettings(quality=90)) != key
+    assert cache.key(source, str(tmp_path / "b"), params, EncoderSettings()) != key
+    monkeypatch.setattr(output_cache, "OUTPUT_VERSION", output_cache.OUTPUT_VERSION + 1)
+    assert cache.key(source, str(tmp_path / "a"), params, EncoderSettings()) != key
+
+
+def test_changed_output_is_not_reused(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    folder = str(tmp_path / "out")
+    key = cache.key(_input(tmp_path), folder, SliceParams(seed=1), EncoderSettings())
+    output = _output(folder)
+    cache.store(key, output)
+    with open(output, "ab") as f:
+        f.write(b"x")
+    assert cache.lookup(key) is None
+
+
+def test_content_hash_is_persisted(tmp_path, monkeypatch):
+    source = _input(tmp_path)
+    OutputCache(str(tmp_path / "cache")).content_hash(source)
+
+    def fail(path):
+        raise AssertionError("Inhalt erneut gehasht")
+
+    monkeypatch.setattr(output_cache, "file_hash", fail)
+    assert OutputCache(str(tmp_path / "cache")).content_hash(source)
+
+
+def test_cache_hit_still_saves_layout(tmp_path):
+    source = _input(tmp_path)
+    folder = str(tmp_path / "out")
+    os.makedirs(folder)
+    cache = OutputCache(str(tmp_path / "cache"))
+    job = BatchJob(folder, SliceParams(seed=11), EncoderSettings(), writers=1, output_cache=cache)
+    (_, first, _), = process_chunk([source], job)[0]
+    assert not os.path.exists(layout_path(first))
+
+    (_, second, error), = process_chunk([source], replace(job, save_layout=True))[0]
+    assert error is None and second == first
+    assert os.path.exists(layout_path(second))
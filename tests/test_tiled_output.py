@@ -0,0 +1,79 @@
+import os
+import sys
+
+from PIL import Image, ImageChops
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slice_engine import SliceParams, load_proxy, render_file
+from tiled_output import TileSettings, tiled_stitch_file
+
+
+def _source(tmp_path, mode):
+    path = str(tmp_path / f"source_{mode}.png")
+    Image.radial_gradient("L").resize((700, 500)).convert(mode).save(path)
+    return path
+
+
+def _read_back(path):
+    with Image.open(path) as img:
+        img.load()
+        return img.copy()
+
+
+def test_lossless_readback_matches_stitch(tmp_path):
+    for mode in ("L", "RGB", "RGBA"):
+        source = _source(tmp_path, mode)
+        params = SliceParams(seed=3, insert_blank=True, blank_width=20)
+        expected, _ = render_file(source, params)
+        for compression in ("deflate", "none"):
+            output = str(tmp_path / f"{mode}_{compression}.tif")
+            tiled_stitch_file(source, output, params, TileSettings(tile_size=256, compression=compression))
+            assert ImageChops.difference(_read_back(output), expected).getbbox() is None
+
+
+def test_jpeg_readback(tmp_path):
+    for mode, grayscale in (("RGB", False), ("RGB", True), ("L", False)):
+        source = _source(tmp_path, mode)
+        params = SliceParams(seed=3, grayscale=grayscale)
+        expected, _ = render_file(source, params)
+        output = str(tmp_path / f"{mode}_{grayscale}.tif")
+        tiled_stitch_file(source, output, params, TileSettings(tile_size=256, compression="jpeg", quality=90))
+        img = _read_back(output)
+        assert img.size == expected.size and img.mode == expected.mode
+        # JPEG ist verlustbehaftet: nur grobe Übereinstimmung prüfen
+        assert ImageChops.difference(img, expected).convert("L").getextrema()[1] < 40
+
+
+def test_16bit_pyramid(tmp_path):
+    # 16 Bit bis in die kleinste Ebene, auch mit Pillow-Versionen ohne BOX-Skalierung für I;16
+    source = str(tmp_path / "source_16.png")
+    Image.radial_gradient("L").resize((700, 500)).convert("I").point(lambda v: v * 257).convert("I;16").save(source)
+    params = SliceParams(seed=3, insert_blank=True, blank_width=20)
+    expected, _ = render_file(source, params)
+    assert expected.mode == "I;16"
+    output = str(tmp_path / "16.tif")
+    tiled_stitch_file(source, output, params, TileSettings(tile_size=64))
+    with Image.open(output) as img:
+        assert img.n_frames > 1
+        sizes = []
+        for level in range(img.n_frames):
+            img.seek(level)
+            img.load()
+            assert img.mode == "I;16"
+            sizes.append(img.size)
+            if level == 0:
+                assert img.size == expected.size and img.tobytes() == expected.tobytes()
+            else:
+                assert img.getextrema()[1] > 255  # volle 16 Bit, nicht auf 8 Bit reduziert
+    assert sizes[1] == ((sizes[0][0] + 1) // 2, (sizes[0][1] + 1) // 2)
+
+
+def test_16bit_proxy(tmp_path):
+    # Vorschau-Proxy einer 16-Bit-TIFF-Datei (Pillow öffnet sie als I;16)
+    source = str(tmp_path / "source_16.tif")
+    Image.new("I", (900, 600), 5000).convert("I;16").save(source)
+    proxy, size = load_proxy(source, (300, 300))
+    assert size == (900, 600)
+    assert proxy.mode == "I;16" and proxy.size == (300, 200)
+    assert proxy.getpixel((10, 10)) == 5000
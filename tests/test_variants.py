@@ -0,0 +1,16 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from variants import variant_name, variant_path
+
+
+def test_variant_names_differ_by_extension_and_folder(tmp_path):
+    root = str(tmp_path)
+    inputs = [os.path.join(root, "x.jpg"), os.path.join(root, "x.png"), os.path.join(root, "sub", "x.jpg")]
+    names = [variant_name(path, root) for path in inputs]
+    assert names == ["x_jpg", "x_png", "sub_x_jpg"]
+    paths = {variant_path(root, name, 1, 20) for name in names}
+    assert len(paths) == len(inputs)
+    assert variant_path(root, "x_jpg", 3, 20) == os.path.join(root, "x_jpg_v03_striped.jpg")
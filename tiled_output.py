@@ -0,0 +1,305 @@
+'''
+Gekachelte, optional pyramidale TIFF-Ausgabe für sehr grosse Ergebnisse.
+
+Mit zufälligen Streifen und leeren Streifen kann die Ausgabe weit grösser
+als die Quelle werden. JPEG ist auf 65535 Pixel pro Seite begrenzt, und
+``Image.new`` plus ``save`` braucht die ganze Leinwand im Speicher. Hier wird
+dagegen jede Kachel (``tile_size`` × ``tile_size``) direkt aus dem
+Streifen-Layout zusammengesetzt, kodiert und sofort geschrieben; eine
+vollständige Ausgabe existiert nie. Die Kacheln werden auf mehreren Threads
+zusammengesetzt und kodiert (zlib, Pillow und libjpeg geben dabei den GIL
+frei), geschrieben wird in Kachelreihenfolge.
+
+Mit ``pyramid`` folgen weitere Ebenen in halber Auflösung, bis die Ebene in
+eine Kachel passt. Jede Ebene wird aus der mit ``Image.reduce`` halbierten
+Quelle und dem proportional skalierten Layout erzeugt (wie die Vorschau, siehe
+``render_proxy``), nicht aus der vorherigen Ebene. Die Ebenen liegen als
+weitere Bilder (NewSubfileType 1) in derselben Datei, so wie es z.B. libvips
+und OpenSlide erwarten.
+
+Die Kacheln haben den Modus der Quelle (L, LA, RGB, RGBA, CMYK oder
+16-Bit-Graustufen). Kompression: ``deflate`` (Standard, verlustfrei),
+``jpeg`` (nur L und RGB, andere Modi werden dafür umgewandelt; RGB als
+YCbCr 4:2:0) oder ``none``. Überschreitet die Datei 4 GiB, wird automatisch
+BigTIFF geschrieben.
+'''
+import io
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, replace
+
+from PIL import Image
+
+from encoder import convert_mode
+from slice_engine import VERTICAL, StripLayout, clip_segments, fill_color, fit_layout, layout_path, load_image
+from timing import annotate, stage
+
+TILE_COMPRESSIONS = {"none": 1, "jpeg": 7, "deflate": 8}  # Werte des TIFF-Tags Compression
+HEADER_SIZE = 16  # Platz für den grösseren BigTIFF-Kopf, der Kopf wird am Ende geschrieben
+CLASSIC_LIMIT = 2**32 - 1
+
+# TIFF-Feldtypen: Typnummer, struct-Format
+_SHORT = (3, "H")
+_LONG = (4, "I")
+_LONG8 = (16, "Q")
+
+# Modus -> (Photometric, Bits pro Kanal, Zusatzkanäle für ExtraSamples)
+_PHOTOMETRIC = {"L": (1, 8, 0), "LA": (1, 8, 1), "I;16": (1, 16, 0), "RGB": (2, 8, 0), "RGBA": (2, 8, 1),
+                "CMYK": (5, 8, 0)}
+
+
+@dataclass
+class TileSettings:
+    """Einstellungen der gekachelten TIFF-Ausgabe."""
+    tile_size: int = 512
+    compression: str = "deflate"
+    quality: int = 75  # nur für jpeg
+    compress_level: int = 6  # nur für deflate
+    pyramid: bool = True
+    workers: int = 0  # Threads für Zusammensetzen und Kodieren, 0 = alle Kerne
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt die Einstellungen aus einem Konfigurations-Dictionary (config.toml)."""
+        defaults = cls()
+        return cls(
+            tile_size=int(config.get("tile_size", defaults.tile_size)),
+            compression=config.get("tile_compression", defaults.compression),
+            quality=int(config.get("quality", defaults.quality)),
+            compress_level=int(config.get("png_compress_level", defaults.compress_level)),
+            pyramid=bool(config.get("pyramid", defaults.pyramid)),
+            workers=int(config.get("stitch_workers", defaults.workers)),
+        )
+
+    def validate(self):
+        """Prüft die Einstellungen und wirft ValueError mit einer lesbaren Meldung."""
+        if self.tile_size < 16 or self.tile_size % 16:
+            raise ValueError("Die Kachelgrösse muss ein Vielfaches von 16 sein!")
+        if self.compression not in TILE_COMPRESSIONS:
+            raise ValueError(f"Unbekannte Kachel-Kompression: {self.compression}")
+        if not 1 <= self.quality <= 100:
+            raise ValueError("Die Qualität muss zwischen 1 und 100 liegen!")
+        if not 0 <= self.compress_level <= 9:
+            raise ValueError("Der Kompressionsgrad muss zwischen 0 und 9 liegen!")
+        if self.workers < 0:
+            raise ValueError("Die Anzahl Threads darf nicht negativ sein!")
+
+
+class TiledTiffWriter:
+    """Schreibt Ebenen aus fertig kodierten Kacheln in eine TIFF-Datei.
+
+    Die Kacheldaten werden sofort geschrieben; Verzeichnisse (IFDs) und Kopf
+    folgen in ``close``, wenn Offsets und Dateigrösse bekannt sind.
+    """
+
+    def __init__(self, fileobj, settings, mode="RGB"):
+        self.settings = settings
+        self.mode = mode
+        self.levels = []  # (grösse, offsets, längen)
+        self._file = fileobj
+        self._file.write(b"\0" * HEADER_SIZE)
+
+    def encode(self, tile):
+        """Kodiert eine Kachel gemäss ``settings.compression``; darf parallel aufgerufen werden."""
+        if self.settings.compression == "jpeg":
+            buffer = io.BytesIO()
+            # Unterabtastung nur für YCbCr; einkanalige Kacheln müssen 1x1 bleiben, sonst lehnt libtiff sie ab
+            subsampling = "4:2:0" if tile.mode == "RGB" else "4:4:4"
+            tile.save(buffer, "JPEG", quality=self.settings.quality, subsampling=subsampling)
+            return buffer.getvalue()
+        if self.settings.compression == "deflate":
+            return zlib.compress(tile.tobytes(), self.settings.compress_level)
+        return tile.tobytes()
+
+    def write_level(self, size, tiles):
+        """Schreibt die kodierten Kacheln einer Ebene (zeilenweise, links nach rechts)."""
+        offsets, counts = [], []
+        for data in tiles:
+            offsets.append(self._file.tell())
+            counts.append(len(data))
+            self._file.write(data)
+        self.levels.append((size, offsets, counts))
+
+    def close(self):
+        """Schreibt die Verzeichnisse aller Ebenen und den Kopf."""
+        end = self._file.seek(0, os.SEEK_END)
+        estimate = sum(len(offsets) * 16 + 512 for _, offsets, _ in self.levels)
+        big = end + estimate > CLASSIC_LIMIT
+        first = None
+        previous_next = None
+        for level, (size, offsets, counts) in enumerate(self.levels):
+            ifd, next_field = self._write_ifd(self._tags(level, size, offsets, counts), big)
+            if previous_next is None:
+                first = ifd
+            else:
+                self._patch(previous_next, ifd, big)
+            previous_next = next_field
+        self._file.seek(0)
+        if big:
+            self._file.write(b"II" + struct.pack("<HHHQ", 43, 8, 0, first))
+        else:
+            self._file.write(b"II" + struct.pack("<HI", 42, first))
+
+    def _tags(self, level, size, offsets, counts):
+        photometric, bits, extra = _PHOTOMETRIC[self.mode]
+        samples = Image.getmodebands(self.mode)
+        ycbcr = self.settings.compression == "jpeg" and self.mode == "RGB"
+        tags = [
+            (254, _LONG, [1 if level else 0]),  # NewSubfileType: verkleinerte Ebene
+            (256, _LONG, [size[0]]),
+            (257, _LONG, [size[1]]),
+            (258, _SHORT, [bits] * samples),
+            (259, _SHORT, [TILE_COMPRESSIONS[self.settings.compression]]),
+            (262, _SHORT, [6 if ycbcr else photometric]),
+            (277, _SHORT, [samples]),
+            (284, _SHORT, [1]),  # PlanarConfiguration: Pixel verschachtelt
+            (322, _LONG, [self.settings.tile_size]),
+            (323, _LONG, [self.settings.tile_size]),
+            (324, None, offsets),
+            (325, None, counts),
+        ]
+        if extra:
+            tags.append((338, _SHORT, [2]))  # ExtraSamples: Alpha, nicht vormultipliziert
+        if ycbcr:
+            tags.append((530, _SHORT, [2, 2]))  # YCbCrSubSampling
+        return tags
+
+    def _write_ifd(self, tags, big):
+        """Schreibt ein Verzeichnis; liefert (offset, position des Verweises auf das nächste)."""
+        inline = 8 if big else 4
+        entries = []
+        for tag, kind, values in tags:
+            if kind is None:  # Offsets und Längen
+                kind = _LONG8 if big else _LONG
+            data = struct.pack(f"<{len(values)}{kind[1]}", *values)
+            if len(data) <= inline:
+                value = data.ljust(inline, b"\0")
+            else:
+                # Werte, die nicht in den Eintrag passen, vor dem Verzeichnis ablegen
+                position = self._align()
+                self._file.write(data)
+                value = struct.pack("<Q" if big else "<I", position)
+            entries.append(struct.pack("<HHQ" if big else "<HHI", tag, kind[0], len(values)) + value)
+        ifd = self._align()
+        self._file.write(struct.pack("<Q" if big else "<H", len(entries)))
+        self._file.write(b"".join(entries))
+        next_field = self._file.tell()
+        self._file.write(b"\0" * inline)
+        return ifd, next_field
+
+    def _align(self):
+        position = self._file.tell()
+        if position % 2:
+            self._file.write(b"\0")
+            position += 1
+        return position
+
+    def _patch(self, position, value, big):
+        current = self._file.tell()
+        self._file.seek(position)
+        self._file.write(struct.pack("<Q" if big else "<I", value))
+        self._file.seek(current)
+
+
+def render_tile(img, segments, vertical, fill, box, tile_size, has_blank):
+    """Setzt den Ausschnitt ``box`` (links, oben, rechts, unten) der Ausgabe als Kachel zusammen.
+
+    Die Kachel hat den Modus von ``img`` und immer ``tile_size`` × ``tile_size``
+    Pixel; am Rand wird aufgefüllt.
+    """
+    left, top, right, bottom = box
+    tile = Image.new(img.mode, (tile_size, tile_size), fill if has_blank else 0)
+    if vertical:
+        for src, dim, offset in clip_segments(segments, left, right):
+            if src is not None:
+                tile.paste(img.crop((src, top, src + dim, bottom)), (offset - left, 0))
+    else:
+        for src, dim, offset in clip_segments(segments, top, bottom):
+            if src is not None:
+                tile.paste(img.crop((left, src, right, src + dim)), (0, offset - top))
+    return tile
+
+
+def _halve(img):
+    """Halbiert ``img`` (Mittelwert über 2×2 Pixel); 16 Bit über Modus "I", das ``reduce`` überall kennt."""
+    if img.mode == "I;16":
+        return img.convert("I").reduce(2).convert("I;16")
+    return img.reduce(2)
+
+
+def _bounded_map(executor, func, items, window):
+    """Wie ``executor.map``, aber mit höchstens ``window`` offenen Aufträgen (Reihenfolge bleibt)."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(copy_context().run, func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def tiled_stitch_file(input_path, output_filename, params, settings=None, rng=None, layout=None, save_layout=False):
+    """Erstellt das Streifenbild von ``input_path`` als gekacheltes (pyramidales) TIFF.
+
+    Im Speicher liegen nur die dekodierte Quelle (bzw. ihre halbierte Kopie
+    für die nächste Ebene) und die gerade bearbeiteten Kacheln.
+    """
+    params.validate()
+    settings = settings or TileSettings()
+    settings.validate()
+    tile_size = settings.tile_size
+    workers = settings.workers or os.cpu_count() or 1
+
+    img = load_image(input_path, params)
+    if settings.compression == "jpeg":
+        img = convert_mode(img, "L" if img.mode in ("L", "LA", "I;16") else "RGB")
+    fill = fill_color(params.strip_color, img.mode)
+    if layout is None:
+        layout = StripLayout.generate(img.size, params, rng)
+    layout = fit_layout(layout, img.size)
+    params = replace(params, direction=layout.direction)
+    vertical = layout.direction == VERTICAL
+    has_blank = bool(layout.blank_width)
+
+    tiles_written = 0
+    with open(output_filename, "wb") as f, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tile") as executor:
+        writer = TiledTiffWriter(f, settings, img.mode)
+        level_layout = layout
+        while True:
+            segments = level_layout.segments()
+            cut_length = sum(dim for _, dim in segments)
+            size = (cut_length, img.height) if vertical else (img.width, cut_length)
+            if not writer.levels:
+                annotate(width=img.width, height=img.height, output_width=size[0], output_height=size[1],
+                         strips=len(layout.strips), tiled=True)
+            boxes = [(x, y, min(x + tile_size, size[0]), min(y + tile_size, size[1]))
+                     for y in range(0, size[1], tile_size) for x in range(0, size[0], tile_size)]
+
+            def make_tile(box, img=img, segments=segments):
+                with stage("paste"):
+                    tile = render_tile(img, segments, vertical, fill, box, tile_size, has_blank)
+                with stage("encode"):
+                    return writer.encode(tile)
+
+            writer.write_level(size, _bounded_map(executor, make_tile, boxes, 4 * workers))
+            tiles_written += len(boxes)
+            if not settings.pyramid or max(size) <= tile_size or min(img.size) < 2:
+                break
+            # Nächste Ebene aus der halbierten Quelle und dem skalierten Layout
+            with stage("reduce"):
+                img = _halve(img)
+            level_layout = layout.scaled(img.width if vertical else img.height)
+        with stage("encode"):
+            writer.close()
+
+    annotate(levels=len(writer.levels), tiles=tiles_written, output=output_filename, output_format="TIFF",
+             bytes_written=os.path.getsize(output_filename))
+    if save_layout:
+        with stage("layout_save"):
+            layout.save(layout_path(output_filename))
+    return output_filename
@@ -0,0 +1,141 @@
+'''
+Zeitmessung der einzelnen Verarbeitungsschritte.
+
+Ein ``StageTimer`` umschliesst eine Generierung (GUI-Auftrag, Batch-Datei).
+Solange er aktiv ist, summieren die Aufrufe von ``stage("decode")`` usw. in
+den Modulen ihre Dauer auf; ohne aktiven Timer sind sie wirkungslos. Am Ende
+schreibt ``emit`` einen JSON-Datensatz auf den Logger ``timing``, z.B.:
+
+    {"event": "generate", "width": 4000, "height": 3000, "strips": 12,
+     "bytes_written": 1830211, "total_ms": 412.7,
+     "stages_ms": {"decode": 180.2, "crop": 21.0, "paste": 30.5, "encode": 160.4}}
+
+Der aktive Timer wird per ``contextvars`` weitergegeben; Threads, die mit
+``contextvars.copy_context`` gestartet werden (z.B. die Writer-Threads der
+``WriteBehindQueue``), messen in denselben Timer. ``total_ms`` ist die Dauer
+des umschlossenen Blocks; Schritte in solchen Threads können darüber hinaus
+laufen und stehen nur in ``stages_ms``.
+
+Optional wird pro Datensatz ein Profil erfasst (``profile``):
+``"cprofile"`` schreibt eine .prof-Datei, ``"tracemalloc"`` ergänzt den
+Datensatz um Speicherspitze und die grössten Allokationsstellen.
+'''
+import contextvars
+import cProfile
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+
+PROFILE_MODES = ("", "cprofile", "tracemalloc")
+TRACEMALLOC_TOP = 10
+
+logger = logging.getLogger("timing")
+
+_current = contextvars.ContextVar("stage_timer", default=None)
+_NULL = nullcontext()
+
+
+class StageTimer:
+    """Summiert die Dauer benannter Schritte und gibt sie als JSON-Datensatz aus."""
+
+    def __init__(self, event, profile="", profile_folder=None, level=logging.INFO, **fields):
+        if profile not in PROFILE_MODES:
+            raise ValueError(f"Unbekannter Profiling-Modus: {profile}")
+        self.event = event
+        self.profile = profile
+        self.profile_folder = profile_folder or tempfile.gettempdir()
+        self.level = level
+        self.fields = dict(fields)
+        self.stages = {}
+        self.total = 0.0
+        self._lock = threading.Lock()
+        self._token = None
+        self._start = None
+        self._profiler = None
+        self._own_tracemalloc = False
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        if self.profile == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == "tracemalloc":
+            self._own_tracemalloc = not tracemalloc.is_tracing()
+            if self._own_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total += time.perf_counter() - self._start
+        if self._profiler:
+            self._profiler.disable()
+            path = os.path.join(self.profile_folder, f"{self.event}-{uuid.uuid4().hex[:8]}.prof")
+            self._profiler.dump_stats(path)
+            self.fields["profile_file"] = path
+            self._profiler = None
+        elif self.profile == "tracemalloc":
+            snapshot = tracemalloc.take_snapshot()
+            self.fields["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            self.fields["tracemalloc_top"] = [
+                {"where": str(stat.traceback[0]), "bytes": stat.size}
+                for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]
+            ]
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+        _current.reset(self._token)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def annotate(self, **fields):
+        with self._lock:
+            self.fields.update(fields)
+
+    def record(self):
+        """Liefert den Datensatz als Dictionary (Zeiten in Millisekunden)."""
+        with self._lock:
+            record = {"event": self.event, **self.fields, "total_ms": round(self.total * 1000, 3)}
+            record["stages_ms"] = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        return record
+
+    def emit(self):
+        logger.log(self.level, json.dumps(self.record(), default=str))
+
+
+def stage(name):
+    """Misst den umschlossenen Block als Schritt ``name`` des aktiven Timers (sonst wirkungslos)."""
+    timer = _current.get()
+    return timer.stage(name) if timer else _NULL
+
+
+def annotate(**fields):
+    """Ergänzt den Datensatz des aktiven Timers um ``fields`` (sonst wirkungslos)."""
+    timer = _current.get()
+    if timer:
+        timer.annotate(**fields)
+
+
+def configure_timing_log(path):
+    """Schreibt die Zeitmess-Datensätze als JSON-Zeilen nach ``path`` statt in das normale Log."""
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
@@ -0,0 +1,203 @@
+'''
+Varianten: viele Streifenbilder aus einer Quelle mit nur einem Dekodieren.
+
+Jede Variante ist ein Satz von Parametern, die die Grundeinstellungen
+überschreiben (Schlüssel wie in config.toml, z.B. ``seed``, ``strip_count``,
+``direction``, ``strip_color``). Die Quelle wird einmal dekodiert und höchstens
+einmal pro benötigtem Modus (Farbe bzw. Graustufen) umgewandelt; alle
+Varianten lesen aus diesen Rastern. Leere Streifen gleicher Grösse, Farbe und
+Modus werden nur einmal angelegt und von allen Varianten geteilt.
+
+Die Varianten werden in einem Thread-Pool zusammengesetzt und kodiert
+(Pillow gibt dabei den GIL frei). Die Ausgaben heissen
+``<name>_v<nr>_striped.<endung>`` mit fortlaufender, auf gleiche Breite
+aufgefüllter Nummer ab 1. ``<name>`` enthält die Endung und den Pfad relativ
+zum Eingabeordner (siehe ``variant_name``), z.B. ``foto_jpg_v01_striped.jpg``
+für ``foto.jpg`` und ``sommer_foto_png_v01_striped.jpg`` für
+``sommer/foto.png``; so überschreiben sich gleichnamige Quellen nicht. Eine
+erneute Ausführung überschreibt die eigenen Ausgaben.
+
+Variantendateien sind JSON (Liste von Objekten) oder TOML (``[[variant]]``)::
+
+    [[variant]]
+    seed = 1
+    strip_count = 8
+
+    [[variant]]
+    seed = 2
+    direction = "horizontal"
+    strip_color = [0, 0, 0]
+'''
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import replace
+
+from PIL import Image
+
+from encoder import EncoderSettings, encode
+from slice_engine import StripLayout, fit_layout, layout_path, stitch_image, to_working_mode
+from timing import annotate, stage
+
+# Schlüssel einer Variante -> (Feld in SliceParams, Umwandlung)
+VARIANT_KEYS = {
+    "direction": ("direction", str),
+    "strip_count": ("strip_count", int),
+    "random_strips": ("random_strips", bool),
+    "min_strip_size": ("min_strip_size", int),
+    "max_strip_size": ("max_strip_size", int),
+    "insert_blank": ("insert_blank", bool),
+    "blank_width": ("blank_width", int),
+    "strip_color": ("strip_color", lambda value: tuple(int(c) for c in value)),
+    "grayscale": ("grayscale", bool),
+    "seed": ("seed", int),
+    "stitch_mode": ("stitch_mode", str),
+    "stitch_workers": ("workers", int),
+}
+
+
+def parse_seeds(text):
+    """Liest Seeds wie ``1,2,7`` oder ``1-20`` (auch gemischt, z.B. ``1-5,10``)."""
+    seeds = []
+    for part in text.split(","):
+        part = part.strip()
+        # Bereich "a-b"; ein Minus am Anfang gehört zur ersten Zahl
+        first, sep, last = part[1:].partition("-")
+        try:
+            if sep:
+                first, last = int(part[0] + first), int(last)
+                if last < first:
+                    raise ValueError
+                seeds.extend(range(first, last + 1))
+            else:
+                seeds.append(int(part))
+        except ValueError:
+            raise ValueError(f"Ungültige Seeds: {text}") from None
+    if not seeds:
+        raise ValueError(f"Ungültige Seeds: {text}")
+    return seeds
+
+
+def load_variants(path):
+    """Lädt eine Liste von Parametersätzen aus einer JSON- oder TOML-Datei."""
+    with open(path, "r") as f:
+        if path.lower().endswith(".toml"):
+            import toml
+            data = toml.load(f).get("variant", [])
+        else:
+            data = json.load(f)
+    if not isinstance(data, list) or not all(isinstance(v, dict) for v in data):
+        raise ValueError("Die Variantendatei muss eine Liste von Parametersätzen enthalten.")
+    return data
+
+
+def expand_variants(sets=None, seeds=None):
+    """Kombiniert Parametersätze und Seeds: jeder Satz einmal pro Seed (Satz für Satz)."""
+    sets = sets or [{}]
+    if not seeds:
+        return [dict(overrides) for overrides in sets]
+    return [dict(overrides, seed=seed) for overrides in sets for seed in seeds]
+
+
+def variant_params(params, overrides):
+    """Liefert ``params`` mit den Werten aus ``overrides`` (Schlüssel siehe ``VARIANT_KEYS``)."""
+    changes = {}
+    for key, value in overrides.items():
+        if key not in VARIANT_KEYS:
+            raise ValueError(f"Unbekannter Variantenparameter: {key}")
+        name, convert = VARIANT_KEYS[key]
+        try:
+            changes[name] = None if key == "seed" and value is None else convert(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Ungültiger Wert für {key}: {value!r}") from None
+    params = replace(params, **changes)
+    params.validate()
+    return params
+
+
+def resolve_variants(params, variants):
+    """Liefert die Parameter aller ``variants``; wirft ValueError mit der Nummer der ungültigen Variante."""
+    if not variants:
+        raise ValueError("Es wird mindestens eine Variante benötigt!")
+    resolved = []
+    for number, overrides in enumerate(variants, 1):
+        try:
+            resolved.append(variant_params(params, overrides))
+        except ValueError as e:
+            raise ValueError(f"Variante {number}: {e}") from None
+    return resolved
+
+
+def variant_name(input_path, root=None):
+    """Namensteil der Ausgaben von ``input_path``: Pfad relativ zu ``root`` (sonst Dateiname) samt Endung."""
+    relative = os.path.relpath(input_path, root) if root else os.path.basename(input_path)
+    stem, extension = os.path.splitext(relative)
+    name = stem.replace(os.sep, "_")
+    return f"{name}_{extension[1:].lower()}" if extension else name
+
+
+def variant_path(output_folder, name, index, count, extension=".jpg"):
+    """Dateiname der Variante ``index`` (ab 1) von ``count`` für den Namensteil ``name``."""
+    return os.path.join(output_folder, f"{name}_v{index:0{max(2, len(str(count)))}d}_striped{extension}")
+
+
+def load_rasters(path, grayscale_flags):
+    """Dekodiert ``path`` einmal und liefert pro Wert in ``grayscale_flags`` das umgewandelte Raster."""
+    with Image.open(path) as img:
+        with stage("decode"):
+            if grayscale_flags == {True}:
+                img.draft("L", img.size)  # wie ``load_image``: JPEG gleich als Luminanz dekodieren
+            img.load()
+        annotate(width=img.width, height=img.height, mode=img.mode)
+        rasters = {}
+        if False in grayscale_flags:
+            rasters[False] = to_working_mode(img, False)
+        if True in grayscale_flags:
+            # Graustufen aus dem bereits umgewandelten Farbraster, sonst aus der Quelle
+            rasters[True] = to_working_mode(rasters.get(False, img), True)
+        return rasters
+
+
+def render_variants(input_path, output_folder, params, variants, encoder=None, layout=None, save_layout=False,
+                    workers=0, name=None):
+    """Erstellt alle ``variants`` (Liste von Parametersätzen) aus ``input_path``.
+
+    Die Parameter jeder Variante sind ``params`` mit den Werten der Variante;
+    ``layout`` gilt für alle Varianten. ``name`` ist der Namensteil der
+    Ausgaben (Standard: ``variant_name(input_path)``). ``workers`` Threads bearbeiten die
+    Varianten parallel (0 = alle Kerne). Gibt pro Variante (Ausgabe, Fehler)
+    in der Reihenfolge von ``variants`` zurück; ungültige Parameter brechen vor
+    dem Dekodieren mit ValueError ab.
+    """
+    if not os.path.isdir(output_folder):
+        raise FileNotFoundError("Der Ausgabeordner existiert nicht!")
+    encoder = encoder or EncoderSettings()
+    encoder.validate()
+    name = name or variant_name(input_path)
+    all_params = resolve_variants(params, variants)
+    rasters = load_rasters(input_path, {p.grayscale for p in all_params})
+    annotate(variants=len(variants))
+    blanks = {}  # von allen Varianten geteilte leere Streifen
+
+    def render(number, variant):
+        img = rasters[variant.grayscale]
+        variant_layout = fit_layout(layout, img.size) if layout else StripLayout.generate(img.size, variant)
+        new_img = stitch_image(img, variant, layout=variant_layout, blanks=blanks)
+        output_filename = variant_path(output_folder, name, number, len(all_params), encoder.extension)
+        encode(new_img, output_filename, encoder)
+        if save_layout:
+            with stage("layout_save"):
+                variant_layout.save(layout_path(output_filename))
+        return output_filename
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1, thread_name_prefix="variant") as executor:
+        futures = [executor.submit(copy_context().run, render, number, variant)
+                   for number, variant in enumerate(all_params, 1)]
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, f"{type(e).__name__}: {e}"))
+    return results
@@ -0,0 +1,370 @@
+'''
+Überwachungs-Modus (Daemon) von Image Slice & Stitch.
+
+Beobachtet den input_folder und erstellt für jedes neue Bild automatisch ein
+Streifenbild im output_folder, mit den Einstellungen aus config.toml.
+
+- Dateisystem-Ereignisse kommen über ``watchdog`` (inotify & Co.), falls
+  installiert; sonst wird der Ordner regelmässig abgefragt (Polling).
+- Eine Datei wird erst verarbeitet, wenn Grösse und Änderungszeit
+  ``--settle`` Sekunden lang unverändert waren (noch geschriebene Dateien).
+- Verarbeitet wird in einem Prozess-Pool (wie im Batch-Modus).
+- Ein SQLite-Index speichert jede verarbeitete Datei unter Inhalts-Hash und
+  Einstellungs-Hash. Neustarts und doppelte Dateien lösen daher keine
+  erneute Verarbeitung aus; erst geänderte Einstellungen oder ein anderer
+  Inhalt.
+- Mit ``--metrics-port`` stehen Warteschlangenlänge, Durchsatz und Latenz
+  (Erkennung bis fertig geschrieben) im Prometheus-Textformat unter
+  ``/metrics`` bereit.
+
+Beispiel:
+    python watch_folder.py --workers 4 --metrics-port 9108
+'''
+import argparse
+import logging
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batch_slice_stitch import BatchJob, load_config, process_chunk
+from encoder import EncoderSettings
+from output_cache import file_hash, settings_digest
+from slice_engine import SliceParams, StripLayout, is_supported_image
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog ist optional, ohne wird gepollt
+    Observer = None
+
+CONFIG_FILE = "config.toml"
+INDEX_FILE = ".slice-stitch-index.sqlite"
+DEFAULT_SETTLE = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+LATENCY_WINDOW = 1000
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def settings_hash(job):
+    """Hash aller Einstellungen, die das Ergebnis beeinflussen."""
+    return settings_digest(job.params, job.encoder, job.layout, stream=job.stream)
+
+
+class ProcessedIndex:
+    """Persistenter Index der verarbeiteten Dateien (SQLite)."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            " content_hash TEXT NOT NULL,"
+            " settings_hash TEXT NOT NULL,"
+            " input_path TEXT NOT NULL,"
+            " output_path TEXT,"
+            " error TEXT,"
+            " processed_at REAL NOT NULL,"
+            " PRIMARY KEY (content_hash, settings_hash))"
+        )
+        self._db.commit()
+
+    def contains(self, content_hash, settings):
+        row = self._db.execute("SELECT 1 FROM processed WHERE content_hash = ? AND settings_hash = ?",
+                               (content_hash, settings)).fetchone()
+        return row is not None
+
+    def add(self, content_hash, settings, input_path, output_path=None, error=None):
+        """Merkt sich das Ergebnis; fehlgeschlagene Dateien werden erst bei neuem Inhalt erneut versucht."""
+        self._db.execute("INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?, ?)",
+                         (content_hash, settings, input_path, output_path, error, time.time()))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class Metrics:
+    """Zähler und Latenzen für den Metrik-Endpunkt."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0      # erkannt, wartet auf stabile Grösse
+        self.in_flight = 0    # an den Pool übergeben
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0      # bereits im Index
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # für die Quantile
+        self.latency_sum = 0.0
+        self.latency_count = 0
+
+    def update(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, value)
+
+    def count(self, name, latency=None):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+            if latency is not None:
+                self.latencies.append(latency)
+                self.latency_sum += latency
+                self.latency_count += 1
+
+    def render(self):
+        """Liefert die Metriken im Prometheus-Textformat."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            lines = [
+                "# TYPE slice_stitch_queue_depth gauge",
+                f'slice_stitch_queue_depth{{state="settling"}} {self.pending}',
+                f'slice_stitch_queue_depth{{state="processing"}} {self.in_flight}',
+                "# TYPE slice_stitch_files_total counter",
+                f'slice_stitch_files_total{{result="processed"}} {self.processed}',
+                f'slice_stitch_files_total{{result="failed"}} {self.failed}',
+                f'slice_stitch_files_total{{result="skipped"}} {self.skipped}',
+                "# TYPE slice_stitch_latency_seconds summary",
+            ]
+            for quantile in (0.5, 0.95, 0.99):
+                value = latencies[min(len(latencies) - 1, int(quantile * len(latencies)))] if latencies else 0.0
+                lines.append(f'slice_stitch_latency_seconds{{quantile="{quantile}"}} {value:.3f}')
+            lines.append(f"slice_stitch_latency_seconds_sum {self.latency_sum:.3f}")
+            lines.append(f"slice_stitch_latency_seconds_count {self.latency_count}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, port):
+    """Startet den Metrik-Endpunkt ``/metrics`` in einem Hintergrund-Thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+class FolderWatcher:
+    """Beobachtet den Eingabeordner und verteilt stabile neue Bilder auf einen Prozess-Pool."""
+
+    def __init__(self, input_folder, job, index, metrics=None, workers=None,
+                 settle=DEFAULT_SETTLE, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.input_folder = os.path.abspath(input_folder)
+        self.job = job
+        self.index = index
+        self.metrics = metrics or Metrics()
+        self.workers = workers
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.settings = settings_hash(job)
+        self._stop = threading.Event()
+        self._events = deque()        # Pfade aus Dateisystem-Ereignissen
+        self._pending = {}            # Pfad -> (Grösse, mtime, seit wann stabil, erkannt um)
+        self._in_flight = {}          # Future -> (Pfad, Inhalts-Hash, erkannt um)
+        self._hashes_in_flight = set()
+        self._known = {}              # Pfad -> (Grösse, mtime) bereits geprüfter Dateien
+        self._observer = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _is_candidate(self, path):
+        if not os.path.isfile(path) or not is_supported_image(path):
+            return False
+        # Liegt die Ausgabe im selben Ordner, die eigenen Ergebnisse nicht erneut verarbeiten
+        return not (os.path.dirname(path) == os.path.abspath(self.job.output_folder)
+                    and "_striped" in os.path.basename(path))
+
+    def _scan(self):
+        """Nimmt alle Bilder im Ordner in die Beobachtung auf (Start und Polling)."""
+        for name in os.listdir(self.input_folder):
+            self._track(os.path.join(self.input_folder, name))
+
+    def _track(self, path):
+        if path in self._pending or not self._is_candidate(path):
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        # Unveränderte, schon geprüfte Dateien nicht bei jedem Scan neu hashen
+        if self._known.get(path) != (st.st_size, st.st_mtime_ns):
+            self._pending[path] = (None, None, None, time.monotonic())
+
+    def _start_observer(self):
+        if Observer is None:
+            logging.info(f"watchdog nicht installiert, Ordner wird alle {self.poll_interval} s abgefragt")
+            return
+        events = self._events
+
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    events.append(event.src_path)
+
+            on_modified = on_created
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    events.append(event.dest_path)
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), self.input_folder, recursive=False)
+        self._observer.start()
+
+    def _settled(self):
+        """Liefert die Dateien, deren Grösse und mtime seit ``settle`` Sekunden unverändert sind."""
+        now = time.monotonic()
+        ready = []
+        for path, (size, mtime, stable_since, seen) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]  # wieder verschwunden
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (st.st_size, st.st_mtime_ns, now, seen)
+            elif now - stable_since >= self.settle:
+                del self._pending[path]
+                ready.append((path, seen))
+        return ready
+
+    def _dispatch(self, executor, path, seen):
+        try:
+            st = os.stat(path)
+            content = file_hash(path)
+            self._known[path] = (st.st_size, st.st_mtime_ns)
+        except OSError as e:
+            logging.error(f"Fehler beim Lesen von {path}: {e}")
+            return
+        if content in self._hashes_in_flight or self.index.contains(content, self.settings):
+            logging.debug(f"Bereits verarbeitet: {path}")
+            self.metrics.count("skipped")
+            return
+        self._hashes_in_flight.add(content)
+        self._in_flight[executor.submit(process_chunk, [path], self.job)] = (path, content, seen)
+
+    def _collect(self):
+        for future in [f for f in self._in_flight if f.done()]:
+            path, content, seen = self._in_flight.pop(future)
+            self._hashes_in_flight.discard(content)
+            latency = time.monotonic() - seen
+            try:
+                results, _ = future.result()
+                _, output_filename, error = results[0]
+            except Exception as e:
+                output_filename, error = None, f"{type(e).__name__}: {e}"
+            self.index.add(content, self.settings, path, output_filename, error)
+            if error:
+                logging.error(f"Fehler bei {path}: {error}")
+                self.metrics.count("failed", latency)
+            else:
+                logging.info(f"{path} -> {output_filename} ({latency:.2f} s)")
+                self.metrics.count("processed", latency)
+
+    def run(self, once=False):
+        """Verarbeitet neue Dateien bis ``stop`` aufgerufen wird; mit ``once`` nur den aktuellen Inhalt."""
+        self._start_observer()
+        last_scan = 0.0
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                while not self._stop.is_set():
+                    # Ohne watchdog wird regelmässig neu gescannt, mit watchdog nur als Absicherung
+                    interval = self.poll_interval if self._observer is None else 30 * self.poll_interval
+                    if time.monotonic() - last_scan >= interval:
+                        self._scan()
+                        last_scan = time.monotonic()
+                    while self._events:
+                        self._track(os.path.abspath(self._events.popleft()))
+
+                    for path, seen in self._settled():
+                        self._dispatch(executor, path, seen)
+                    self._collect()
+                    self.metrics.update(pending=len(self._pending), in_flight=len(self._in_flight))
+
+                    if once and not self._pending and not self._in_flight:
+                        break
+                    self._stop.wait(min(self.poll_interval, self.settle / 2 or self.poll_interval))
+        finally:
+            if self._observer:
+                self._observer.stop()
+                self._observer.join()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Image Slice & Stitch: Eingabeordner überwachen.")
+    parser.add_argument("--config", default=CONFIG_FILE, help="Pfad zur config.toml")
+    parser.add_argument("--input", help="Eingabe-Ordner (Standard: input_folder aus der Konfiguration)")
+    parser.add_argument("--output", help="Ausgabe-Ordner (Standard: output_folder aus der Konfiguration)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Anzahl Worker-Prozesse")
+    parser.add_argument("--index", help=f"SQLite-Index (Standard: {INDEX_FILE} im Ausgabeordner)")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help="Sekunden ohne Änderung, bevor eine Datei als fertig geschrieben gilt")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Abfrageintervall in Sekunden")
+    parser.add_argument("--metrics-port", type=int, help="Port für den Metrik-Endpunkt /metrics")
+    parser.add_argument("--layout", help="Gespeichertes Layout (JSON/TOML) auf alle Bilder anwenden")
+    parser.add_argument("--once", action="store_true", help="Nur die vorhandenen Dateien verarbeiten und beenden")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config(args.config)
+    input_folder = args.input or config["input_folder"]
+    output_folder = args.output or config["output_folder"]
+
+    if not os.path.isdir(input_folder):
+        logging.error(f"Der Eingabeordner existiert nicht: {input_folder}")
+        return 2
+    if not os.path.isdir(output_folder):
+        logging.error(f"Der Ausgabeordner existiert nicht: {output_folder}")
+        return 2
+
+    params = SliceParams.from_config(config)
+    encoder = EncoderSettings.from_config(config)
+    try:
+        params.validate()
+        encoder.validate()
+        layout = StripLayout.load(args.layout) if args.layout else None
+    except (OSError, ValueError, KeyError) as e:
+        logging.error(str(e))
+        return 2
+
+    job = BatchJob(output_folder, params, encoder, layout, writers=1,
+                   max_image_pixels=config["max_image_pixels"])
+    index = ProcessedIndex(args.index or os.path.join(output_folder, INDEX_FILE))
+    metrics = Metrics()
+    if args.metrics_port:
+        serve_metrics(metrics, args.metrics_port)
+    watcher = FolderWatcher(input_folder, job, index, metrics, args.workers, args.settle, args.poll_interval)
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    signal.signal(signal.SIGINT, lambda *_: watcher.stop())
+
+    logging.info(f"Überwache {input_folder} -> {output_folder}")
+    try:
+        watcher.run(once=args.once)
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())